@@ -0,0 +1,52 @@
+#benchmarks/bench_codecs
+"""/predict 입출력 형식별 전송 바이트와 요청당 CPU 시간 비교
+
+요청 본문 인코딩(클라이언트) -> 디코딩(서버) -> 응답 인코딩(서버) 과정을 형식별로 측정한다.
+사용법: python -m benchmarks.bench_codecs [--rows 32] [--features 512] [--iterations 200]
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.common import tensor_codec
+
+def encode_request(data: np.ndarray, mimetype: str):
+    """클라이언트 측 요청 본문 생성"""
+    if mimetype == tensor_codec.JSON:
+        return json.dumps(data.tolist()).encode(), {}
+    if mimetype == tensor_codec.MSGPACK:
+        return tensor_codec.msgpack.packb(tensor_codec._to_msgpack(data), use_bin_type=True), {}
+    return tensor_codec.encode(data, mimetype)
+
+def server_cpu_ms(body: bytes, headers, prediction: np.ndarray, mimetype: str, iterations: int) -> float:
+    """서버 측 요청 디코딩 + 응답 인코딩의 평균 CPU 시간(ms)"""
+    start = time.process_time()
+    for _ in range(iterations):
+        data = tensor_codec.decode(body, mimetype, headers)
+        if mimetype == tensor_codec.JSON:
+            data = data.astype(np.float32)
+        tensor_codec.encode(prediction, mimetype)
+    return (time.process_time() - start) * 1000 / iterations
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=32)
+    parser.add_argument('--features', type=int, default=512)
+    parser.add_argument('--outputs', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    data = np.random.rand(args.rows, args.features).astype(np.float32)
+    prediction = np.random.rand(args.rows, args.outputs).astype(np.float32)
+
+    print(f"{'format':<40}{'request B':>12}{'response B':>12}{'cpu ms/req':>12}")
+    for mimetype in tensor_codec.available_formats():
+        body, headers = encode_request(data, mimetype)
+        response, _ = tensor_codec.encode(prediction, mimetype)
+        cpu = server_cpu_ms(body, headers, prediction, mimetype, args.iterations)
+        print(f"{mimetype:<40}{len(body):>12}{len(response):>12}{cpu:>12.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#benchmarks/bench_inference
+"""model.predict 경로와 InferenceEngine fast path의 지연시간 비교
+
+사용법: python -m benchmarks.bench_inference [--iterations 200] [--features 32]
+"""
+import argparse
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from src.core.inference import InferenceEngine
+
+def build_model(features: int, hidden: int = 128) -> tf.keras.Model:
+    """벤치마크용 Dense 모델 생성"""
+    inputs = tf.keras.Input(shape=(features,))
+    x = tf.keras.layers.Dense(hidden, activation='relu')(inputs)
+    x = tf.keras.layers.Dense(hidden, activation='relu')(x)
+    outputs = tf.keras.layers.Dense(2, activation='softmax')(x)
+    return tf.keras.Model(inputs, outputs)
+
+def measure(fn, data: np.ndarray, iterations: int) -> np.ndarray:
+    """호출별 지연시간(ms) 측정 (첫 호출은 워밍업으로 제외)"""
+    fn(data)
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(data)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--features', type=int, default=32)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 64, 300])
+    args = parser.parse_args()
+
+    model = build_model(args.features)
+    engine = InferenceEngine(model)
+    paths = {
+        'model.predict': lambda x: model.predict(x, verbose=0),
+        'fast_path': engine.predict,
+    }
+
+    print(f"{'path':<15}{'rows':>6}{'p50(ms)':>10}{'p99(ms)':>10}")
+    for rows in args.batch_sizes:
+        data = np.random.rand(rows, args.features).astype(np.float32)
+        for name, fn in paths.items():
+            latencies = measure(fn, data, args.iterations)
+            print(f"{name:<15}{rows:>6}{np.percentile(latencies, 50):>10.3f}{np.percentile(latencies, 99):>10.3f}")
+    print(f"traced signatures: {engine.signature_count}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,344 @@
+#benchmarks/bench_serving
+"""서빙 스택 부하 테스트 (업로드 -> 콜드 로드 -> 워크로드 재생)
+
+크기별 합성 Keras 모델을 임시 MODEL_STORE_PATH에 업로드한 뒤, JSONL 워크로드를 앱에 재생해
+req/s, p50/p95/p99, 모델별 콜드 로드 시간, RSS를 측정하고 결과를 JSON으로 저장한다.
+
+모드:
+  inprocess  Flask 테스트 클라이언트로 직접 호출 (HTTP 오버헤드 제외)
+  serve      같은 프로세스에서 werkzeug 서버를 띄우고 HTTP로 호출
+  http       --url로 지정한 외부 서버(python -m src.main / src.cluster / src.asgi)에 HTTP로 호출
+
+워크로드 JSONL: 줄마다 {"model": "<이름 또는 해시>", "rows": 4} 또는 {"model": ..., "data": [[...]]}
+--workload를 생략하면 --requests개를 Zipf(--skew) 분포로 생성한다 (--save-workload로 저장 가능).
+
+사용법: python -m benchmarks.bench_serving [--mode inprocess] [--sizes small medium large]
+            [--requests 500] [--concurrency 8] [--skew 1.2] [--output result.json] [--baseline base.json]
+"""
+import argparse
+import hashlib
+import http.client
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+import psutil
+
+# 크기별 은닉층 너비
+MODEL_SIZES = {
+    'small': (32,),
+    'medium': (256, 256),
+    'large': (1024, 1024, 1024),
+}
+# 기준 결과 대비 비교할 지표 (값이 클수록 좋은지 여부)
+COMPARED_METRICS = {'req_per_sec': True, 'p50_ms': False, 'p95_ms': False, 'p99_ms': False}
+
+def build_model(features: int, hidden_layers: Tuple[int, ...]):
+    """벤치마크용 Dense 모델 생성"""
+    import tensorflow as tf
+
+    inputs = tf.keras.Input(shape=(features,))
+    x = inputs
+    for width in hidden_layers:
+        x = tf.keras.layers.Dense(width, activation='relu')(x)
+    outputs = tf.keras.layers.Dense(2, activation='softmax')(x)
+    return tf.keras.Model(inputs, outputs)
+
+def model_archive(model) -> bytes:
+    """모델을 .keras로 저장해 업로드용 zip으로 묶음"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        keras_path = os.path.join(tmp_dir, 'model.keras')
+        model.save(keras_path)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as zf:
+            zf.write(keras_path, 'model.keras')
+    return buffer.getvalue()
+
+def prepare_models(sizes: List[str], features: int) -> Dict[str, Tuple[str, bytes]]:
+    """크기별 합성 모델 생성 (이름 -> (sha256 해시, zip 바이트))"""
+    models = {}
+    for name in sizes:
+        archive = model_archive(build_model(features, MODEL_SIZES[name]))
+        models[name] = (hashlib.sha256(archive).hexdigest(), archive)
+    return models
+
+def generate_workload(names: List[str], requests: int, skew: float, rows: int, seed: int) -> List[Dict[str, Any]]:
+    """모델 인기도가 Zipf 분포(skew=0이면 균등)를 따르는 워크로드 생성 (앞쪽 모델일수록 인기)"""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, len(names) + 1) ** skew
+    choices = rng.choice(len(names), size=requests, p=weights / weights.sum())
+    return [{'model': names[i], 'rows': rows} for i in choices]
+
+def load_workload(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class InProcessClient:
+    """Flask 테스트 클라이언트 기반 클라이언트 (스레드별 인스턴스)"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def _client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client
+
+    def upload(self, model_hash: str, archive: bytes) -> int:
+        response = self._client().post(f'/upload_model?hash={model_hash}', data=archive,
+                                       content_type='application/zip')
+        return response.status_code
+
+    def predict(self, model_hash: str, body: bytes) -> int:
+        response = self._client().post(f'/predict?hash={model_hash}', data=body,
+                                       content_type='application/json')
+        return response.status_code
+
+    def rss(self) -> Optional[int]:
+        return psutil.Process().memory_info().rss
+
+class HttpClient:
+    """keep-alive HTTP 클라이언트 (스레드별 연결)"""
+
+    def __init__(self, url: str, timeout: float = 120):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+        self.local_server = False
+        self._local = threading.local()
+
+    def _request(self, method: str, target: str, body: Optional[bytes] = None,
+                 headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            conn.request(method, target, body=body, headers=headers or {})
+            response = conn.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            self._local.conn = None
+            raise
+
+    def upload(self, model_hash: str, archive: bytes) -> int:
+        status, _ = self._request('POST', f'/upload_model?hash={model_hash}', archive,
+                                  {'Content-Type': 'application/zip'})
+        return status
+
+    def predict(self, model_hash: str, body: bytes) -> int:
+        status, _ = self._request('POST', f'/predict?hash={model_hash}', body,
+                                  {'Content-Type': 'application/json'})
+        return status
+
+    def rss(self) -> Optional[int]:
+        """서버 RSS (같은 프로세스면 psutil, 외부 서버면 /metrics의 ml_api_ram_usage_mb)"""
+        if self.local_server:
+            return psutil.Process().memory_info().rss
+        try:
+            _, body = self._request('GET', '/metrics')
+        except (OSError, http.client.HTTPException):
+            return None
+        for line in body.decode().splitlines():
+            if line.startswith('ml_api_ram_usage_mb '):
+                return int(float(line.split()[1]) * 1024 * 1024)
+        return None
+
+def create_local_app(store_path: str):
+    """임시 저장소를 사용하는 앱 생성 (백그라운드 작업 비활성화)"""
+    from src.config import Config
+    from src.main import create_app
+
+    class BenchmarkConfig(Config):
+        MODEL_STORE_PATH = store_path
+        MODEL_INDEX_PATH = None
+        JOB_STORE_PATH = os.path.join(store_path, '.jobs')
+        BACKGROUND_TASKS = False
+
+    return create_app(BenchmarkConfig)
+
+def serve_in_thread(app):
+    """werkzeug 서버를 임의 포트로 띄우고 (서버, URL) 반환"""
+    from werkzeug.serving import make_server
+
+    # 요청별 접근 로그는 측정에 방해가 되므로 끔
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+def request_bodies(workload: List[Dict[str, Any]], features: int, seed: int) -> List[bytes]:
+    """요청 본문을 미리 직렬화 (클라이언트 측 JSON 생성 시간은 측정에서 제외)"""
+    rng = np.random.default_rng(seed)
+    bodies = []
+    for entry in workload:
+        data = entry.get('data')
+        if data is None:
+            data = rng.random((entry.get('rows', 1), features), dtype=np.float32).tolist()
+        bodies.append(json.dumps(data).encode())
+    return bodies
+
+def percentiles(latencies: List[float]) -> Dict[str, Optional[float]]:
+    if not latencies:
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99)}
+
+def timed(fn, *args) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def run_benchmark(client, models: Dict[str, Tuple[str, bytes]], workload: List[Dict[str, Any]],
+                  bodies: List[bytes], concurrency: int) -> Dict[str, Any]:
+    """업로드 -> 모델별 콜드 요청 -> 워크로드 동시 재생"""
+    rss = {'start': client.rss()}
+    for name, (model_hash, archive) in models.items():
+        status = client.upload(model_hash, archive)
+        if status != 200:
+            raise RuntimeError(f"Upload of {name} model failed with status {status}")
+
+    # 해시 -> 이름 (워크로드에는 이름 또는 해시를 쓸 수 있음)
+    names = {model_hash: name for name, (model_hash, _) in models.items()}
+    hashes = [models[e['model']][0] if e['model'] in models else e['model'] for e in workload]
+
+    per_model: Dict[str, Dict[str, Any]] = {}
+    for i, model_hash in enumerate(hashes):
+        name = names.get(model_hash, model_hash)
+        if name not in per_model:
+            status, cold_ms = timed(client.predict, model_hash, bodies[i])
+            per_model[name] = {'cold_ms': cold_ms if status == 200 else None, 'latencies': []}
+    rss['after_cold_load'] = client.rss()
+
+    def send(i: int) -> Tuple[int, int, float]:
+        status, latency = timed(client.predict, hashes[i], bodies[i])
+        return i, status, latency
+
+    errors = 0
+    latencies = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for i, status, latency in pool.map(send, range(len(workload))):
+            if status != 200:
+                errors += 1
+                continue
+            latencies.append(latency)
+            per_model[names.get(hashes[i], hashes[i])]['latencies'].append(latency)
+    elapsed = time.perf_counter() - start
+    rss['end'] = client.rss()
+
+    return {
+        'summary': {
+            'requests': len(workload),
+            'errors': errors,
+            'seconds': elapsed,
+            'req_per_sec': len(latencies) / elapsed if elapsed else None,
+            **percentiles(latencies),
+        },
+        'models': {
+            name: {'requests': len(stats['latencies']), 'cold_ms': stats['cold_ms'], **percentiles(stats['latencies'])}
+            for name, stats in per_model.items()
+        },
+        'rss_bytes': rss,
+    }
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """기준 결과 대비 변화 출력 후 허용 범위(%)를 넘은 악화 지표 목록 반환"""
+    regressions = []
+    print(f"\n{'metric':<14}{'baseline':>12}{'current':>12}{'change':>10}")
+    for metric, higher_is_better in COMPARED_METRICS.items():
+        old, new = baseline['summary'].get(metric), result['summary'].get(metric)
+        if not old or new is None:
+            continue
+        change = (new - old) / old * 100
+        print(f"{metric:<14}{old:>12.3f}{new:>12.3f}{change:>9.1f}%")
+        worse = -change if higher_is_better else change
+        if worse > tolerance:
+            regressions.append(metric)
+    return regressions
+
+def print_report(result: Dict[str, Any]) -> None:
+    summary = result['summary']
+    print(f"requests={summary['requests']} errors={summary['errors']} "
+          f"req/s={summary['req_per_sec'] or 0:.1f} p50={summary['p50_ms'] or 0:.2f}ms "
+          f"p95={summary['p95_ms'] or 0:.2f}ms p99={summary['p99_ms'] or 0:.2f}ms")
+    print(f"{'model':<12}{'requests':>10}{'cold(ms)':>12}{'p50(ms)':>10}{'p99(ms)':>10}")
+    for name, stats in result['models'].items():
+        print(f"{name[:12]:<12}{stats['requests']:>10}{stats['cold_ms'] or 0:>12.1f}"
+              f"{stats['p50_ms'] or 0:>10.2f}{stats['p99_ms'] or 0:>10.2f}")
+    rss = {key: f'{value / 2**20:.0f}MB' for key, value in result['rss_bytes'].items() if value}
+    print(f"rss: {rss}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=('inprocess', 'serve', 'http'), default='inprocess')
+    parser.add_argument('--url', help='http 모드의 서버 주소 (예: http://127.0.0.1:5000)')
+    parser.add_argument('--sizes', nargs='+', choices=sorted(MODEL_SIZES), default=['small', 'medium', 'large'])
+    parser.add_argument('--features', type=int, default=64)
+    parser.add_argument('--workload', help='재생할 JSONL 워크로드 파일')
+    parser.add_argument('--save-workload', help='생성한 워크로드를 JSONL로 저장')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--rows', type=int, default=1)
+    parser.add_argument('--skew', type=float, default=1.2, help='Zipf 지수 (0 = 균등)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--baseline', help='비교할 기준 결과 JSON')
+    parser.add_argument('--tolerance', type=float, default=10.0, help='허용 악화율(%%), 초과 시 종료 코드 1')
+    args = parser.parse_args()
+    if args.mode == 'http' and not args.url:
+        parser.error('--url is required in http mode')
+
+    models = prepare_models(args.sizes, args.features)
+    workload = (load_workload(args.workload) if args.workload
+                else generate_workload(list(models), args.requests, args.skew, args.rows, args.seed))
+    if args.save_workload:
+        with open(args.save_workload, 'w') as f:
+            f.writelines(json.dumps(entry) + '\n' for entry in workload)
+    bodies = request_bodies(workload, args.features, args.seed)
+
+    with tempfile.TemporaryDirectory(prefix='ml_api_bench_') as store_path:
+        server = None
+        if args.mode == 'http':
+            client = HttpClient(args.url)
+        else:
+            app = create_local_app(store_path)
+            if args.mode == 'inprocess':
+                client = InProcessClient(app)
+            else:
+                server, url = serve_in_thread(app)
+                client = HttpClient(url)
+                client.local_server = True
+        try:
+            result = run_benchmark(client, models, workload, bodies, args.concurrency)
+        finally:
+            if server is not None:
+                server.shutdown()
+
+    result['config'] = {key: value for key, value in vars(args).items() if key not in ('output', 'baseline')}
+    print_report(result)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        if regressions:
+            print(f"Regressions beyond {args.tolerance}%: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
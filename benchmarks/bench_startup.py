@@ -0,0 +1,108 @@
+#benchmarks/bench_startup
+"""서버 시작 시간 측정 (프로세스 실행 -> 첫 /health 200 -> 첫 /ready 200)
+
+`python -m src.main`을 임시 저장소로 여러 번 실행해 첫 헬스 체크 응답까지의 시간과
+(TF_PRELOAD=true일 때 TensorFlow import를 포함한) 준비 완료까지의 시간을 측정한다.
+
+사용법: python -m benchmarks.bench_startup [--runs 5] [--output startup.json] [--baseline base.json]
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def poll(port: int, path: str, deadline: float) -> Optional[float]:
+    """200 응답이 올 때까지 요청 반복, 응답 시각(perf_counter) 반환"""
+    while time.perf_counter() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', path)
+            if conn.getresponse().status == 200:
+                return time.perf_counter()
+        except (OSError, http.client.HTTPException):
+            pass
+        finally:
+            conn.close()
+        time.sleep(0.01)
+    return None
+
+def measure_once(timeout: float, extra_env: Dict[str, str]) -> Dict[str, Optional[float]]:
+    """서버를 한 번 실행해 /health, /ready까지 걸린 시간(초) 측정"""
+    port = free_port()
+    with tempfile.TemporaryDirectory(prefix='ml_api_startup_') as store_path:
+        env = dict(os.environ, SERVER_HOST='127.0.0.1', SERVER_PORT=str(port),
+                   MODEL_STORE_PATH=os.path.join(store_path, 'models'),
+                   JOB_STORE_PATH=os.path.join(store_path, 'jobs'),
+                   BACKGROUND_TASKS='false', **extra_env)
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, '-m', 'src.main'], env=env,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            deadline = start + timeout
+            healthy = poll(port, '/health', deadline)
+            ready = poll(port, '/ready', deadline) if healthy else None
+        finally:
+            process.terminate()
+            process.wait(10)
+    return {
+        'health_s': healthy - start if healthy else None,
+        'ready_s': ready - start if ready else None,
+    }
+
+def summarize(values: List[Optional[float]]) -> Dict[str, Optional[float]]:
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return {'median': None, 'min': None, 'max': None}
+    return {'median': values[len(values) // 2], 'min': values[0], 'max': values[-1]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--env', nargs='*', default=[], help='서버에 추가로 넘길 환경 변수 (KEY=VALUE)')
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--baseline', help='비교할 기준 결과 JSON')
+    args = parser.parse_args()
+    extra_env = dict(item.split('=', 1) for item in args.env)
+
+    runs = [measure_once(args.timeout, extra_env) for _ in range(args.runs)]
+    result = {
+        'runs': runs,
+        'health_s': summarize([run['health_s'] for run in runs]),
+        'ready_s': summarize([run['ready_s'] for run in runs]),
+        'config': {'runs': args.runs, 'env': extra_env},
+    }
+
+    print(f"{'metric':<12}{'median(s)':>12}{'min(s)':>10}{'max(s)':>10}")
+    for metric in ('health_s', 'ready_s'):
+        stats = result[metric]
+        if stats['median'] is None:
+            print(f"{metric:<12}{'timeout':>12}")
+            continue
+        print(f"{metric:<12}{stats['median']:>12.3f}{stats['min']:>10.3f}{stats['max']:>10.3f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for metric in ('health_s', 'ready_s'):
+            old, new = baseline[metric]['median'], result[metric]['median']
+            if old and new:
+                print(f"{metric}: {old:.3f}s -> {new:.3f}s ({(new - old) / old * 100:+.1f}%)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,8 @@
+#!/bin/sh
+# SERVING_MODE=cluster: 라우터 + 모델 해시별 워커 SERVING_WORKERS개 (python -m src.cluster)
+# 그 외: 단일 gunicorn 프로세스
+set -e
+if [ "${SERVING_MODE:-single}" = "cluster" ]; then
+    exec python -m src.cluster
+fi
+exec gunicorn -w 1 -b 0.0.0.0:5000 "src.main:create_app()"
@@ -1,9 +1,15 @@
 #api/health
-from flask import Blueprint
+from flask import Blueprint, jsonify, current_app
 
 health_bp = Blueprint('health', __name__)
 
 @health_bp.route('/health', methods=['GET'])
 def health_check():
     """서비스 헬스 체크 엔드포인트 (Liveness Probe용)"""
-    return "Healthy", 200
\ No newline at end of file
+    return "Healthy", 200
+
+@health_bp.route('/ready', methods=['GET'])
+def readiness_check():
+    """준비 상태 엔드포인트 (Readiness Probe용, 워밍업 대상이 모두 로드되면 200)"""
+    status = current_app.warmer.status()
+    return jsonify(status), 200 if status['ready'] else 503
\ No newline at end of file
@@ -0,0 +1,59 @@
+#api/job_routes
+import os
+from flask import Blueprint, request, jsonify, current_app, send_file
+from src.common.metrics import get_metrics
+from src.core.batch_jobs import COMPLETED
+
+job_bp = Blueprint('jobs', __name__)
+metrics = get_metrics()
+
+@job_bp.route('/jobs', methods=['POST'])
+def create_job():
+    """대량 예측 작업 등록 엔드포인트 (input_file: .jsonl 또는 .npy)"""
+    input_file = request.files.get('input_file')
+    model_hash = request.args.get('hash')
+
+    if not input_file or not model_hash:
+        metrics.increment_error_count('create_job_missing_data')
+        return jsonify({'error': 'Missing data (input_file or hash)'}), 400
+
+    input_format = 'npy' if (input_file.filename or '').endswith('.npy') else 'jsonl'
+    batch_size = request.args.get('batch_size', type=int)
+
+    try:
+        job = current_app.job_manager.create_job(model_hash, input_file, input_format, batch_size=batch_size)
+        return jsonify(job), 202
+
+    except KeyError:
+        metrics.increment_error_count('create_job_model_not_found')
+        return jsonify({'error': 'Model not found'}), 404
+
+    except Exception as e:
+        metrics.increment_error_count('create_job_error')
+        current_app.logger.error(f"Job creation failed: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@job_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """작업 상태 조회 엔드포인트 (진행 행 수, 처리량 포함)"""
+    try:
+        return jsonify(current_app.job_manager.get_job(job_id)), 200
+    except KeyError:
+        metrics.increment_error_count('get_job_not_found')
+        return jsonify({'error': 'No such job'}), 404
+
+@job_bp.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """완료된 작업의 결과(JSONL) 다운로드 엔드포인트"""
+    try:
+        job = current_app.job_manager.get_job(job_id)
+    except KeyError:
+        metrics.increment_error_count('get_job_not_found')
+        return jsonify({'error': 'No such job'}), 404
+
+    if job['status'] != COMPLETED:
+        return jsonify({'error': f"Job is {job['status']}"}), 409
+
+    output_path = os.path.abspath(current_app.job_manager.output_path(job_id))
+    return send_file(output_path, mimetype='application/jsonl', as_attachment=True,
+                     download_name=f'{job_id}.jsonl')
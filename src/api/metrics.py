@@ -1,11 +1,13 @@
 #api/metrics
-from flask import Blueprint, Response
-from prometheus_client import generate_latest
+from flask import Blueprint, Response, current_app
+from src.common.metrics import collect_latest
 
 metrics_bp = Blueprint('metrics', __name__)
 
 @metrics_bp.route('/metrics')
 def metrics_endpoint():
     """Prometheus 메트릭스를 노출하는 엔드포인트"""
+    # 모델별 공유 메모리는 다른 워커의 매핑에 따라 바뀌므로 스크레이핑 시점에 갱신
+    current_app.model_manager.update_memory_metrics()
     # Prometheus 스크래핑을 위한 텍스트 형식 반환
-    return Response(generate_latest(), mimetype='text/plain')
\ No newline at end of file
+    return Response(collect_latest(), mimetype='text/plain')
\ No newline at end of file
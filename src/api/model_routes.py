@@ -1,16 +1,38 @@
 #api/model_routes
-import numpy as np
-from flask import Blueprint, request, jsonify, current_app
+import time
+
+from flask import Blueprint, Response, request, jsonify, current_app, make_response
+from src.common import tensor_codec, tracing
 from src.common.metrics import get_metrics
+from src.core import backends
+from src.core.input_spec import InvalidInputError
+from src.core.scheduler import PRIORITY_HEADER, TIMEOUT_HEADER, DeadlineExceededError, QueueFullError, parse_priority
+from src.core.upload import UploadTooLargeError
 
 model_bp = Blueprint('model', __name__)
 metrics = get_metrics()
 
 @model_bp.route('/upload_model', methods=['POST'])
 def upload_model():
-    """모델 업로드 엔드포인트"""
-    model_file = request.files.get('model_file')
+    """모델 업로드 엔드포인트 (multipart model_file 또는 application/zip 본문)"""
     model_hash = request.args.get('hash')
+    fast_path = request.args.get('fast_path', 'true').lower() != 'false'
+    # 변환할 백엔드 목록(미지정 시 BACKEND_CONVERT 설정)과 수동 지정 백엔드
+    convert = backends.parse_names(request.args.get('convert'))
+    backend = request.args.get('backend')
+    mmap = request.args.get('mmap')
+    mmap = None if mmap is None else mmap.lower() == 'true'
+
+    # 크기 제한 초과 시 본문을 읽기 전에 거절
+    max_size = current_app.config['MAX_MODEL_FILE_SIZE']
+    if max_size and request.content_length and request.content_length > max_size:
+        metrics.increment_error_count('upload_model_too_large')
+        return jsonify({'error': f'Model file exceeds {max_size} bytes'}), 413
+
+    if request.mimetype in ('application/zip', 'application/octet-stream'):
+        model_file = request.stream if request.content_length else None
+    else:
+        model_file = request.files.get('model_file')
 
     # 필수 데이터 누락 확인
     if not model_file or not model_hash:
@@ -18,31 +40,115 @@ def upload_model():
         return jsonify({'error': 'Missing data (file or hash)'}), 400
 
     try:
-        # ModelManager를 통해 모델 저장 및 압축 해제
-        msg, status = current_app.model_manager.upload_model(model_file, model_hash)
+        # ModelManager를 통해 모델 검증, 압축 해제 및 설치
+        msg, status = current_app.model_manager.upload_model(
+            model_file, model_hash, fast_path=fast_path, convert=convert, backend=backend, mmap=mmap,
+        )
+        if current_app.warmer.on_upload:
+            current_app.warmer.warm_async(model_hash)
         return jsonify({'message': msg}), status
 
+    except UploadTooLargeError as e:
+        metrics.increment_error_count('upload_model_too_large')
+        return jsonify({'error': str(e)}), 413
+
+    except ValueError as e:
+        metrics.increment_error_count('upload_model_invalid')
+        return jsonify({'error': str(e)}), 400
+
     except Exception as e:
         metrics.increment_error_count('upload_model_error')
         current_app.logger.error(f"Upload failed: {e}")
         return jsonify({'error': str(e)}), 500
 
+def _read_tensor():
+    """요청 본문을 Content-Type에 맞춰 디코딩 (JSON은 리스트 그대로 - 모델 dtype 변환은 ModelManager에서)"""
+    if request.mimetype in (tensor_codec.JSON, ''):
+        with tracing.stage('decode'):
+            data = request.get_json(silent=request.mimetype == '')
+        return data if data else None
+    with tracing.stage('decode'):
+        body = request.get_data(cache=False)
+        if not body:
+            return None
+        return tensor_codec.decode(body, request.mimetype, request.headers)
+
+def _tensor_response(prediction, status):
+    """Accept 헤더에 맞춰 예측 결과 응답 생성 (JSON 기본)"""
+    mimetype = request.accept_mimetypes.best_match(tensor_codec.available_formats(), tensor_codec.JSON)
+    with tracing.stage('serialize'):
+        if mimetype == tensor_codec.JSON:
+            return jsonify({'prediction': tensor_codec.to_jsonable(prediction)}), status
+        body, headers = tensor_codec.encode(prediction, mimetype)
+        return Response(body, status=status, mimetype=mimetype, headers=headers)
+
 @model_bp.route('/predict', methods=['POST'])
 def predict():
-    """예측 수행 엔드포인트"""
+    """예측 수행 엔드포인트 (JSON, raw, npy, msgpack, Arrow tensor 입출력)"""
+    # 단계별 소요 시간을 히스토그램과 Server-Timing 헤더로 기록
+    trace = tracing.begin_trace()
+    try:
+        response = make_response(_predict(trace))
+    finally:
+        tracing.end_trace(trace)
+    response.headers['Server-Timing'] = trace.server_timing()
+    return response
+
+def _deadline(received_at):
+    """요청 수신 시각 기준 마감 시각 (time.monotonic), 제한이 없으면 None"""
+    timeout_ms = float(request.headers.get(TIMEOUT_HEADER) or current_app.config['REQUEST_TIMEOUT_MS'])
+    if timeout_ms < 0:
+        raise ValueError(f"{TIMEOUT_HEADER} must not be negative")
+    return received_at + timeout_ms / 1000 if timeout_ms else None
+
+def _predict(trace):
+    received_at = time.monotonic()
     model_hash = request.args.get('hash')
-    data = request.get_json()
-    
+    scheduler = current_app.scheduler
+
+    try:
+        data = _read_tensor()
+        # 우선순위/처리 시간 제한 헤더는 스케줄러를 쓸 때만 해석
+        if scheduler is not None:
+            priority = parse_priority(request.headers.get(PRIORITY_HEADER))
+            deadline = _deadline(received_at)
+    except tensor_codec.UnsupportedFormatError as e:
+        metrics.increment_error_count('predict_unsupported_format')
+        return jsonify({'error': str(e)}), 415
+    except ValueError as e:
+        metrics.increment_error_count('predict_invalid_data')
+        return jsonify({'error': str(e)}), 400
+
     # 필수 파라미터 확인
-    if not model_hash or not data:
+    if not model_hash or data is None or getattr(data, 'size', 1) == 0:
         metrics.increment_error_count('predict_missing_data')
         return jsonify({'error': 'Missing hash or data'}), 400
 
     try:
-        # 예측 수행 (ModelManager 위임)
-        pred, status = current_app.model_manager.predict(model_hash, np.array(data))
+        # 예측 수행 (스케줄러 사용 시 모델별 대기열 경유, 아니면 요청 스레드에서 ModelManager 위임)
+        if scheduler is not None:
+            pred, status = scheduler.predict(model_hash, data, priority, deadline)
+        else:
+            pred, status = current_app.model_manager.predict(model_hash, data)
+        trace.model_hash = model_hash
         metrics.increment_predictions_completed()
-        return jsonify({'prediction': pred.tolist()}), status
+        return _tensor_response(pred, status)
+
+    except QueueFullError as e:
+        metrics.increment_error_count('predict_queue_full')
+        return jsonify({'error': str(e)}), 429, {'Retry-After': '1'}
+
+    except DeadlineExceededError as e:
+        metrics.increment_error_count('predict_deadline_exceeded')
+        return jsonify({'error': str(e)}), 504
+
+    except InvalidInputError as e:
+        metrics.increment_error_count('predict_invalid_data')
+        return jsonify({'error': str(e)}), 400
+
+    except tensor_codec.UnsupportedFormatError as e:
+        metrics.increment_error_count('predict_unsupported_format')
+        return jsonify({'error': str(e)}), 406
 
     except KeyError:
         metrics.increment_error_count('predict_model_not_found')
@@ -53,6 +159,61 @@ def predict():
         current_app.logger.error(f"Prediction error: {e}")
         return jsonify({'error': 'Internal error during prediction'}), 500
 
+@model_bp.route('/predict_multi', methods=['POST'])
+def predict_multi():
+    """여러 모델 예측 엔드포인트 (입력은 한 번만 변환, 모델별 결과와 선택적 mean/vote 앙상블)"""
+    model_hashes = [h for value in request.args.getlist('hash') for h in value.split(',') if h]
+    ensemble = request.args.get('ensemble')
+    timeout_ms = request.args.get('timeout_ms', type=float)
+
+    try:
+        data = _read_tensor()
+    except tensor_codec.UnsupportedFormatError as e:
+        metrics.increment_error_count('predict_unsupported_format')
+        return jsonify({'error': str(e)}), 415
+    except ValueError as e:
+        metrics.increment_error_count('predict_invalid_data')
+        return jsonify({'error': str(e)}), 400
+
+    if not model_hashes or data is None or getattr(data, 'size', 1) == 0:
+        metrics.increment_error_count('predict_multi_missing_data')
+        return jsonify({'error': 'Missing hash or data'}), 400
+
+    try:
+        result = current_app.multi_predictor.predict(model_hashes, data, ensemble=ensemble, timeout_ms=timeout_ms)
+        return jsonify(tensor_codec.to_jsonable(result)), 200
+
+    except ValueError as e:
+        metrics.increment_error_count('predict_multi_invalid')
+        return jsonify({'error': str(e)}), 400
+
+    except Exception as e:
+        metrics.increment_error_count('predict_multi_error')
+        current_app.logger.error(f"Multi-model prediction error: {e}")
+        return jsonify({'error': 'Internal error during prediction'}), 500
+
+@model_bp.route('/set_model_backend', methods=['POST'])
+def set_model_backend():
+    """모델 추론 백엔드 수동 지정 엔드포인트 (backend 미지정 시 자동 선택으로 복귀)"""
+    model_hash = request.args.get('hash')
+    backend = request.args.get('backend') or None
+
+    if not model_hash:
+        metrics.increment_error_count('set_model_backend_missing_hash')
+        return jsonify({'error': 'Model hash is required'}), 400
+
+    try:
+        active = current_app.model_manager.set_backend(model_hash, backend)
+        return jsonify({'message': 'Backend updated', 'active_backend': active}), 200
+
+    except KeyError:
+        metrics.increment_error_count('set_model_backend_not_found')
+        return jsonify({'error': 'No such model'}), 404
+
+    except ValueError as e:
+        metrics.increment_error_count('set_model_backend_invalid')
+        return jsonify({'error': str(e)}), 400
+
 @model_bp.route('/get_model', methods=['GET'])
 def get_model():
     """모델 존재 여부 및 정보 확인 엔드포인트"""
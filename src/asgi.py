@@ -0,0 +1,378 @@
+#asgi
+"""비동기(ASGI) 서빙 진입점
+
+`/predict`, `/get_model`, `/upload_model`은 이벤트 루프에서 직접 처리하고(추론은 InferenceScheduler의 작업 스레드),
+그 외 경로(`/health`, `/ready`, `/metrics`, `/jobs` 등)는 같은 Flask 앱에 WSGI로 위임한다.
+
+사용법: python -m src.asgi                        (uvicorn 필요, `asgi` extra)
+        uvicorn --factory src.asgi:create_asgi_app
+"""
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from werkzeug.wrappers import Request
+
+from src.config import Config
+from src.main import create_app
+from src.common import tensor_codec, tracing
+from src.common.metrics import get_metrics
+from src.core import backends
+from src.core.async_executor import AsyncInferenceExecutor
+from src.core.input_spec import InvalidInputError
+from src.core.scheduler import (PRIORITY_HEADER, TIMEOUT_HEADER, DeadlineExceededError, InferenceScheduler,
+                                 QueueFullError, parse_priority)
+from src.core.upload import UploadTooLargeError
+
+Response = Tuple[int, List[Tuple[str, str]], bytes]
+
+class AsyncModelApp:
+    """모델 라우트용 ASGI 애플리케이션
+
+    요청 스레드를 점유하지 않으므로 콜드 로드나 느린 추론이 다른 요청의 수신을 막지 않는다.
+    모델별 대기열이 가득 차면 429, 처리 시간 제한을 넘기면 504로 응답하며 만료된 요청은 모델에 전달하지 않는다.
+    """
+
+    def __init__(self, flask_app, workers: int = 4, max_queue_per_model: int = 64, default_timeout_ms: float = 0,
+                 max_concurrency_per_model: int = 0, target_latency_ms: float = 0, aging_ms: float = 1000,
+                 scheduler: Optional[InferenceScheduler] = None):
+        self.flask_app = flask_app
+        self.model_manager = flask_app.model_manager
+        self.default_timeout_ms = default_timeout_ms
+        self.max_upload_size = flask_app.config['MAX_MODEL_FILE_SIZE']
+        self.spool_memory = flask_app.config['UPLOAD_SPOOL_MAX_MEMORY']
+        self.executor = AsyncInferenceExecutor(
+            self.model_manager, workers=workers, max_queue_per_model=max_queue_per_model,
+            max_concurrency_per_model=max_concurrency_per_model, target_latency_ms=target_latency_ms,
+            aging_ms=aging_ms, scheduler=scheduler,
+        )
+        self.metrics = get_metrics()
+        self.logger = flask_app.logger
+        self.routes = {
+            ('POST', '/predict'): self.predict,
+            ('GET', '/get_model'): self.get_model,
+            ('POST', '/upload_model'): self.upload_model,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        handler = self.routes.get((scope['method'], scope['path']))
+        if handler is None:
+            await self._call_wsgi(scope, receive, send)
+            return
+        status, headers, body = await handler(scope, receive)
+        await _send_response(send, status, headers, body)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown()
+                if self.flask_app.scheduler is not None:
+                    self.flask_app.scheduler.shutdown()
+                self.flask_app.job_manager.shutdown()
+                self.flask_app.model_manager.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _json(self, payload: Any, status: int, headers: Tuple[Tuple[str, str], ...] = ()) -> Response:
+        body = self.flask_app.json.dumps(payload).encode()
+        return status, [('Content-Type', 'application/json'), *headers], body
+
+    def _deadline(self, request: Request, received_at: float) -> Optional[float]:
+        """요청 수신 시각 기준 마감 시각 (time.monotonic), 제한이 없으면 None"""
+        timeout_ms = float(request.headers.get(TIMEOUT_HEADER) or self.default_timeout_ms)
+        if timeout_ms < 0:
+            raise ValueError(f"{TIMEOUT_HEADER} must not be negative")
+        return received_at + timeout_ms / 1000 if timeout_ms else None
+
+    async def predict(self, scope, receive) -> Response:
+        """예측 수행 (JSON, raw, npy, msgpack, Arrow tensor 입출력)"""
+        # 이벤트 루프 스레드는 요청 간에 공유되므로 프로파일러 샘플링은 추론 스레드에서만
+        trace = tracing.begin_trace(attach=False)
+        try:
+            status, headers, body = await self._predict(scope, receive, trace)
+        finally:
+            tracing.end_trace(trace)
+        return status, [*headers, ('Server-Timing', trace.server_timing())], body
+
+    async def _predict(self, scope, receive, trace: tracing.RequestTrace) -> Response:
+        received_at = time.monotonic()
+        with tracing.stage('receive'):
+            request = await _read_request(scope, receive, self.spool_memory)
+        model_hash = request.args.get('hash')
+
+        try:
+            data = _read_tensor(request)
+            deadline = self._deadline(request, received_at)
+            priority = parse_priority(request.headers.get(PRIORITY_HEADER))
+        except tensor_codec.UnsupportedFormatError as e:
+            self.metrics.increment_error_count('predict_unsupported_format')
+            return self._json({'error': str(e)}, 415)
+        except ValueError as e:
+            self.metrics.increment_error_count('predict_invalid_data')
+            return self._json({'error': str(e)}, 400)
+
+        if not model_hash or data is None or getattr(data, 'size', 1) == 0:
+            self.metrics.increment_error_count('predict_missing_data')
+            return self._json({'error': 'Missing hash or data'}, 400)
+
+        try:
+            pred, status = await self.executor.predict(model_hash, data, deadline, priority)
+            trace.model_hash = model_hash
+            self.metrics.increment_predictions_completed()
+            return self._tensor_response(request, pred, status)
+
+        except QueueFullError as e:
+            self.metrics.increment_error_count('predict_queue_full')
+            return self._json({'error': str(e)}, 429, (('Retry-After', '1'),))
+
+        except DeadlineExceededError as e:
+            self.metrics.increment_error_count('predict_deadline_exceeded')
+            return self._json({'error': str(e)}, 504)
+
+        except InvalidInputError as e:
+            self.metrics.increment_error_count('predict_invalid_data')
+            return self._json({'error': str(e)}, 400)
+
+        except tensor_codec.UnsupportedFormatError as e:
+            self.metrics.increment_error_count('predict_unsupported_format')
+            return self._json({'error': str(e)}, 406)
+
+        except KeyError:
+            self.metrics.increment_error_count('predict_model_not_found')
+            return self._json({'error': 'Model not found'}, 404)
+
+        except Exception as e:
+            self.metrics.increment_error_count('predict_error')
+            self.logger.error(f"Prediction error: {e}")
+            return self._json({'error': 'Internal error during prediction'}, 500)
+
+    def _tensor_response(self, request: Request, prediction: Any, status: int) -> Response:
+        """Accept 헤더에 맞춰 예측 결과 응답 생성 (JSON 기본)"""
+        mimetype = request.accept_mimetypes.best_match(tensor_codec.available_formats(), tensor_codec.JSON)
+        with tracing.stage('serialize'):
+            if mimetype == tensor_codec.JSON:
+                return self._json({'prediction': tensor_codec.to_jsonable(prediction)}, status)
+            body, headers = tensor_codec.encode(prediction, mimetype)
+            return status, [('Content-Type', mimetype), *headers.items()], body
+
+    async def get_model(self, scope, receive) -> Response:
+        """모델 존재 여부 및 정보 확인"""
+        request = await _read_request(scope, receive, self.spool_memory)
+        model_hash = request.args.get('hash')
+
+        if not model_hash:
+            self.metrics.increment_error_count('get_model_missing_hash')
+            return self._json({'error': 'Model hash is required'}, 400)
+
+        try:
+            # 인덱스 조회/원격 저장소 확인이 이벤트 루프를 막지 않도록 스레드에서 실행
+            model_info = await asyncio.to_thread(self.model_manager.get_model_info, model_hash)
+            return self._json({'message': model_info}, 200)
+
+        except KeyError:
+            self.metrics.increment_error_count('get_model_not_found')
+            return self._json({'error': 'No such model'}, 404)
+
+        except Exception as e:
+            self.metrics.increment_error_count('get_model_error')
+            self.logger.error(f"Error retrieving model info: {e}")
+            return self._json({'error': str(e)}, 500)
+
+    async def upload_model(self, scope, receive) -> Response:
+        """모델 업로드 (multipart model_file 또는 application/zip 본문)"""
+        # 크기 제한 초과 시 본문을 읽기 전에 거절
+        content_length = int(_header(scope, b'content-length') or 0)
+        if self.max_upload_size and content_length > self.max_upload_size:
+            self.metrics.increment_error_count('upload_model_too_large')
+            return self._json({'error': f'Model file exceeds {self.max_upload_size} bytes'}, 413)
+
+        request = await _read_request(scope, receive, self.spool_memory)
+        model_hash = request.args.get('hash')
+        fast_path = request.args.get('fast_path', 'true').lower() != 'false'
+        convert = backends.parse_names(request.args.get('convert'))
+        backend = request.args.get('backend')
+        mmap = request.args.get('mmap')
+        mmap = None if mmap is None else mmap.lower() == 'true'
+
+        try:
+            if request.mimetype in ('application/zip', 'application/octet-stream'):
+                # 스풀된 본문 파일은 탐색 가능하므로 다시 복사하지 않고 그대로 해시/해제
+                model_file = request.environ['wsgi.input'] if request.content_length else None
+            else:
+                # multipart 파싱은 임시 파일 I/O가 있으므로 스레드에서 실행
+                files = await asyncio.to_thread(lambda: request.files)
+                model_file = files.get('model_file')
+
+            if not model_file or not model_hash:
+                self.metrics.increment_error_count('upload_model_missing_data')
+                return self._json({'error': 'Missing data (file or hash)'}, 400)
+
+            # 디스크 작업은 추론 스레드 풀과 분리된 기본 실행기에서 처리
+            msg, status = await asyncio.to_thread(
+                self.model_manager.upload_model, model_file, model_hash,
+                fast_path=fast_path, convert=convert, backend=backend, mmap=mmap,
+            )
+            if self.flask_app.warmer.on_upload:
+                self.flask_app.warmer.warm_async(model_hash)
+            return self._json({'message': msg}, status)
+
+        except UploadTooLargeError as e:
+            self.metrics.increment_error_count('upload_model_too_large')
+            return self._json({'error': str(e)}, 413)
+
+        except ValueError as e:
+            self.metrics.increment_error_count('upload_model_invalid')
+            return self._json({'error': str(e)}, 400)
+
+        except Exception as e:
+            self.metrics.increment_error_count('upload_model_error')
+            self.logger.error(f"Upload failed: {e}")
+            return self._json({'error': str(e)}, 500)
+
+        finally:
+            request.close()
+
+    async def _call_wsgi(self, scope, receive, send):
+        """나머지 경로는 Flask 앱을 스레드에서 실행해 응답을 청크 단위로 중계"""
+        request = await _read_request(scope, receive, self.spool_memory)
+        started: Dict[str, Any] = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = headers
+
+        result = await asyncio.to_thread(self.flask_app.wsgi_app, request.environ, start_response)
+        iterator = iter(result)
+        try:
+            first = await asyncio.to_thread(next, iterator, b'')
+            await send({
+                'type': 'http.response.start',
+                'status': started['status'],
+                'headers': [(k.encode('latin-1'), v.encode('latin-1')) for k, v in started['headers']],
+            })
+            chunk = first
+            while True:
+                following = await asyncio.to_thread(next, iterator, None)
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': following is not None})
+                if following is None:
+                    break
+                chunk = following
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+            request.close()
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope['headers']:
+        if key.lower() == name:
+            return value.decode('latin-1')
+    return None
+
+async def _read_request(scope, receive, spool_memory: int) -> Request:
+    """요청 본문을 SpooledTemporaryFile에 받아 WSGI environ 기반 werkzeug Request 생성"""
+    body = tempfile.SpooledTemporaryFile(max_size=spool_memory)
+    length = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunk = message.get('body', b'')
+        if chunk:
+            body.write(chunk)
+            length += len(chunk)
+        if not message.get('more_body'):
+            break
+    body.seek(0)
+    return Request(_environ(scope, body, length))
+
+def _environ(scope, body, length: int) -> Dict[str, Any]:
+    """ASGI scope를 WSGI environ으로 변환 (Content-Length는 실제 수신 길이)"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client')
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0] if client else '',
+        'CONTENT_LENGTH': str(length),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for key, value in scope['headers']:
+        name = key.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_LENGTH':
+            continue
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+            continue
+        name = f'HTTP_{name}'
+        environ[name] = f'{environ[name]},{value}' if name in environ else value
+    return environ
+
+def _read_tensor(request: Request):
+    """요청 본문을 Content-Type에 맞춰 디코딩 (JSON은 리스트 그대로 - 모델 dtype 변환은 ModelManager에서)"""
+    with tracing.stage('decode'):
+        body = request.get_data(cache=False)
+        if not body:
+            return None
+        if request.mimetype not in (tensor_codec.JSON, ''):
+            return tensor_codec.decode(body, request.mimetype, request.headers)
+        try:
+            data = json.loads(body)
+        except ValueError:
+            if request.mimetype == '':
+                return None
+            raise ValueError('Invalid JSON body')
+    return data if data else None
+
+async def _send_response(send, status: int, headers: List[Tuple[str, str]], body: bytes):
+    headers = [*headers, ('Content-Length', str(len(body)))]
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(k.encode('latin-1'), v.encode('latin-1')) for k, v in headers],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+def create_asgi_app(config_class=Config) -> AsyncModelApp:
+    """ASGI 애플리케이션 팩토리 함수 (Flask 앱과 같은 ModelManager와 추론 스케줄러 공유)"""
+    flask_app = create_app(config_class)
+    return AsyncModelApp(
+        flask_app,
+        workers=flask_app.config['ASYNC_INFERENCE_WORKERS'],
+        max_queue_per_model=flask_app.config['ASYNC_MAX_QUEUE_PER_MODEL'],
+        default_timeout_ms=flask_app.config['REQUEST_TIMEOUT_MS'],
+        max_concurrency_per_model=flask_app.config['SCHEDULER_MAX_CONCURRENCY_PER_MODEL'],
+        target_latency_ms=flask_app.config['SCHEDULER_TARGET_LATENCY_MS'],
+        aging_ms=flask_app.config['SCHEDULER_AGING_MS'],
+        scheduler=flask_app.scheduler,
+    )
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit("uvicorn is required for ASGI serving (install the 'asgi' extra)")
+    uvicorn.run(create_asgi_app(), host=Config.HOST, port=Config.PORT)
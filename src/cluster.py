@@ -0,0 +1,100 @@
+#cluster
+"""멀티프로세스 서빙 런처
+
+워커 N개를 각각 gunicorn(gthread)으로 로컬 포트에 띄우고, 프런트 라우터도 gunicorn으로 실행해
+모델 해시별로 고정 워커에 요청을 보낸다. 정리 스케줄러/리소스 모니터/작업 재개는 0번 워커에서만 실행되며,
+Prometheus 메트릭은 PROMETHEUS_MULTIPROC_DIR을 통해 모든 프로세스 값이 합산된다.
+자식 프로세스 중 하나라도 종료되면 나머지를 정리하고 함께 종료한다 (재시작은 컨테이너/프로세스 관리자가 담당).
+
+사용법: python -m src.cluster   (SERVING_WORKERS, WORKER_BASE_PORT, WORKER_THREADS, ROUTER_PROCESSES,
+                                 ROUTER_THREADS, SERVER_HOST, SERVER_PORT 환경 변수)
+"""
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+def _ensure_multiproc_dir() -> str:
+    """Prometheus 멀티프로세스 디렉터리 준비 (prometheus_client import 전에 호출해야 함)"""
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if not path:
+        path = tempfile.mkdtemp(prefix='ml_api_prom_')
+        os.environ['PROMETHEUS_MULTIPROC_DIR'] = path
+    else:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+    return path
+
+def _gunicorn(app: str, bind: str, processes: int, threads: int, env: Dict[str, str]) -> subprocess.Popen:
+    """gunicorn gthread 서버 실행 (src.gunicorn_config가 종료된 프로세스의 메트릭 파일 정리)"""
+    return subprocess.Popen([
+        sys.executable, '-m', 'gunicorn',
+        '--workers', str(processes),
+        '--worker-class', 'gthread',
+        '--threads', str(threads),
+        '--bind', bind,
+        '--config', 'python:src.gunicorn_config',
+        app,
+    ], env=env)
+
+def _wait_for_port(port: int, processes: List[subprocess.Popen], timeout: float = 120) -> None:
+    import socket
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if any(process.poll() is not None for process in processes):
+            raise RuntimeError(f"A serving process exited before port {port} was ready")
+        with socket.socket() as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.2)
+    raise TimeoutError(f"Worker on port {port} did not start")
+
+def main() -> None:
+    """워커들을 띄우고 프런트 라우터 실행"""
+    _ensure_multiproc_dir()
+
+    from src.config import Config
+
+    ports = [Config.WORKER_BASE_PORT + i for i in range(Config.SERVING_WORKERS)]
+    worker_urls = [f'http://127.0.0.1:{port}' for port in ports]
+    processes: List[subprocess.Popen] = []
+
+    def terminate(*_):
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in processes:
+            process.wait()
+
+    def stop(signum, frame):
+        terminate()
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    try:
+        for index, port in enumerate(ports):
+            # 워커도 라우터와 같은 해시 링을 만들어 담당 모델만 워밍업
+            env = dict(os.environ, BACKGROUND_TASKS='true' if index == 0 else 'false',
+                       CLUSTER_WORKER_URLS=','.join(worker_urls), CLUSTER_WORKER_URL=worker_urls[index])
+            processes.append(_gunicorn('src.main:create_app()', f'127.0.0.1:{port}', 1,
+                                       Config.WORKER_THREADS, env))
+        for port in ports:
+            _wait_for_port(port, processes)
+
+        env = dict(os.environ, CLUSTER_WORKER_URLS=','.join(worker_urls))
+        processes.append(_gunicorn('src.router:create_router()', f'{Config.HOST}:{Config.PORT}',
+                                   Config.ROUTER_PROCESSES, Config.ROUTER_THREADS, env))
+        # 자식 하나가 죽으면 클러스터 전체를 종료
+        while all(process.poll() is None for process in processes):
+            time.sleep(1)
+        sys.exit(1)
+    finally:
+        terminate()
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 #common/metrics
 from his_mon import BaseMetrics
-from prometheus_client import Counter, Gauge
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+import os
 import threading
 
 class PMetrics(BaseMetrics):
@@ -10,10 +11,61 @@ class PMetrics(BaseMetrics):
     def __init__(self):
         super().__init__(app_name="ml_api")
         
-        self.model_cache_usage = Gauge('model_cache_usage', 'Number of models currently cached')
+        self.model_cache_usage = Gauge('model_cache_usage', 'Number of models currently cached', multiprocess_mode='livesum')
         self.predictions_completed = Counter('predictions_completed', 'Number of completed predictions')
         self.cache_hits = Counter('cache_hits', 'Number of cache hits')
         self.cache_misses = Counter('cache_misses', 'Number of cache misses')
+        self.model_cache_bytes = Gauge('model_cache_bytes', 'Estimated memory of each cached model in bytes', ['model'], multiprocess_mode='livesum')
+        self.model_cache_total_bytes = Gauge('model_cache_total_bytes', 'Estimated memory of all cached models in bytes', multiprocess_mode='livesum')
+        self.model_load_waits = Counter('model_load_waits', 'Number of requests that waited on an in-flight model load')
+        # 모델별 메모리 (resident = 이 프로세스에 상주, shared = 그중 다른 프로세스와 공유하는 mmap 페이지)
+        self.model_memory_bytes = Gauge('model_memory_bytes', 'Resident and shared memory of each cached model in bytes', ['model', 'kind'], multiprocess_mode='liveall')
+        self.model_cache_evictions = Counter('model_cache_evictions', 'Number of models evicted from the cache', ['policy'])
+
+        # 예측 결과 캐시 (행 단위)
+        self.result_cache_hits = Counter('result_cache_hits', 'Number of prediction rows served from the result cache')
+        self.result_cache_misses = Counter('result_cache_misses', 'Number of prediction rows not found in the result cache')
+        self.result_cache_hit_ratio = Gauge('result_cache_hit_ratio', 'Result cache hit ratio since start', multiprocess_mode='livemax')
+        self.result_cache_bytes = Gauge('result_cache_bytes', 'Estimated memory of the result cache in bytes', multiprocess_mode='livesum')
+        self._result_cache_lookups = [0, 0]
+
+        # 모델 저장소 정리
+        self.models_removed = Counter('models_removed', 'Number of models removed from the store', ['reason'])
+        self.model_store_bytes = Gauge('model_store_bytes', 'Disk usage of the model store in bytes', multiprocess_mode='livemax')
+
+        # 원격 모델 저장소 (result: ok / missing / error) 및 사전 로드 (tier: disk = 원격에서 가져옴, memory = 캐시에 로드)
+        self.model_remote_fetches = Counter('model_remote_fetches', 'Number of model fetches from the remote store', ['result'])
+        self.model_remote_fetch_bytes = Counter('model_remote_fetch_bytes', 'Bytes downloaded from the remote model store')
+        self.model_remote_publish_errors = Counter('model_remote_publish_errors', 'Number of uploads that failed to publish to the remote store')
+        self.model_prefetches = Counter('model_prefetches', 'Number of models prefetched before their first request', ['tier'])
+
+        # 대량 예측 작업
+        self.batch_job_rows = Counter('batch_job_rows', 'Number of rows scored by batch jobs')
+
+        # 요청 단계별 소요 시간 (model 라벨은 max_model_labels개까지, 이후는 'other')
+        self.request_stage_seconds = Histogram('request_stage_seconds', 'Time spent in each stage of a prediction request',
+                                               ['stage', 'model'],
+                                               buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+        self.max_model_labels = 50
+        self._model_labels = set()
+
+        # 추론 스케줄러 (모델별 대기열, priority: high / normal / low)
+        self.inference_queue_depth = Gauge('inference_queue_depth', 'Number of scheduled predictions queued or running per model', ['model'], multiprocess_mode='livesum')
+        self.inference_queue_wait_seconds = Histogram('inference_queue_wait_seconds', 'Time a prediction waited in the scheduler queue',
+                                                      ['priority'],
+                                                      buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10))
+        self.inference_rejections = Counter('inference_rejections', 'Number of scheduled predictions rejected or dropped', ['reason', 'priority'])
+        self.inference_concurrency_limit = Gauge('inference_concurrency_limit', 'Adaptive concurrency limit per model', ['model'], multiprocess_mode='livesum')
+
+        # 비동기(ASGI) 서빙
+        self.async_rejections = Counter('async_rejections', 'Number of async predictions rejected or dropped', ['reason'])
+
+        # 마이크로 배칭
+        self.batch_queue_depth = Gauge('batch_queue_depth', 'Number of requests waiting in the micro-batch queue', ['model'], multiprocess_mode='livesum')
+        self.batch_size = Histogram('batch_size', 'Number of rows per micro-batch forward pass',
+                                    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512))
+        self.batch_wait_seconds = Histogram('batch_wait_seconds', 'Time a request waited in the micro-batch queue',
+                                            buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25))
 
     @classmethod
     def get_instance(cls):
@@ -39,6 +91,134 @@ class PMetrics(BaseMetrics):
     def set_model_cache_usage(self, value):
         self.model_cache_usage.set(value)
 
+    def increment_model_load_wait(self):
+        self.model_load_waits.inc()
+
+    def set_model_cache_bytes(self, model_hash, value):
+        self.model_cache_bytes.labels(model=model_hash).set(value)
+
+    def remove_model_cache_bytes(self, model_hash):
+        try:
+            self.model_cache_bytes.remove(model_hash)
+        except KeyError:
+            pass
+
+    def set_model_memory_bytes(self, model_hash, resident, shared):
+        self.model_memory_bytes.labels(model=model_hash, kind='resident').set(resident)
+        self.model_memory_bytes.labels(model=model_hash, kind='shared').set(shared)
+
+    def remove_model_memory_bytes(self, model_hash):
+        for kind in ('resident', 'shared'):
+            try:
+                self.model_memory_bytes.remove(model_hash, kind)
+            except KeyError:
+                pass
+
+    def set_model_cache_total_bytes(self, value):
+        self.model_cache_total_bytes.set(value)
+
+    def increment_model_cache_eviction(self, policy):
+        self.model_cache_evictions.labels(policy=policy).inc()
+
+    def record_result_cache_lookup(self, hits, misses):
+        self.result_cache_hits.inc(hits)
+        self.result_cache_misses.inc(misses)
+        with self._lock:
+            self._result_cache_lookups[0] += hits
+            self._result_cache_lookups[1] += misses
+            total = sum(self._result_cache_lookups)
+            if total:
+                self.result_cache_hit_ratio.set(self._result_cache_lookups[0] / total)
+
+    def set_result_cache_bytes(self, value):
+        self.result_cache_bytes.set(value)
+
+    def increment_models_removed(self, reason):
+        self.models_removed.labels(reason=reason).inc()
+
+    def set_model_store_bytes(self, value):
+        self.model_store_bytes.set(value)
+
+    def increment_model_remote_fetch(self, result):
+        self.model_remote_fetches.labels(result=result).inc()
+
+    def increment_model_remote_fetch_bytes(self, value):
+        self.model_remote_fetch_bytes.inc(value)
+
+    def increment_model_remote_publish_error(self):
+        self.model_remote_publish_errors.inc()
+
+    def increment_model_prefetch(self, tier):
+        self.model_prefetches.labels(tier=tier).inc()
+
+    def increment_batch_job_rows(self, rows):
+        self.batch_job_rows.inc(rows)
+
+    def _model_label(self, model_hash):
+        """모델 해시 라벨 (라벨 수 한도를 넘으면 'other', 모델이 확인되지 않은 요청은 'none')"""
+        if not model_hash:
+            return 'none'
+        with self._lock:
+            if model_hash in self._model_labels:
+                return model_hash
+            if len(self._model_labels) < self.max_model_labels:
+                self._model_labels.add(model_hash)
+                return model_hash
+        return 'other'
+
+    def observe_request_stage(self, stage, model_hash, seconds):
+        self.request_stage_seconds.labels(stage=stage, model=self._model_label(model_hash)).observe(seconds)
+
+    def set_inference_queue_depth(self, model_hash, value):
+        self.inference_queue_depth.labels(model=model_hash).set(value)
+
+    def remove_inference_queue_depth(self, model_hash):
+        try:
+            self.inference_queue_depth.remove(model_hash)
+        except KeyError:
+            pass
+
+    def observe_inference_queue_wait(self, priority, seconds):
+        self.inference_queue_wait_seconds.labels(priority=priority).observe(seconds)
+
+    def increment_inference_rejection(self, reason, priority):
+        self.inference_rejections.labels(reason=reason, priority=priority).inc()
+
+    def set_inference_concurrency_limit(self, model_hash, value):
+        self.inference_concurrency_limit.labels(model=model_hash).set(value)
+
+    def remove_inference_concurrency_limit(self, model_hash):
+        try:
+            self.inference_concurrency_limit.remove(model_hash)
+        except KeyError:
+            pass
+
+    def increment_async_rejection(self, reason):
+        self.async_rejections.labels(reason=reason).inc()
+
+    def set_batch_queue_depth(self, model_hash, value):
+        self.batch_queue_depth.labels(model=model_hash).set(value)
+
+    def remove_batch_queue_depth(self, model_hash):
+        try:
+            self.batch_queue_depth.remove(model_hash)
+        except KeyError:
+            pass
+
+    def observe_batch_size(self, rows):
+        self.batch_size.observe(rows)
+
+    def observe_batch_wait(self, seconds):
+        self.batch_wait_seconds.observe(seconds)
+
 def get_metrics():
     """메트릭스 인스턴스 획득 헬퍼 함수"""
-    return PMetrics.get_instance()
\ No newline at end of file
+    return PMetrics.get_instance()
+
+def collect_latest():
+    """Prometheus 텍스트 형식 메트릭 생성 (멀티프로세스 모드면 모든 프로세스 값을 합산)"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
\ No newline at end of file
@@ -0,0 +1,168 @@
+#common/tensor_codec
+import importlib
+import io
+import json
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+# 지원 형식 (Content-Type / Accept)
+JSON = 'application/json'
+RAW = 'application/octet-stream'
+NPY = 'application/x-npy'
+MSGPACK = 'application/x-msgpack'
+ARROW = 'application/vnd.apache.arrow.tensor'
+
+# raw 형식에서 shape/dtype을 전달하는 헤더
+SHAPE_HEADER = 'X-Tensor-Shape'
+DTYPE_HEADER = 'X-Tensor-Dtype'
+
+class UnsupportedFormatError(ValueError):
+    """지원하지 않거나 의존성이 설치되지 않은 형식"""
+
+def _optional_import(name: str):
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+msgpack = _optional_import('msgpack')
+pyarrow = _optional_import('pyarrow')
+pyarrow_ipc = _optional_import('pyarrow.ipc') if pyarrow else None
+
+def available_formats() -> list:
+    """현재 환경에서 사용 가능한 형식 (선호 순서)"""
+    formats = [JSON, RAW, NPY]
+    if msgpack:
+        formats.append(MSGPACK)
+    if pyarrow:
+        formats.append(ARROW)
+    return formats
+
+def to_jsonable(prediction: Any) -> Any:
+    """예측 결과를 JSON 직렬화 가능한 형태로 변환 (다중 출력 지원)"""
+    if isinstance(prediction, dict):
+        return {key: to_jsonable(value) for key, value in prediction.items()}
+    if isinstance(prediction, (list, tuple)):
+        return [to_jsonable(value) for value in prediction]
+    return np.asarray(prediction).tolist()
+
+def _parse_shape(value: Optional[str]) -> Tuple[int, ...]:
+    if not value:
+        raise ValueError(f"Missing {SHAPE_HEADER} header")
+    try:
+        return tuple(int(dim) for dim in value.split(',') if dim.strip())
+    except ValueError:
+        raise ValueError(f"Invalid {SHAPE_HEADER} header: {value}")
+
+def _parse_dtype(value: Optional[str]) -> np.dtype:
+    try:
+        dtype = np.dtype(value or 'float32')
+    except TypeError:
+        raise ValueError(f"Invalid {DTYPE_HEADER} header: {value}")
+    if dtype.hasobject:
+        raise ValueError("Object dtype is not allowed")
+    return dtype.newbyteorder('<') if dtype.itemsize > 1 else dtype
+
+def _decode_raw(body: bytes, headers: Mapping[str, str]) -> np.ndarray:
+    shape = _parse_shape(headers.get(SHAPE_HEADER))
+    dtype = _parse_dtype(headers.get(DTYPE_HEADER))
+    array = np.frombuffer(body, dtype=dtype)
+    try:
+        return array.reshape(shape)
+    except ValueError:
+        raise ValueError(f"Body of {len(body)} bytes does not match shape {shape} and dtype {dtype}")
+
+def _decode_npy(body: bytes) -> np.ndarray:
+    """npy 헤더만 파싱하고 데이터는 복사 없이 참조"""
+    stream = io.BytesIO(body)
+    try:
+        version = np.lib.format.read_magic(stream)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+    except ValueError as e:
+        raise ValueError(f"Invalid npy payload: {e}")
+    if dtype.hasobject:
+        raise ValueError("Object dtype is not allowed")
+    array = np.frombuffer(body, dtype=dtype, offset=stream.tell())
+    order = 'F' if fortran_order else 'C'
+    try:
+        return array.reshape(shape, order=order)
+    except ValueError:
+        raise ValueError(f"npy payload does not match shape {shape}")
+
+def _decode_msgpack(body: bytes) -> np.ndarray:
+    """msgpack-numpy 호환 형식 ({nd, type, shape, data}) 또는 중첩 리스트"""
+    if not msgpack:
+        raise UnsupportedFormatError("msgpack is not installed")
+    payload = msgpack.unpackb(body, raw=False)
+    if isinstance(payload, dict) and payload.get('nd'):
+        dtype = np.dtype(payload['type'])
+        if dtype.hasobject:
+            raise ValueError("Object dtype is not allowed")
+        return np.frombuffer(payload['data'], dtype=dtype).reshape(payload['shape'])
+    return np.array(payload)
+
+def _decode_arrow(body: bytes) -> np.ndarray:
+    if not pyarrow:
+        raise UnsupportedFormatError("pyarrow is not installed")
+    tensor = pyarrow_ipc.read_tensor(pyarrow.py_buffer(body))
+    return tensor.to_numpy()
+
+def decode(body: bytes, mimetype: str, headers: Mapping[str, str]) -> np.ndarray:
+    """요청 본문을 NumPy 배열로 변환 (JSON 제외 형식은 가능한 한 zero-copy)"""
+    if mimetype == RAW:
+        return _decode_raw(body, headers)
+    if mimetype == NPY:
+        return _decode_npy(body)
+    if mimetype == MSGPACK:
+        return _decode_msgpack(body)
+    if mimetype == ARROW:
+        return _decode_arrow(body)
+    if mimetype == JSON:
+        return np.array(json.loads(body))
+    raise UnsupportedFormatError(f"Unsupported content type: {mimetype}")
+
+def encode(prediction: Any, mimetype: str) -> Tuple[bytes, Dict[str, str]]:
+    """예측 결과를 응답 형식으로 직렬화 (본문, 추가 헤더)"""
+    if mimetype == JSON:
+        return json.dumps({'prediction': to_jsonable(prediction)}).encode(), {}
+
+    if mimetype == MSGPACK:
+        if not msgpack:
+            raise UnsupportedFormatError("msgpack is not installed")
+        return msgpack.packb(_to_msgpack(prediction), use_bin_type=True), {}
+
+    if isinstance(prediction, (list, tuple, dict)):
+        raise UnsupportedFormatError(f"Multi-output predictions cannot be encoded as {mimetype}")
+    array = np.asarray(prediction)
+    if array.dtype.itemsize > 1 and array.dtype.byteorder == '>':
+        array = array.astype(array.dtype.newbyteorder('<'))
+
+    if mimetype == RAW:
+        headers = {
+            SHAPE_HEADER: ','.join(str(dim) for dim in array.shape),
+            DTYPE_HEADER: array.dtype.name,
+        }
+        return np.ascontiguousarray(array).tobytes(), headers
+    if mimetype == NPY:
+        buffer = io.BytesIO()
+        np.lib.format.write_array(buffer, array, allow_pickle=False)
+        return buffer.getvalue(), {}
+    if mimetype == ARROW:
+        if not pyarrow:
+            raise UnsupportedFormatError("pyarrow is not installed")
+        sink = pyarrow.BufferOutputStream()
+        pyarrow_ipc.write_tensor(pyarrow.Tensor.from_numpy(np.ascontiguousarray(array)), sink)
+        return sink.getvalue().to_pybytes(), {}
+    raise UnsupportedFormatError(f"Unsupported accept type: {mimetype}")
+
+def _to_msgpack(prediction: Any) -> Any:
+    if isinstance(prediction, dict):
+        return {key: _to_msgpack(value) for key, value in prediction.items()}
+    if isinstance(prediction, (list, tuple)):
+        return [_to_msgpack(value) for value in prediction]
+    array = np.ascontiguousarray(prediction)
+    return {'nd': True, 'type': array.dtype.str, 'shape': list(array.shape), 'data': array.tobytes()}
@@ -0,0 +1,201 @@
+#common/tracing
+import heapq
+import logging
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.common.metrics import get_metrics
+
+# 스택 샘플에 남길 최대 프레임 수 (가장 안쪽 기준)
+_STACK_DEPTH = 12
+
+class RequestTrace:
+    """요청 하나의 단계별 소요 시간 (decode, convert, queue, load, inference, serialize 등)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.model_hash: Optional[str] = None
+        self.duration: Optional[float] = None
+        self.sampled = False
+        self.stacks: Counter = Counter()
+        self._token = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (밀리초)"""
+        entries = [f'{name};dur={seconds * 1000:.3f}' for name, seconds in self.stages.items()]
+        if self.duration is not None:
+            entries.append(f'total;dur={self.duration * 1000:.3f}')
+        return ', '.join(entries)
+
+    def __lt__(self, other: 'RequestTrace') -> bool:
+        return (self.duration or 0) < (other.duration or 0)
+
+_current: ContextVar[Optional[RequestTrace]] = ContextVar('request_trace', default=None)
+_profiler: Optional['SlowRequestProfiler'] = None
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current.get()
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """현재 요청에 단계 시간 기록 (추적 중인 요청이 없으면 아무것도 하지 않음)"""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    with trace.stage(name):
+        yield
+
+def begin_trace(attach: bool = True) -> RequestTrace:
+    """요청 추적 시작 (현재 컨텍스트에 등록, 프로파일러가 켜져 있으면 샘플링)
+
+    이벤트 루프처럼 여러 요청이 한 스레드를 공유하면 attach=False로 두고, 작업 스레드에서 attach_thread를 사용한다.
+    """
+    trace = RequestTrace()
+    trace._token = _current.set(trace)
+    if _profiler is not None and _profiler.should_sample():
+        trace.sampled = True
+        if attach:
+            _profiler.attach(trace)
+    return trace
+
+def end_trace(trace: RequestTrace) -> None:
+    """요청 추적 종료 후 단계별 히스토그램 기록"""
+    trace.duration = time.perf_counter() - trace.started
+    if trace._token is not None:
+        _current.reset(trace._token)
+        trace._token = None
+
+    metrics = get_metrics()
+    for name, seconds in trace.stages.items():
+        metrics.observe_request_stage(name, trace.model_hash, seconds)
+    metrics.observe_request_stage('total', trace.model_hash, trace.duration)
+
+    if trace.sampled and _profiler is not None:
+        _profiler.detach()
+        _profiler.record(trace)
+
+@contextmanager
+def attach_thread(trace: Optional[RequestTrace]) -> Iterator[None]:
+    """요청 처리를 넘겨받은 작업 스레드를 샘플링 대상에 추가"""
+    if trace is None or not trace.sampled or _profiler is None:
+        yield
+        return
+    _profiler.attach(trace)
+    try:
+        yield
+    finally:
+        _profiler.detach()
+
+class SlowRequestProfiler:
+    """가장 느린 요청의 단계별 시간과 스택 샘플을 주기적으로 로그에 기록하는 샘플링 프로파일러
+
+    샘플링된 요청을 처리하는 스레드의 스택을 `sample_interval_ms`마다 수집하고,
+    `report_interval`초마다 그 사이 가장 느렸던 `top_n`개 요청을 로그로 남긴다.
+    """
+
+    def __init__(self, sample_rate: float, top_n: int = 5, report_interval: float = 60,
+                 sample_interval_ms: float = 10):
+        self.sample_rate = sample_rate
+        self.top_n = top_n
+        self.report_interval = report_interval
+        self.sample_interval = sample_interval_ms / 1000
+        self.logger = logging.getLogger(__name__)
+
+        self._active: Dict[int, RequestTrace] = {}
+        self._slowest: List[RequestTrace] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def should_sample(self) -> bool:
+        return random.random() < self.sample_rate
+
+    def attach(self, trace: RequestTrace) -> None:
+        with self._lock:
+            self._active[threading.get_ident()] = trace
+
+    def detach(self) -> None:
+        with self._lock:
+            self._active.pop(threading.get_ident(), None)
+
+    def record(self, trace: RequestTrace) -> None:
+        """완료된 샘플 요청을 상위 N개 느린 요청 목록에 반영"""
+        with self._lock:
+            if len(self._slowest) < self.top_n:
+                heapq.heappush(self._slowest, trace)
+            elif self._slowest and self._slowest[0] < trace:
+                heapq.heapreplace(self._slowest, trace)
+
+    def sample(self) -> None:
+        """활성 요청 스레드의 현재 스택 수집"""
+        frames = sys._current_frames()
+        with self._lock:
+            for ident, trace in self._active.items():
+                frame = frames.get(ident)
+                if frame is not None:
+                    trace.stacks[_stack_key(frame)] += 1
+
+    def report(self) -> None:
+        """상위 N개 느린 요청을 로그로 남기고 목록 초기화"""
+        with self._lock:
+            slowest, self._slowest = sorted(self._slowest, reverse=True), []
+        for trace in slowest:
+            stages = ' '.join(f'{name}={seconds * 1000:.1f}ms' for name, seconds in trace.stages.items())
+            lines = [f"Slow request model={trace.model_hash} total={trace.duration * 1000:.1f}ms {stages}"]
+            for stack, count in trace.stacks.most_common(3):
+                lines.append(f"  {count} samples:")
+                lines.extend(f"    {line}" for line in traceback.StackSummary.from_list(stack).format())
+            self.logger.warning('\n'.join(lines))
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='slow-request-profiler', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self) -> None:
+        next_report = time.monotonic() + self.report_interval
+        while not self._stopped.wait(self.sample_interval):
+            self.sample()
+            if time.monotonic() >= next_report:
+                self.report()
+                next_report = time.monotonic() + self.report_interval
+
+def _stack_key(frame) -> Tuple[Tuple[str, int, str, str], ...]:
+    """스택 프레임을 집계 가능한 (파일, 줄, 함수, 코드) 튜플로 변환"""
+    summary = traceback.extract_stack(frame, limit=_STACK_DEPTH)
+    return tuple((f.filename, f.lineno, f.name, f.line) for f in summary)
+
+def configure_profiler(sample_rate: float, top_n: int = 5, report_interval: float = 60,
+                       sample_interval_ms: float = 10) -> Optional[SlowRequestProfiler]:
+    """샘플링 프로파일러 설정 (sample_rate가 0이면 해제)"""
+    global _profiler
+    if _profiler is not None:
+        _profiler.stop()
+        _profiler = None
+    if sample_rate > 0:
+        _profiler = SlowRequestProfiler(sample_rate, top_n, report_interval, sample_interval_ms)
+        _profiler.start()
+    return _profiler
@@ -8,6 +8,10 @@ def get_kr_time():
     """한국 시간 반환"""
     return datetime.now(timezone('Asia/Seoul'))
 
+def from_timestamp(ts):
+    """epoch 초를 한국 시간으로 변환"""
+    return datetime.fromtimestamp(ts, timezone('Asia/Seoul'))
+
 def one_week_ago():
     """일주일 전 시간 반환"""
     now = get_kr_time()
@@ -16,8 +16,30 @@ class Config:
         "env": os.getenv('APP_ENV', 'dev')
     }
     
+    # 모델 메타데이터 인덱스 (기본값: MODEL_STORE_PATH/.model_index.sqlite3)
+    MODEL_INDEX_PATH = os.getenv('MODEL_INDEX_PATH')
+    # 마지막 사용 시각을 인덱스에 일괄 기록하는 주기 (초)
+    MODEL_INDEX_FLUSH_INTERVAL = float(os.getenv('MODEL_INDEX_FLUSH_INTERVAL', 30))
+    # 다른 프로세스의 업로드/삭제(인덱스의 모델 세대 변경)를 반영하는 주기 (초, 0 = 정리 작업 때만)
+    MODEL_INDEX_SYNC_INTERVAL = float(os.getenv('MODEL_INDEX_SYNC_INTERVAL', 5))
+
     # 모델 정리 주기 (시간)
-    MODEL_CLEANUP_INTERVAL = int(os.getenv('MODEL_CLEANUP_INTERVAL', 5))
+    MODEL_CLEANUP_INTERVAL = float(os.getenv('MODEL_CLEANUP_INTERVAL', 5))
+    # 이 기간(일) 이상 사용되지 않은 모델 삭제
+    MODEL_MAX_IDLE_DAYS = float(os.getenv('MODEL_MAX_IDLE_DAYS', 7))
+    # 모델 저장소 디스크 한도, 초과 시 가장 오래 사용되지 않은 모델부터 삭제 (0 = 무제한, 모델 폴더만 계산 - .trash/.fetch/스테이징 제외)
+    MODEL_STORE_MAX_BYTES = int(os.getenv('MODEL_STORE_MAX_BYTES', 0))
+
+    # 원격 모델 저장소 (file:///공유/경로 또는 경로, 비어 있으면 로컬만) - 업로드한 모델을 기록하고 로컬에 없는 모델을 받아 옴
+    REMOTE_STORE_URL = os.getenv('REMOTE_STORE_URL', '')
+    # 원격 다운로드 병렬 청크 수와 청크 크기 (중단 시 받은 청크부터 이어받기)
+    REMOTE_FETCH_WORKERS = int(os.getenv('REMOTE_FETCH_WORKERS', 4))
+    REMOTE_FETCH_CHUNK_SIZE = int(os.getenv('REMOTE_FETCH_CHUNK_SIZE', 8 * 1024 * 1024))  # 8MB
+    # 원격에도 없던 해시를 다시 확인하지 않는 시간 (초, 0 = 매번 확인)
+    REMOTE_MISS_TTL = float(os.getenv('REMOTE_MISS_TTL', 5))
+    # 접근 빈도/시간대 기반 사전 로드 주기 (초, 0 = 사용 안 함)와 한 번에 준비할 모델 수
+    PREFETCH_INTERVAL = float(os.getenv('PREFETCH_INTERVAL', 0))
+    PREFETCH_TOP_N = int(os.getenv('PREFETCH_TOP_N', 3))
     
     # 서버 설정
     HOST = os.getenv('SERVER_HOST', '0.0.0.0')
@@ -25,3 +47,96 @@ class Config:
     
     # 기타 ML API 관련 설정
     MAX_MODEL_FILE_SIZE = int(os.getenv('MAX_MODEL_FILE_SIZE', 100 * 1024 * 1024))  # 100MB
+    # 업로드 스풀 메모리 한도 (초과분은 임시 파일로)
+    UPLOAD_SPOOL_MAX_MEMORY = int(os.getenv('UPLOAD_SPOOL_MAX_MEMORY', 32 * 1024 * 1024))  # 32MB
+    # true이면 hash 파라미터가 hex digest(md5/sha1/sha256/sha512)여야 함
+    UPLOAD_REQUIRE_DIGEST = os.getenv('UPLOAD_REQUIRE_DIGEST', 'false').lower() == 'true'
+
+    # 마이크로 배칭 설정 (동시 요청을 모아 한 번에 추론)
+    BATCHING_ENABLED = os.getenv('BATCHING_ENABLED', 'false').lower() == 'true'
+    BATCH_MAX_SIZE = int(os.getenv('BATCH_MAX_SIZE', 32))
+    BATCH_MAX_WAIT_MS = float(os.getenv('BATCH_MAX_WAIT_MS', 5))
+
+    # 추론 fast path (tf.function 트레이싱) 사용 여부 - 모델별로는 업로드 시 fast_path=false로 해제
+    INFERENCE_FAST_PATH = os.getenv('INFERENCE_FAST_PATH', 'true').lower() == 'true'
+
+    # 모델 캐시 설정 (바이트 예산 0 = 무제한, 정책: lru / lfu / cost)
+    MODEL_CACHE_MAX_MODELS = int(os.getenv('MODEL_CACHE_MAX_MODELS', 10))
+    MODEL_CACHE_MAX_BYTES = int(os.getenv('MODEL_CACHE_MAX_BYTES', 0))
+    MODEL_CACHE_POLICY = os.getenv('MODEL_CACHE_POLICY', 'lru').lower()
+    MODEL_CACHE_PINNED = [h for h in os.getenv('MODEL_CACHE_PINNED', '').split(',') if h]
+
+    # 대량 예측 작업 설정
+    JOB_STORE_PATH = os.getenv('JOB_STORE_PATH', '../data/jobs')
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+    JOB_BATCH_SIZE = int(os.getenv('JOB_BATCH_SIZE', 1024))
+
+    # 멀티프로세스 서빙 설정 (python -m src.cluster, 워커와 라우터 모두 gunicorn gthread로 실행)
+    SERVING_WORKERS = int(os.getenv('SERVING_WORKERS', 2))
+    WORKER_BASE_PORT = int(os.getenv('WORKER_BASE_PORT', 5100))
+    # 워커 프로세스당 요청 처리 스레드 수
+    WORKER_THREADS = int(os.getenv('WORKER_THREADS', 16))
+    # 라우터 프로세스 수와 프로세스당 스레드 수
+    ROUTER_PROCESSES = int(os.getenv('ROUTER_PROCESSES', 2))
+    ROUTER_THREADS = int(os.getenv('ROUTER_THREADS', 32))
+    ROUTER_TIMEOUT = float(os.getenv('ROUTER_TIMEOUT', 60))
+    # 라우터 해시 링의 전체 워커 URL과 이 워커의 URL (런처가 설정, 워밍업은 담당 모델만)
+    CLUSTER_WORKER_URLS = [u for u in os.getenv('CLUSTER_WORKER_URLS', '').split(',') if u]
+    CLUSTER_WORKER_URL = os.getenv('CLUSTER_WORKER_URL', '')
+    # 정리 스케줄러, 리소스 모니터, 작업 재개 실행 여부 (클러스터에서는 한 워커만 true)
+    BACKGROUND_TASKS = os.getenv('BACKGROUND_TASKS', 'true').lower() == 'true'
+
+    # 모델 워밍업 설정 (시작 시 미리 로드할 해시 목록 / 최근 사용 상위 N개)
+    WARMUP_HASHES = [h for h in os.getenv('WARMUP_HASHES', '').split(',') if h]
+    WARMUP_TOP_N = int(os.getenv('WARMUP_TOP_N', 0))
+    WARMUP_ON_UPLOAD = os.getenv('WARMUP_ON_UPLOAD', 'false').lower() == 'true'
+    WARMUP_BATCH_SIZES = [int(n) for n in os.getenv('WARMUP_BATCH_SIZES', '1').split(',') if n]
+
+    # 예측 결과 캐시 설정 (행 단위, TTL 초)
+    RESULT_CACHE_ENABLED = os.getenv('RESULT_CACHE_ENABLED', 'false').lower() == 'true'
+    RESULT_CACHE_MAX_BYTES = int(os.getenv('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))  # 64MB
+    RESULT_CACHE_TTL = float(os.getenv('RESULT_CACHE_TTL', 300))
+
+    # 여러 모델 예측(/predict_multi) 설정 (스레드 풀 크기, 요청당 모델 수 한도, 모델별 기본 제한 시간 ms - 0 = 없음)
+    MULTI_PREDICT_WORKERS = int(os.getenv('MULTI_PREDICT_WORKERS', 4))
+    MULTI_PREDICT_MAX_MODELS = int(os.getenv('MULTI_PREDICT_MAX_MODELS', 16))
+    MULTI_PREDICT_TIMEOUT_MS = float(os.getenv('MULTI_PREDICT_TIMEOUT_MS', 0))
+
+    # 비동기(ASGI) 서빙 설정 (python -m src.asgi)
+    ASYNC_INFERENCE_WORKERS = int(os.getenv('ASYNC_INFERENCE_WORKERS', 4))
+    # 모델별 대기(실행 중 포함) 요청 한도, 초과 시 429 (0 = 무제한)
+    ASYNC_MAX_QUEUE_PER_MODEL = int(os.getenv('ASYNC_MAX_QUEUE_PER_MODEL', 64))
+    # 기본 요청 처리 시간 제한 (ms, 0 = 없음) - 요청별로는 X-Request-Timeout-Ms 헤더
+    REQUEST_TIMEOUT_MS = float(os.getenv('REQUEST_TIMEOUT_MS', 0))
+
+    # 추론 스케줄러 (모델별 대기열/동시 실행 한도, X-Priority 헤더: high / normal / low) - Flask /predict는 SCHEDULER_ENABLED일 때만 사용
+    SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'false').lower() == 'true'
+    SCHEDULER_WORKERS = int(os.getenv('SCHEDULER_WORKERS', 4))
+    SCHEDULER_MAX_QUEUE_PER_MODEL = int(os.getenv('SCHEDULER_MAX_QUEUE_PER_MODEL', 64))
+    # 모델별 동시 실행 한도 상한 (0 = 작업 스레드 수의 절반), 목표 추론 시간 (ms, 0 = 한도 고정 / 지정 시 AIMD로 조절 - ASGI 서빙에도 적용)
+    SCHEDULER_MAX_CONCURRENCY_PER_MODEL = int(os.getenv('SCHEDULER_MAX_CONCURRENCY_PER_MODEL', 0))
+    SCHEDULER_TARGET_LATENCY_MS = float(os.getenv('SCHEDULER_TARGET_LATENCY_MS', 0))
+    # 하위 우선순위 요청이 이 시간(ms)을 기다릴 때마다 한 단계씩 승격 (0 = 엄격한 우선순위, ASGI 서빙에도 적용)
+    SCHEDULER_AGING_MS = float(os.getenv('SCHEDULER_AGING_MS', 1000))
+
+    # 요청 단계별 지연 시간 메트릭의 model 라벨 수 한도 (초과분은 'other')
+    METRICS_MAX_MODEL_LABELS = int(os.getenv('METRICS_MAX_MODEL_LABELS', 50))
+    # 느린 요청 샘플링 프로파일러 (샘플링 비율 0 = 사용 안 함)
+    PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+    PROFILE_TOP_N = int(os.getenv('PROFILE_TOP_N', 5))
+    PROFILE_REPORT_INTERVAL = float(os.getenv('PROFILE_REPORT_INTERVAL', 60))
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', 10))
+
+    # TensorFlow 런타임 설정 (첫 사용 시 import, 스레드 수 0 = TF 기본값)
+    TF_INTRA_OP_THREADS = int(os.getenv('TF_INTRA_OP_THREADS', 0))
+    TF_INTER_OP_THREADS = int(os.getenv('TF_INTER_OP_THREADS', 0))
+    TF_LOG_LEVEL = os.getenv('TF_LOG_LEVEL', 'WARNING').upper()
+    # true이면 시작 직후 백그라운드에서 TensorFlow import (완료 전까지 /ready는 503)
+    TF_PRELOAD = os.getenv('TF_PRELOAD', 'true').lower() == 'true'
+
+    # 업로드 시 변환/검증할 추론 백엔드 목록 (tflite, onnx / 비어 있으면 Keras만 사용)
+    BACKEND_CONVERT = [b.strip().lower() for b in os.getenv('BACKEND_CONVERT', '').split(',') if b.strip()]
+    # 변환 프로세스 제한 시간 (초)
+    BACKEND_CONVERT_TIMEOUT = float(os.getenv('BACKEND_CONVERT_TIMEOUT', 300))
+    # true이면 업로드 시 가중치를 mmap 가능한 TFLite 파일로 저장해 워커 간 페이지 캐시로 공유 (업로드별로는 mmap 파라미터)
+    MODEL_MMAP_WEIGHTS = os.getenv('MODEL_MMAP_WEIGHTS', 'false').lower() == 'true'
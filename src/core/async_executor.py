@@ -0,0 +1,69 @@
+#core/async_executor
+import asyncio
+import time
+from typing import Any, Optional, Tuple
+
+from src.common.metrics import get_metrics
+from src.core.scheduler import DEFAULT_PRIORITY, DeadlineExceededError, InferenceScheduler, QueueFullError
+
+class AsyncInferenceExecutor:
+    """이벤트 루프용 추론 실행기
+
+    추론은 InferenceScheduler의 작업 스레드에서 실행하고(모델별 대기열, 동시 실행 한도, 우선순위),
+    모델별 대기(실행 중 포함) 요청 수가 한도를 넘으면 즉시 거절한다.
+    마감 시각이 지난 요청은 스레드가 꺼내는 시점에 모델을 호출하지 않고 버린다.
+    scheduler를 넘기면 (Flask 앱과) 같은 스케줄러를 공유하고, 직접 만든 스케줄러만 shutdown에서 종료한다.
+    """
+
+    def __init__(self, model_manager, workers: int = 4, max_queue_per_model: int = 64,
+                 max_concurrency_per_model: int = 0, target_latency_ms: float = 0, aging_ms: float = 1000,
+                 scheduler: Optional[InferenceScheduler] = None):
+        self.model_manager = model_manager
+        self.max_queue_per_model = max_queue_per_model
+        self.metrics = get_metrics()
+        self._owns_scheduler = scheduler is None
+        if scheduler is not None:
+            self.scheduler = scheduler
+            return
+        self.scheduler = InferenceScheduler(
+            model_manager,
+            workers=workers,
+            max_queue_per_model=max_queue_per_model,
+            max_concurrency_per_model=max_concurrency_per_model,
+            target_latency_ms=target_latency_ms,
+            aging_ms=aging_ms,
+        )
+        # 삭제된 모델의 대기열/메트릭 레이블 정리
+        model_manager.removal_listeners.append(self.scheduler.remove_model)
+
+    def queue_depth(self, model_hash: str) -> int:
+        return self.scheduler.queue_depth(model_hash)
+
+    async def predict(self, model_hash: str, data: Any, deadline: Optional[float] = None,
+                      priority: int = DEFAULT_PRIORITY) -> Tuple[Any, int]:
+        """스케줄러에서 예측 실행 (deadline은 time.monotonic() 기준 절대 시각)"""
+        try:
+            future = self.scheduler.submit(model_hash, data, priority, deadline)
+        except QueueFullError:
+            self.metrics.increment_async_rejection('queue_full')
+            raise
+
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except DeadlineExceededError:
+            # 대기 중 마감이 지나 모델에 도달하기 전에 버려진 요청
+            self.metrics.increment_async_rejection('deadline')
+            raise
+        except asyncio.TimeoutError:
+            # 아직 시작하지 않은 작업은 취소되고, 실행 중인 작업은 결과만 버려짐
+            if self.scheduler.expire(future):
+                self.metrics.increment_async_rejection('deadline')
+            raise DeadlineExceededError('Request deadline exceeded') from None
+
+    def shutdown(self) -> None:
+        if not self._owns_scheduler:
+            return
+        if self.scheduler.remove_model in self.model_manager.removal_listeners:
+            self.model_manager.removal_listeners.remove(self.scheduler.remove_model)
+        self.scheduler.shutdown()
@@ -0,0 +1,301 @@
+#core/backends
+"""추론 백엔드 (Keras / TFLite / ONNX Runtime)
+
+업로드 시 `.keras` 모델을 TFLite/ONNX로 변환하고, 샘플 입력에 대한 출력을 원본과 비교해 검증한 뒤
+백엔드별 지연 시간을 측정한다. 서빙 시에는 검증된 백엔드 중 가장 빠른 것을 사용한다.
+변환기는 네이티브 코드에서 프로세스를 종료시킬 수 있으므로 별도 프로세스에서 실행한다.
+
+사용법(내부): python -m src.core.backends <keras_path> <out_dir> <backend> [<backend> ...]
+"""
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.core.inference import InferenceEngine
+from src.core.tf_runtime import get_tf
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = 'keras'
+# 검증 허용 오차와 지연 시간 측정용 샘플 배치 크기
+VALIDATION_RTOL = 1e-3
+VALIDATION_ATOL = 1e-4
+SAMPLE_ROWS = (1, 8)
+
+# ONNX 입력 타입 문자열 -> NumPy dtype
+_ONNX_DTYPES = {
+    'tensor(float)': np.float32, 'tensor(double)': np.float64, 'tensor(float16)': np.float16,
+    'tensor(int32)': np.int32, 'tensor(int64)': np.int64, 'tensor(uint8)': np.uint8,
+    'tensor(int8)': np.int8, 'tensor(bool)': np.bool_,
+}
+
+class TensorSpec(NamedTuple):
+    """변환 모델의 입력 시그니처 (배치 등 가변 차원은 None)"""
+    shape: Tuple[Optional[int], ...]
+    dtype: np.dtype
+
+class TFLiteRunner:
+    """TFLite 인터프리터 (스레드별 인스턴스, 모델 파일은 mmap으로 공유)
+
+    shared_weights=True이면 기본 delegate(XNNPACK)를 끈다. XNNPACK은 가중치를 자체 버퍼로 다시 패킹해
+    인터프리터마다 사본을 만들지만, 내장 커널은 mmap된 파일의 가중치를 그대로 읽으므로
+    같은 노드의 모든 워커/스레드가 OS 페이지 캐시의 한 벌을 공유한다.
+    """
+
+    def __init__(self, path: str, shared_weights: bool = False):
+        self.path = path
+        self.shared_weights = shared_weights
+        # 메모리 메트릭에서 mmap 영역을 찾기 위한 경로 (공유하지 않으면 None)
+        self.mapped_path = os.path.realpath(path) if shared_weights else None
+        self._local = threading.local()
+        details = self._interpreter().get_input_details()
+        if len(details) != 1:
+            raise ValueError('TFLite backend supports single-input models only')
+        self.inputs = [TensorSpec(
+            tuple(None if dim < 0 else int(dim) for dim in details[0]['shape_signature']),
+            np.dtype(details[0]['dtype']),
+        )]
+        self.model = self
+
+    def _interpreter(self):
+        interpreter = getattr(self._local, 'interpreter', None)
+        if interpreter is None:
+            lite = get_tf().lite
+            options = {}
+            if self.shared_weights:
+                options['experimental_op_resolver_type'] = lite.experimental.OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES
+            interpreter = lite.Interpreter(model_path=self.path, **options)
+            interpreter.allocate_tensors()
+            self._local.interpreter = interpreter
+            self._local.shape = None
+        return interpreter
+
+    def predict(self, data: np.ndarray) -> Any:
+        interpreter = self._interpreter()
+        detail = interpreter.get_input_details()[0]
+        data = np.ascontiguousarray(data, dtype=detail['dtype'])
+        # 입력 shape이 바뀔 때만 텐서 재할당
+        if self._local.shape != data.shape:
+            interpreter.resize_tensor_input(detail['index'], data.shape)
+            interpreter.allocate_tensors()
+            self._local.shape = data.shape
+        interpreter.set_tensor(detail['index'], data)
+        interpreter.invoke()
+        outputs = [interpreter.get_tensor(output['index']) for output in interpreter.get_output_details()]
+        return outputs[0] if len(outputs) == 1 else outputs
+
+class OnnxRunner:
+    """ONNX Runtime 세션 (CPU, 세션은 스레드 안전)"""
+
+    def __init__(self, path: str):
+        ort = importlib.import_module('onnxruntime')
+        self.session = ort.InferenceSession(path, providers=['CPUExecutionProvider'])
+        inputs = self.session.get_inputs()
+        if len(inputs) != 1:
+            raise ValueError('ONNX backend supports single-input models only')
+        self._input_name = inputs[0].name
+        self._dtype = np.dtype(_ONNX_DTYPES.get(inputs[0].type, np.float32))
+        self.inputs = [TensorSpec(tuple(dim if isinstance(dim, int) else None for dim in inputs[0].shape), self._dtype)]
+        self.model = self
+
+    def predict(self, data: np.ndarray) -> Any:
+        outputs = self.session.run(None, {self._input_name: np.ascontiguousarray(data, dtype=self._dtype)})
+        return outputs[0] if len(outputs) == 1 else outputs
+
+class KerasBackend:
+    name = 'keras'
+    file_name = None
+
+    @staticmethod
+    def available() -> bool:
+        return True
+
+    @staticmethod
+    def load(path: str, fast_path: bool = True) -> InferenceEngine:
+        return InferenceEngine(get_tf().keras.models.load_model(path), enabled=fast_path)
+
+class TFLiteBackend:
+    name = 'tflite'
+    file_name = 'model.tflite'
+
+    @staticmethod
+    def available() -> bool:
+        return True
+
+    @staticmethod
+    def convert(model: Any, path: str) -> None:
+        """SavedModel로 내보낸 뒤 TFLite로 변환 (Keras 3 모델은 from_keras_model 변환이 불안정)"""
+        tf = get_tf()
+        with tempfile.TemporaryDirectory() as saved_model_dir:
+            model.export(saved_model_dir, verbose=False)
+            content = tf.lite.TFLiteConverter.from_saved_model(saved_model_dir).convert()
+        with open(path, 'wb') as f:
+            f.write(content)
+
+    @staticmethod
+    def load(path: str, shared_weights: bool = False, **options) -> TFLiteRunner:
+        return TFLiteRunner(path, shared_weights=shared_weights)
+
+class OnnxBackend:
+    name = 'onnx'
+    file_name = 'model.onnx'
+
+    @staticmethod
+    def available() -> bool:
+        return importlib.util.find_spec('onnxruntime') is not None
+
+    @staticmethod
+    def convert(model: Any, path: str) -> None:
+        if importlib.util.find_spec('tf2onnx') is None:
+            raise RuntimeError("tf2onnx is not installed (install the 'onnx' extra)")
+        tf = get_tf()
+        tf2onnx = importlib.import_module('tf2onnx')
+        spec = model.inputs[0]
+        signature = (tf.TensorSpec(spec.shape, spec.dtype, name='input'),)
+        function = tf.function(lambda x: model(x, training=False))
+        tf2onnx.convert.from_function(function, input_signature=signature, output_path=path)
+
+    @staticmethod
+    def load(path: str, **options) -> OnnxRunner:
+        return OnnxRunner(path)
+
+BACKENDS = {backend.name: backend for backend in (KerasBackend, TFLiteBackend, OnnxBackend)}
+
+def parse_names(value: Optional[str]) -> Optional[List[str]]:
+    """쉼표로 구분한 백엔드 목록 파싱 (값이 없으면 None)"""
+    if value is None:
+        return None
+    return [name.strip().lower() for name in value.split(',') if name.strip()]
+
+def load_backend(name: str, path: str, **options) -> Any:
+    """백엔드 이름으로 모델 로드 (predict(data)를 가진 실행기 반환)"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: {name}")
+    backend = BACKENDS[name]
+    if not backend.available():
+        raise RuntimeError(f"Backend {name} is not available")
+    return backend.load(path, **options)
+
+def sample_input(spec: Any, rows: int, rng: np.random.Generator) -> np.ndarray:
+    """입력 시그니처에 맞는 검증용 난수 입력 생성"""
+    shape = (rows,) + tuple(dim or 1 for dim in tuple(spec.shape)[1:])
+    dtype = np.dtype(getattr(spec.dtype, 'as_numpy_dtype', spec.dtype))
+    if np.issubdtype(dtype, np.floating):
+        return rng.standard_normal(shape).astype(dtype)
+    if dtype == np.bool_:
+        return rng.integers(0, 2, shape).astype(dtype)
+    return rng.integers(0, 10, shape).astype(dtype)
+
+def measure_latency(runner: Any, samples: List[np.ndarray], iterations: int = 50) -> float:
+    """샘플 배치 전체를 한 번 처리하는 시간의 중앙값(ms)"""
+    for data in samples:
+        runner.predict(data)
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for data in samples:
+            runner.predict(data)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+def _compare_outputs(expected: Any, actual: Any) -> Tuple[bool, float]:
+    """(허용 오차 내 일치 여부, 최대 절대 오차)"""
+    expected = expected if isinstance(expected, (list, tuple)) else [expected]
+    actual = actual if isinstance(actual, (list, tuple)) else [actual]
+    if len(expected) != len(actual):
+        return False, float('inf')
+    matched, max_error = True, 0.0
+    for e, a in zip(expected, actual):
+        e, a = np.asarray(e), np.asarray(a)
+        if e.shape != a.shape:
+            return False, float('inf')
+        matched = matched and np.allclose(e, a, rtol=VALIDATION_RTOL, atol=VALIDATION_ATOL)
+        if e.size:
+            max_error = max(max_error, float(np.max(np.abs(e.astype(np.float64) - a.astype(np.float64)))))
+    return bool(matched), max_error
+
+def convert_and_validate(keras_path: str, out_dir: str, names: Iterable[str],
+                         iterations: int = 50) -> Dict[str, Dict[str, Any]]:
+    """Keras 모델을 지정한 백엔드로 변환하고, 원본 대비 출력 검증 및 지연 시간 측정"""
+    engine = KerasBackend.load(keras_path)
+    model = engine.model
+    inputs = getattr(model, 'inputs', None) or []
+    if len(inputs) != 1:
+        raise ValueError('Backend conversion supports single-input models only')
+
+    rng = np.random.default_rng(0)
+    samples = [sample_input(inputs[0], rows, rng) for rows in SAMPLE_ROWS]
+    expected = [engine.predict(data) for data in samples]
+    report = {DEFAULT_BACKEND: {'validated': True, 'latency_ms': measure_latency(engine, samples, iterations)}}
+
+    for name in names:
+        if name == DEFAULT_BACKEND:
+            continue
+        if name not in BACKENDS:
+            report[name] = {'validated': False, 'error': f'Unknown backend: {name}'}
+            continue
+        backend = BACKENDS[name]
+        path = os.path.join(out_dir, backend.file_name)
+        try:
+            backend.convert(model, path)
+            runner = load_backend(name, path)
+            results = [_compare_outputs(e, runner.predict(data)) for e, data in zip(expected, samples)]
+            validated = all(matched for matched, _ in results)
+            error = max(max_error for _, max_error in results)
+            report[name] = {'file': backend.file_name, 'validated': validated,
+                            'max_abs_error': error if np.isfinite(error) else None}
+            if validated:
+                report[name]['latency_ms'] = measure_latency(runner, samples, iterations)
+            else:
+                report[name]['error'] = 'Outputs differ from the Keras model'
+        except Exception as e:
+            logger.warning(f"Conversion to {name} failed: {e}")
+            report[name] = {'validated': False, 'error': str(e)}
+            if os.path.exists(path):
+                os.remove(path)
+    return report
+
+def select_backend(report: Dict[str, Dict[str, Any]]) -> str:
+    """검증된 백엔드 중 지연 시간이 가장 짧은 것 선택 (측정값이 없으면 keras)"""
+    candidates = [
+        (result['latency_ms'], name) for name, result in report.items()
+        if result.get('validated') and result.get('latency_ms') is not None
+    ]
+    return min(candidates)[1] if candidates else DEFAULT_BACKEND
+
+def run_conversion(keras_path: str, out_dir: str, names: Iterable[str], timeout: float = 300) -> Dict[str, Dict[str, Any]]:
+    """별도 프로세스에서 변환/검증 실행 (실패 시 모든 대상 백엔드를 미검증으로 기록)"""
+    names = [name for name in names if name != DEFAULT_BACKEND]
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        result = subprocess.run(
+            [sys.executable, '-m', 'src.core.backends', keras_path, out_dir, *names],
+            cwd=root, capture_output=True, text=True, timeout=timeout,
+        )
+        if result.returncode == 0:
+            return json.loads(result.stdout.strip().splitlines()[-1])
+        error = (result.stderr.strip().splitlines() or [f'exit code {result.returncode}'])[-1]
+    except (subprocess.TimeoutExpired, ValueError, IndexError) as e:
+        error = str(e)
+    logger.error(f"Backend conversion failed for {keras_path}: {error}")
+    report = {DEFAULT_BACKEND: {'validated': True, 'latency_ms': None}}
+    report.update({name: {'validated': False, 'error': f'Conversion process failed: {error}'} for name in names})
+    return report
+
+def main(argv: List[str]) -> None:
+    keras_path, out_dir, *names = argv
+    report = convert_and_validate(keras_path, out_dir, names)
+    print(json.dumps(report))
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
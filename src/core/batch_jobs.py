@@ -0,0 +1,207 @@
+#core/batch_jobs
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.common import utils
+from src.common.metrics import get_metrics
+from src.common.tensor_codec import to_jsonable
+
+# 작업 상태
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+INPUT_FORMATS = ('jsonl', 'npy')
+
+class BatchJobManager:
+    """대량(오프라인) 예측 작업 관리자
+
+    입력 파일(JSONL 또는 .npy)을 청크 단위로 읽어 ModelManager로 예측하고 결과를 JSONL로 이어 쓴다.
+    청크마다 출력 파일을 fsync한 뒤 상태 파일에 커밋 위치를 기록하므로,
+    프로세스가 중단되어도 마지막으로 커밋된 청크부터 재개할 수 있다.
+    """
+
+    def __init__(self, job_store_path: str, model_manager, workers: int = 2, batch_size: int = 1024):
+        self.job_store_path = job_store_path
+        self.model_manager = model_manager
+        self.batch_size = batch_size
+        self.metrics = get_metrics()
+        self.logger = logging.getLogger(__name__)
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch-job')
+        self._lock = threading.Lock()
+        os.makedirs(job_store_path, exist_ok=True)
+
+    # 경로 헬퍼
+    def _job_dir(self, job_id: str) -> str:
+        return os.path.join(self.job_store_path, job_id)
+
+    def _state_path(self, job_id: str) -> str:
+        return os.path.join(self._job_dir(job_id), 'state.json')
+
+    def input_path(self, job_id: str, input_format: str) -> str:
+        return os.path.join(self._job_dir(job_id), f'input.{input_format}')
+
+    def output_path(self, job_id: str) -> str:
+        return os.path.join(self._job_dir(job_id), 'output.jsonl')
+
+    def create_job(self, model_hash: str, input_file, input_format: str,
+                   batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """입력 파일을 저장하고 작업을 큐에 등록"""
+        if input_format not in INPUT_FORMATS:
+            raise ValueError(f"Unsupported input format: {input_format}")
+        # 다른 워커가 설치했거나 원격 저장소에만 있는 모델도 여기서 로컬로 가져옴
+        if not self.model_manager.ensure_local(model_hash):
+            raise KeyError(f"Model {model_hash} not found")
+
+        job_id = uuid.uuid4().hex
+        os.makedirs(self._job_dir(job_id))
+        input_file.save(self.input_path(job_id, input_format))
+
+        state = {
+            'job_id': job_id,
+            'model_hash': model_hash,
+            'input_format': input_format,
+            'batch_size': batch_size or self.batch_size,
+            'status': QUEUED,
+            'created': utils.get_kr_time().isoformat(),
+            'started': None,
+            'finished': None,
+            'committed_rows': 0,
+            'input_offset': 0,
+            'output_bytes': 0,
+            'rows_per_sec': None,
+            'error': None,
+        }
+        self._write_state(state)
+        self._executor.submit(self._run, job_id)
+        return state
+
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        """작업 상태 조회"""
+        if not job_id.isalnum() or not os.path.exists(self._state_path(job_id)):
+            raise KeyError(f"Job {job_id} not found")
+        with self._lock:
+            with open(self._state_path(job_id)) as f:
+                return json.load(f)
+
+    def resume_pending(self) -> List[str]:
+        """중단된(대기/실행 중이던) 작업을 다시 큐에 등록"""
+        resumed = []
+        for job_id in os.listdir(self.job_store_path):
+            try:
+                state = self.get_job(job_id)
+            except (KeyError, ValueError):
+                continue
+            if state['status'] in (QUEUED, RUNNING):
+                self._executor.submit(self._run, job_id)
+                resumed.append(job_id)
+        if resumed:
+            self.logger.info(f"Resuming {len(resumed)} batch jobs")
+        return resumed
+
+    def _write_state(self, state: Dict[str, Any]) -> None:
+        """상태 파일을 임시 파일에 쓴 뒤 rename으로 원자적 교체"""
+        path = self._state_path(state['job_id'])
+        tmp_path = f'{path}.tmp'
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+
+    def _read_chunks(self, state: Dict[str, Any]) -> Iterator[Tuple[np.ndarray, List[Any], int]]:
+        """커밋 위치부터 (배치, 행 id 목록, 다음 입력 오프셋) 생성"""
+        batch_size = state['batch_size']
+        input_path = self.input_path(state['job_id'], state['input_format'])
+
+        if state['input_format'] == 'npy':
+            data = np.load(input_path, mmap_mode='r')
+            for start in range(state['committed_rows'], data.shape[0], batch_size):
+                end = min(start + batch_size, data.shape[0])
+                yield np.ascontiguousarray(data[start:end]), [None] * (end - start), end
+            return
+
+        with open(input_path, 'rb') as f:
+            f.seek(state['input_offset'])
+            rows, ids = [], []
+            while True:
+                line = f.readline()
+                if line.strip():
+                    record = json.loads(line)
+                    if isinstance(record, dict):
+                        ids.append(record.get('id'))
+                        rows.append(record['data'])
+                    else:
+                        ids.append(None)
+                        rows.append(record)
+                if rows and (len(rows) >= batch_size or not line):
+                    yield np.array(rows), ids, f.tell()
+                    rows, ids = [], []
+                if not line:
+                    return
+
+    def _run(self, job_id: str) -> None:
+        """작업 실행 (커밋된 청크 이후부터)"""
+        state = self.get_job(job_id)
+        state['status'] = RUNNING
+        state['started'] = state['started'] or utils.get_kr_time().isoformat()
+        self._write_state(state)
+
+        processed, start = 0, time.perf_counter()
+        try:
+            with open(self.output_path(job_id), 'ab') as out:
+                # 마지막 커밋 이후 기록된 불완전한 출력 제거
+                out.truncate(state['output_bytes'])
+                for batch, ids, next_offset in self._read_chunks(state):
+                    prediction, _ = self.model_manager.predict(state['model_hash'], batch)
+                    out.write(self._format_rows(prediction, ids, state['committed_rows']))
+                    out.flush()
+                    os.fsync(out.fileno())
+
+                    processed += len(ids)
+                    state['committed_rows'] += len(ids)
+                    state['input_offset'] = next_offset
+                    state['output_bytes'] = out.tell()
+                    state['rows_per_sec'] = processed / max(time.perf_counter() - start, 1e-9)
+                    self._write_state(state)
+                    self.metrics.increment_batch_job_rows(len(ids))
+
+            state['status'] = COMPLETED
+        except Exception as e:
+            self.logger.error(f"Batch job {job_id} failed: {e}")
+            state['status'] = FAILED
+            state['error'] = str(e)
+        state['finished'] = utils.get_kr_time().isoformat()
+        self._write_state(state)
+
+    @staticmethod
+    def _format_rows(prediction: Any, ids: List[Any], first_index: int) -> bytes:
+        """예측 결과를 행 단위 JSONL로 변환 (이름 있는 다중 출력은 행마다 {이름: 값})"""
+        named = isinstance(prediction, dict)
+        outputs = prediction if isinstance(prediction, (list, tuple)) else [prediction]
+        lines = []
+        for i, row_id in enumerate(ids):
+            if named:
+                prediction_row = {name: to_jsonable(output[i]) for name, output in prediction.items()}
+            else:
+                row = [to_jsonable(output[i]) for output in outputs]
+                prediction_row = row[0] if len(row) == 1 else row
+            record = {'index': first_index + i, 'prediction': prediction_row}
+            if row_id is not None:
+                record['id'] = row_id
+            lines.append(json.dumps(record))
+        return ('\n'.join(lines) + '\n').encode()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
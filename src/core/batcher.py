@@ -0,0 +1,141 @@
+#core/batcher
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+import numpy as np
+
+from src.common.metrics import get_metrics
+
+class _PendingRequest:
+    """배치 대기 중인 단일 요청"""
+    __slots__ = ('data', 'future', 'enqueued_at')
+
+    def __init__(self, data: np.ndarray):
+        self.data = data
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+    @property
+    def rows(self) -> int:
+        return self.data.shape[0] if self.data.ndim else 1
+
+    def compatible_with(self, other: '_PendingRequest') -> bool:
+        """같은 배치로 묶을 수 있는지 (행을 제외한 shape, dtype 일치)"""
+        return (self.data.ndim > 0 and other.data.ndim > 0
+                and self.data.shape[1:] == other.data.shape[1:]
+                and self.data.dtype == other.data.dtype)
+
+class MicroBatcher:
+    """모델 단위 마이크로 배처 (대기 윈도우 내 요청을 모아 한 번의 forward pass로 처리)"""
+
+    def __init__(self, model_hash: str, predict_fn: Callable[[np.ndarray], Any],
+                 max_batch_size: int = 32, max_wait_ms: float = 5):
+        self.model_hash = model_hash
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.metrics = get_metrics()
+
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f'batcher-{model_hash}', daemon=True)
+        self._thread.start()
+
+    def submit(self, data: np.ndarray) -> Any:
+        """요청을 큐에 넣고 배치 결과 중 자신의 몫을 반환 (블로킹)"""
+        request = _PendingRequest(data)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Batcher for {self.model_hash} is closed")
+            self._queue.append(request)
+            self.metrics.set_batch_queue_depth(self.model_hash, len(self._queue))
+            self._cond.notify()
+        return request.future.result()
+
+    def close(self) -> None:
+        """배처 종료 (대기 중인 요청은 실패 처리)"""
+        with self._cond:
+            self._closed = True
+            pending = list(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+        for request in pending:
+            request.future.set_exception(RuntimeError(f"Batcher for {self.model_hash} is closed"))
+        self.metrics.remove_batch_queue_depth(self.model_hash)
+
+    def _queued_rows(self) -> int:
+        return sum(request.rows for request in self._queue)
+
+    def _collect_batch(self) -> List[_PendingRequest]:
+        """윈도우가 끝나거나 최대 배치 크기에 도달할 때까지 요청 수집"""
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return []
+
+            # 첫 요청 기준으로 대기 윈도우 계산
+            deadline = self._queue[0].enqueued_at + self.max_wait
+            while self._queued_rows() < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._closed:
+                    break
+                self._cond.wait(remaining)
+
+            # 첫 요청과 호환되는 요청만 최대 배치 크기까지 꺼냄
+            first = self._queue.popleft()
+            batch, rows, skipped = [first], first.rows, deque()
+            while self._queue and rows < self.max_batch_size:
+                request = self._queue.popleft()
+                if request.compatible_with(first) and rows + request.rows <= self.max_batch_size:
+                    batch.append(request)
+                    rows += request.rows
+                else:
+                    skipped.append(request)
+            self._queue.extendleft(reversed(skipped))
+            self.metrics.set_batch_queue_depth(self.model_hash, len(self._queue))
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            if not batch:
+                return
+            self._execute(batch)
+
+    def _execute(self, batch: List[_PendingRequest]) -> None:
+        """배치를 하나의 배열로 합쳐 예측 후 요청별로 결과 분배"""
+        now = time.monotonic()
+        for request in batch:
+            self.metrics.observe_batch_wait(now - request.enqueued_at)
+
+        try:
+            if len(batch) == 1:
+                outputs = self.predict_fn(batch[0].data)
+                self.metrics.observe_batch_size(batch[0].rows)
+                batch[0].future.set_result(outputs)
+                return
+
+            stacked = np.concatenate([request.data for request in batch], axis=0)
+            self.metrics.observe_batch_size(stacked.shape[0])
+            outputs = self.predict_fn(stacked)
+            offsets = np.cumsum([request.rows for request in batch])[:-1]
+
+            # 다중 출력 모델은 출력별로 분할
+            if isinstance(outputs, (list, tuple)):
+                parts = [np.split(np.asarray(output), offsets) for output in outputs]
+                results = [type(outputs)(part[i] for part in parts) for i in range(len(batch))]
+            else:
+                results = np.split(np.asarray(outputs), offsets)
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        for request, result in zip(batch, results):
+            request.future.set_result(result)
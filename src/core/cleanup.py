@@ -0,0 +1,169 @@
+#core/cleanup
+import heapq
+import itertools
+import logging
+import os
+import queue
+import shutil
+import threading
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+TRASH_DIR = '.trash'
+
+logger = logging.getLogger(__name__)
+
+class UsageHeap:
+    """마지막 사용 시각 순 최소 힙
+
+    사용 시각이 늦어지는 갱신은 dict만 바꾸고, 힙 항목은 맨 앞에 올라왔을 때 새 시각으로 다시 넣는다.
+    따라서 갱신은 O(1)이고, 만료 검사는 만료된 모델(과 그 사이 사용된 모델) 수에만 비례한다.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, str]] = []
+        # 해시별 (마지막 사용 시각, 유효한 힙 항목 번호)
+        self._used: Dict[str, Tuple[float, int]] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._used)
+
+    def __contains__(self, model_hash: str) -> bool:
+        return model_hash in self._used
+
+    def last_used(self, model_hash: str) -> Optional[float]:
+        entry = self._used.get(model_hash)
+        return entry[0] if entry else None
+
+    def update(self, model_hash: str, used: float) -> None:
+        """사용 시각 기록 (처음 보거나 더 이른 시각일 때만 힙에 삽입)"""
+        with self._lock:
+            current = self._used.get(model_hash)
+            if current is not None and used >= current[0]:
+                self._used[model_hash] = (used, current[1])
+                return
+            seq = next(self._seq)
+            self._used[model_hash] = (used, seq)
+            heapq.heappush(self._heap, (used, seq, model_hash))
+
+    def remove(self, model_hash: str) -> None:
+        with self._lock:
+            self._used.pop(model_hash, None)
+
+    def _peek(self) -> Optional[Tuple[float, str]]:
+        """가장 오래된 항목 (무효 항목은 버리고, 갱신된 항목은 새 시각으로 재삽입)"""
+        while self._heap:
+            used, seq, model_hash = self._heap[0]
+            current = self._used.get(model_hash)
+            if current is None or current[1] != seq:
+                heapq.heappop(self._heap)
+            elif used < current[0]:
+                seq = next(self._seq)
+                self._used[model_hash] = (current[0], seq)
+                heapq.heapreplace(self._heap, (current[0], seq, model_hash))
+            else:
+                return used, model_hash
+        return None
+
+    def pop_oldest(self) -> Optional[Tuple[str, float]]:
+        """가장 오래 사용되지 않은 (해시, 사용 시각)을 꺼냄"""
+        with self._lock:
+            oldest = self._peek()
+            if oldest is None:
+                return None
+            heapq.heappop(self._heap)
+            del self._used[oldest[1]]
+            return oldest[1], oldest[0]
+
+    def pop_expired(self, cutoff: float, refresh: Optional[Callable[[str], Optional[float]]] = None) -> List[str]:
+        """cutoff 이전에 마지막으로 사용된 해시를 꺼냄 (refresh로 다른 프로세스의 사용 시각 확인)"""
+        expired = []
+        while True:
+            with self._lock:
+                oldest = self._peek()
+                if oldest is None or oldest[0] >= cutoff:
+                    return expired
+            model_hash = oldest[1]
+            latest = refresh(model_hash) if refresh else None
+            if latest is not None and latest >= cutoff:
+                self.update(model_hash, latest)
+                continue
+            with self._lock:
+                # 확인하는 사이 다시 사용된 모델은 남김
+                if self._peek() != oldest:
+                    continue
+                heapq.heappop(self._heap)
+                del self._used[model_hash]
+            expired.append(model_hash)
+
+class TrashBin:
+    """폴더를 같은 파일 시스템의 .trash로 rename해 즉시 치우고, 실제 삭제는 백그라운드 스레드에서 처리"""
+
+    def __init__(self):
+        self._queue: 'queue.Queue[str]' = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def discard(self, path: str, store_root: Optional[str] = None) -> bool:
+        """폴더를 휴지통으로 옮기고 삭제 예약 (폴더가 없으면 False)
+
+        모델 경로가 버전 폴더를 가리키는 링크이면 링크를 지우고 가리키던 폴더를 옮긴다.
+        휴지통은 store_root(기본값: path가 있는 폴더)의 .trash.
+        """
+        trash_root = os.path.join(store_root or os.path.dirname(os.path.abspath(path)), TRASH_DIR)
+        if os.path.islink(path):
+            target = os.path.realpath(path)
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                return False
+            path = target
+        if not os.path.isdir(path):
+            return False
+        os.makedirs(trash_root, exist_ok=True)
+        target = os.path.join(trash_root, f'{os.path.basename(path)}-{uuid.uuid4().hex}')
+        try:
+            os.rename(path, target)
+        except FileNotFoundError:
+            return False
+        self._schedule(target)
+        return True
+
+    def empty(self, store_path: str) -> None:
+        """이전 프로세스가 남긴 휴지통 내용 삭제 예약"""
+        trash_root = os.path.join(store_path, TRASH_DIR)
+        if os.path.isdir(trash_root):
+            for name in os.listdir(trash_root):
+                self._schedule(os.path.join(trash_root, name))
+
+    def join(self) -> None:
+        """예약된 삭제가 모두 끝날 때까지 대기"""
+        self._queue.join()
+
+    def _schedule(self, path: str) -> None:
+        self._queue.put(path)
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._delete_loop, name='model-trash', daemon=True)
+                self._worker.start()
+
+    def _delete_loop(self) -> None:
+        while True:
+            path = self._queue.get()
+            try:
+                shutil.rmtree(path, ignore_errors=True)
+            finally:
+                self._queue.task_done()
+
+def directory_size(path: str) -> int:
+    """폴더 안 파일 크기 합계 (bytes)"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for file in files:
+            try:
+                total += os.path.getsize(os.path.join(root, file))
+            except OSError:
+                pass
+    return total
@@ -0,0 +1,41 @@
+#core/hash_ring
+import bisect
+import hashlib
+from typing import Iterable, List, Tuple
+
+class ConsistentHashRing:
+    """일관된 해싱 링 (노드 추가/제거 시 일부 키만 재배치)"""
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 100):
+        self.replicas = replicas
+        self._ring: List[Tuple[int, str]] = []
+        self._keys: List[int] = []
+        self.nodes: List[str] = []
+        for node in nodes:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+    def add_node(self, node: str) -> None:
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for i in range(self.replicas):
+            bisect.insort(self._ring, (self._hash(f'{node}#{i}'), node))
+        self._keys = [h for h, _ in self._ring]
+
+    def remove_node(self, node: str) -> None:
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        self._ring = [(h, n) for h, n in self._ring if n != node]
+        self._keys = [h for h, _ in self._ring]
+
+    def get_node(self, key: str) -> str:
+        """키를 담당하는 노드 반환"""
+        if not self._ring:
+            raise LookupError("Hash ring is empty")
+        index = bisect.bisect(self._keys, self._hash(key)) % len(self._ring)
+        return self._ring[index][1]
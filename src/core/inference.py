@@ -0,0 +1,91 @@
+#core/inference
+import logging
+import threading
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from src.core.tf_runtime import get_tf
+
+# 기본 shape bucket (배치 행 수를 이 값들 중 하나로 패딩)
+DEFAULT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+class InferenceEngine:
+    """캐시된 모델의 추론 fast path
+
+    `model.predict`는 호출마다 tf.data 파이프라인과 콜백을 구성하므로 작은 입력에서 느리다.
+    단일 입력 Keras 모델은 `model(x, training=False)`를 tf.function으로 트레이싱해 호출하고,
+    배치 행 수를 bucket 크기로 패딩해 (bucket, shape, dtype) 조합별 concrete function만 캐시한다.
+    bucket을 넘는 큰 배치나 지원하지 않는 모델은 기존 `model.predict`를 그대로 사용한다.
+    """
+
+    def __init__(self, model: Any, enabled: bool = True, buckets: Tuple[int, ...] = DEFAULT_BUCKETS,
+                 max_signatures: int = 32):
+        self.model = model
+        self.buckets = tuple(sorted(buckets))
+        self.max_signatures = max_signatures
+        self.enabled = enabled and self._supports_fast_path(model)
+        self.logger = logging.getLogger(__name__)
+
+        self._signatures: Dict[Tuple, Any] = {}
+        self._lock = threading.Lock()
+        self._fn = get_tf().function(lambda x: model(x, training=False)) if self.enabled else None
+
+    @staticmethod
+    def _supports_fast_path(model: Any) -> bool:
+        """fast path 적용 가능 여부 (단일 입력 Keras 모델만)"""
+        if not isinstance(model, get_tf().keras.Model):
+            return False
+        inputs = getattr(model, 'inputs', None)
+        return not inputs or len(inputs) == 1
+
+    def _bucket_for(self, rows: int) -> int:
+        for bucket in self.buckets:
+            if rows <= bucket:
+                return bucket
+        return 0
+
+    def _concrete_function(self, key: Tuple) -> Any:
+        """시그니처별 concrete function 반환 (없으면 트레이싱)"""
+        fn = self._signatures.get(key)
+        if fn is not None:
+            return fn
+        with self._lock:
+            fn = self._signatures.get(key)
+            if fn is None:
+                if len(self._signatures) >= self.max_signatures:
+                    return None
+                bucket, trailing_shape, dtype = key
+                tf = get_tf()
+                spec = tf.TensorSpec((bucket,) + trailing_shape, tf.as_dtype(dtype))
+                fn = self._fn.get_concrete_function(spec)
+                self._signatures[key] = fn
+                self.logger.debug(f"Traced inference signature {spec}")
+            return fn
+
+    def predict(self, data: np.ndarray) -> Any:
+        """예측 수행 (fast path 불가 시 model.predict로 대체)"""
+        if not self.enabled or data.ndim == 0 or data.dtype == object:
+            return self.model.predict(data)
+
+        rows = data.shape[0]
+        bucket = self._bucket_for(rows)
+        if not bucket:
+            return self.model.predict(data)
+
+        fn = self._concrete_function((bucket, tuple(data.shape[1:]), data.dtype))
+        if fn is None:
+            return self.model.predict(data)
+
+        # bucket 크기까지 0으로 패딩 후 결과에서 잘라냄
+        if bucket != rows:
+            padded = np.zeros((bucket,) + data.shape[1:], dtype=data.dtype)
+            padded[:rows] = data
+            data = padded
+        tf = get_tf()
+        outputs = fn(tf.constant(data))
+        return tf.nest.map_structure(lambda t: t.numpy()[:rows], outputs)
+
+    @property
+    def signature_count(self) -> int:
+        return len(self._signatures)
@@ -0,0 +1,101 @@
+#core/input_spec
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+class InvalidInputError(ValueError):
+    """모델 입력 시그니처와 맞지 않는 요청 데이터"""
+
+class InputSpec(NamedTuple):
+    """모델 입력 시그니처 (shape의 None은 가변 차원, 첫 차원은 배치)"""
+    shape: Tuple[Optional[int], ...]
+    dtype: np.dtype
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'shape': list(self.shape), 'dtype': self.dtype.name}
+
+    @classmethod
+    def from_dict(cls, value: Optional[Dict[str, Any]]) -> Optional['InputSpec']:
+        if not value:
+            return None
+        return cls(tuple(value['shape']), np.dtype(value['dtype']))
+
+    def coerce(self, data: Any) -> np.ndarray:
+        """요청 데이터를 모델의 네이티브 dtype 배열로 변환 (이미 같은 dtype이면 복사 없음)"""
+        try:
+            if isinstance(data, np.ndarray):
+                array = data
+            elif np.issubdtype(self.dtype, np.floating):
+                # JSON 리스트는 float64 중간 배열 없이 바로 모델 dtype으로 변환
+                array = np.asarray(data, dtype=self.dtype)
+            else:
+                # 정수/bool 입력은 소수 값이 잘리지 않도록 먼저 타입을 확인
+                array = np.asarray(data)
+        except (TypeError, ValueError) as e:
+            raise InvalidInputError(f"Input cannot be converted to {self.dtype.name}: {e}")
+
+        if array.dtype != self.dtype:
+            if not self._castable(array):
+                raise InvalidInputError(f"Input dtype {array.dtype.name} cannot be cast to {self.dtype.name}")
+            array = array.astype(self.dtype)
+
+        if array.ndim != len(self.shape):
+            raise InvalidInputError(
+                f"Input must have {len(self.shape)} dimensions {self._describe()}, got shape {array.shape}"
+            )
+        for axis, (expected, actual) in enumerate(zip(self.shape, array.shape)):
+            # 배치 차원은 고정 크기여도 패딩/분할되므로 검사하지 않음
+            if axis and expected is not None and expected != actual:
+                raise InvalidInputError(f"Input shape {array.shape} does not match {self._describe()}")
+        return array
+
+    def _castable(self, array: np.ndarray) -> bool:
+        """값이 바뀌지 않는 변환만 허용 (safe 캐스팅 + 아래 두 가지 축소 변환)
+
+        JSON 숫자는 항상 int64/float64 배열이 되므로 safe 캐스팅만으로는 float32/int32 모델에 보낼 수 없다.
+        float 모델은 정수/float 입력의 정밀도 축소를 허용하되 범위를 넘는 값(inf가 되는 값)은 거절하고,
+        정수 모델은 모든 값이 범위 안에 있을 때만 더 좁은 정수형으로 변환한다 (overflow로 값이 바뀌지 않도록).
+        """
+        if array.dtype == object:
+            return False
+        if np.can_cast(array.dtype, self.dtype, casting='safe'):
+            return True
+        if array.size == 0:
+            return np.can_cast(array.dtype, self.dtype, casting='same_kind')
+        if np.issubdtype(self.dtype, np.floating):
+            if np.issubdtype(array.dtype, np.integer):
+                return True
+            if np.issubdtype(array.dtype, np.floating):
+                finite = np.isfinite(array)
+                return bool(np.all(np.abs(array[finite]) <= np.finfo(self.dtype).max))
+            return False
+        if np.issubdtype(self.dtype, np.integer) and np.issubdtype(array.dtype, np.integer):
+            info = np.iinfo(self.dtype)
+            return bool(info.min <= array.min() and array.max() <= info.max)
+        return False
+
+    def _describe(self) -> str:
+        return '(' + ', '.join('?' if dim is None else str(dim) for dim in self.shape) + ')'
+
+def as_array(data: Any) -> np.ndarray:
+    """시그니처를 모르는 모델의 입력 배열 변환 (ragged 등 변환 불가 입력은 InvalidInputError)"""
+    try:
+        return np.array(data)
+    except (TypeError, ValueError) as e:
+        raise InvalidInputError(f"Input cannot be converted to an array: {e}")
+
+def spec_from_engine(engine: Any) -> Optional[InputSpec]:
+    """로드된 추론 엔진/실행기의 단일 입력 시그니처 (알 수 없거나 다중 입력이면 None)"""
+    inputs = getattr(engine, 'inputs', None)
+    if inputs is None:
+        inputs = getattr(getattr(engine, 'model', None), 'inputs', None)
+    if not isinstance(inputs, (list, tuple)) or len(inputs) != 1:
+        return None
+    try:
+        shape = tuple(None if dim is None or dim < 0 else int(dim) for dim in tuple(inputs[0].shape))
+        dtype = np.dtype(getattr(inputs[0].dtype, 'as_numpy_dtype', inputs[0].dtype))
+    except (TypeError, ValueError, AttributeError):
+        return None
+    if not shape or dtype == object:
+        return None
+    return InputSpec(shape, dtype)
@@ -0,0 +1,188 @@
+#core/model_cache
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.common.metrics import get_metrics
+
+class CacheEntry:
+    """캐시된 모델과 메모리/사용량 정보"""
+    __slots__ = ('value', 'size_bytes', 'load_time', 'hits', 'loaded_at', 'last_access')
+
+    def __init__(self, value: Any, size_bytes: int, load_time: float):
+        self.value = value
+        self.size_bytes = size_bytes
+        self.load_time = load_time
+        self.hits = 0
+        self.loaded_at = time.monotonic()
+        self.last_access = self.loaded_at
+
+    def hit_rate(self, now: float) -> float:
+        """로드 이후 초당 적중 횟수"""
+        return (self.hits + 1) / max(now - self.loaded_at, 1.0)
+
+class EvictionPolicy(ABC):
+    """축출 대상 선택 정책 (entries는 LRU 순서로 정렬되어 있음)"""
+    name = 'base'
+
+    @abstractmethod
+    def victim(self, entries: 'OrderedDict[str, CacheEntry]', candidates: Iterable[str]) -> Optional[str]:
+        """candidates 중 축출할 해시 (없으면 None)"""
+
+class LRUPolicy(EvictionPolicy):
+    """가장 오래 사용되지 않은 모델 축출"""
+    name = 'lru'
+
+    def victim(self, entries, candidates):
+        return next(iter(candidates), None)
+
+class LFUPolicy(EvictionPolicy):
+    """적중 횟수가 가장 적은 모델 축출 (동률이면 LRU)"""
+    name = 'lfu'
+
+    def victim(self, entries, candidates):
+        return min(candidates, key=lambda h: entries[h].hits, default=None)
+
+class CostAwarePolicy(EvictionPolicy):
+    """다시 로드하는 비용(로드 시간 x 적중률)이 가장 작은 모델 축출"""
+    name = 'cost'
+
+    def victim(self, entries, candidates):
+        now = time.monotonic()
+        return min(candidates, key=lambda h: entries[h].load_time * entries[h].hit_rate(now), default=None)
+
+POLICIES = {policy.name: policy for policy in (LRUPolicy, LFUPolicy, CostAwarePolicy)}
+
+def estimate_model_bytes(model: Any) -> int:
+    """모델 파라미터 크기(bytes) 추정"""
+    try:
+        return int(sum(np.prod(w.shape) * np.dtype(w.dtype).itemsize for w in model.weights))
+    except Exception:
+        return 0
+
+class ModelCache:
+    """메모리 예산 기반 모델 캐시 (모델 수와 바이트 한도 내에서 정책에 따라 축출, 고정 모델 제외)
+
+    모든 연산은 내부 락으로 보호되며 락을 잡은 상태에서 I/O를 하지 않으므로,
+    다른 모델의 로드가 진행 중이어도 이미 캐시된 모델 조회는 막히지 않는다.
+    """
+
+    def __init__(self, max_bytes: int = 0, max_entries: int = 10, policy: str = 'lru',
+                 pinned: Iterable[str] = ()):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown cache policy: {policy}")
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.policy = POLICIES[policy]()
+        self.pinned = set(pinned)
+        self.total_bytes = 0
+        self._entries: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.metrics = get_metrics()
+        self.logger = logging.getLogger(__name__)
+
+    def __contains__(self, model_hash: str) -> bool:
+        return model_hash in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, model_hash: str) -> Optional[Any]:
+        """캐시 조회 (적중 시 사용 기록 갱신)"""
+        with self._lock:
+            entry = self._entries.get(model_hash)
+            if entry is None:
+                return None
+            entry.hits += 1
+            entry.last_access = time.monotonic()
+            self._entries.move_to_end(model_hash)
+            return entry.value
+
+    def put(self, model_hash: str, value: Any, size_bytes: int = 0, load_time: float = 0.0) -> bool:
+        """모델 추가 (예산 초과 시 고정되지 않은 모델부터 축출, 혼자서 바이트 예산을 넘는 모델은 추가하지 않고 False)"""
+        with self._lock:
+            self.pop(model_hash)
+            # 다른 모델을 모두 축출해도 들어가지 않는 모델은 캐시하지 않음 (호출자는 캐시 없이 사용)
+            if self.max_bytes and size_bytes > self.max_bytes and model_hash not in self.pinned:
+                self.logger.warning(f"Model {model_hash} ({size_bytes} bytes) exceeds the {self.max_bytes} byte "
+                                    f"cache budget; serving it without caching")
+                return False
+            self._make_room(size_bytes)
+            self._entries[model_hash] = CacheEntry(value, size_bytes, load_time)
+            self.total_bytes += size_bytes
+            self.metrics.set_model_cache_bytes(model_hash, size_bytes)
+            self._update_usage()
+            return True
+
+    def pop(self, model_hash: str, default: Any = None) -> Any:
+        """모델 제거"""
+        with self._lock:
+            entry = self._entries.pop(model_hash, None)
+            if entry is None:
+                return default
+            self.total_bytes -= entry.size_bytes
+            self.metrics.remove_model_cache_bytes(model_hash)
+            self._update_usage()
+            return entry.value
+
+    def clear(self) -> None:
+        with self._lock:
+            for model_hash in list(self._entries):
+                self.pop(model_hash)
+
+    def pin(self, model_hash: str) -> None:
+        with self._lock:
+            self.pinned.add(model_hash)
+
+    def unpin(self, model_hash: str) -> None:
+        with self._lock:
+            self.pinned.discard(model_hash)
+
+    def entries(self) -> List[Tuple[str, Any, int]]:
+        """(해시, 모델, 추정 크기) 스냅샷 (LRU 순서는 바꾸지 않음)"""
+        with self._lock:
+            return [(model_hash, entry.value, entry.size_bytes) for model_hash, entry in self._entries.items()]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """모델별 캐시 상태"""
+        with self._lock:
+            return {
+                model_hash: {
+                    'size_bytes': entry.size_bytes,
+                    'load_time': entry.load_time,
+                    'hits': entry.hits,
+                    'pinned': model_hash in self.pinned,
+                }
+                for model_hash, entry in self._entries.items()
+            }
+
+    def has_room(self, incoming_bytes: int = 0) -> bool:
+        """축출 없이 모델을 더 넣을 수 있는지"""
+        with self._lock:
+            return not self._over_budget(incoming_bytes)
+
+    def _over_budget(self, incoming_bytes: int) -> bool:
+        if len(self._entries) >= self.max_entries:
+            return True
+        return bool(self.max_bytes) and self.total_bytes + incoming_bytes > self.max_bytes
+
+    def _make_room(self, incoming_bytes: int) -> None:
+        while self._entries and self._over_budget(incoming_bytes):
+            candidates = [h for h in self._entries if h not in self.pinned]
+            victim = self.policy.victim(self._entries, candidates)
+            if victim is None:
+                self.logger.warning("Model cache over budget but every cached model is pinned")
+                return
+            size = self._entries[victim].size_bytes
+            self.pop(victim)
+            self.metrics.increment_model_cache_eviction(self.policy.name)
+            self.logger.info(f"Evicted model {victim} from cache ({size} bytes, policy={self.policy.name})")
+
+    def _update_usage(self) -> None:
+        self.metrics.set_model_cache_usage(len(self._entries))
+        self.metrics.set_model_cache_total_bytes(self.total_bytes)
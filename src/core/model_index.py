@@ -0,0 +1,275 @@
+#core/model_index
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.common import utils
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    hash TEXT PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    keras_path TEXT,
+    size INTEGER NOT NULL DEFAULT 0,
+    uploaded_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    options TEXT NOT NULL DEFAULT '{}',
+    access_hours TEXT NOT NULL DEFAULT '[]'
+)
+"""
+_UPLOADED_AT_INDEX = 'CREATE INDEX IF NOT EXISTS models_uploaded_at ON models (uploaded_at)'
+# 해시별 모델 세대 (업로드/삭제/백엔드 변경 시 증가, 삭제 후에도 유지) - 다른 프로세스가 변경을 감지하는 기록
+_GENERATIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS generations (
+    hash TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    changed_at REAL NOT NULL
+)
+"""
+_CHANGED_AT_INDEX = 'CREATE INDEX IF NOT EXISTS generations_changed_at ON generations (changed_at)'
+# 시간대별 접근 수 컬럼 도입 전에 만든 인덱스 파일에 컬럼 추가
+_ACCESS_HOURS_COLUMN = "ALTER TABLE models ADD COLUMN access_hours TEXT NOT NULL DEFAULT '[]'"
+_HOURS = 24
+_SELECT = 'SELECT hash, file_path, keras_path, size, uploaded_at, last_used, hits, options FROM models'
+
+# metadata_store 항목 중 options 컬럼(JSON)에 저장할 키
+_OPTION_KEYS = ('fast_path', 'backend', 'backend_override', 'backends', 'disk_bytes', 'mmap', 'input_spec', 'conversion')
+
+class ModelIndex:
+    """모델 메타데이터 영속 인덱스 (SQLite)
+
+    시작 시 디렉터리 스캔 대신 인덱스를 읽고, 마지막 사용 시각/적중 수 갱신은
+    메모리에 모아 두었다가 주기적으로 한 번에 기록한다.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 30):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger(__name__)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(_SCHEMA)
+        self._conn.execute(_UPLOADED_AT_INDEX)
+        self._conn.execute(_GENERATIONS_SCHEMA)
+        self._conn.execute(_CHANGED_AT_INDEX)
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(models)')}
+        if 'access_hours' not in columns:
+            self._conn.execute(_ACCESS_HOURS_COLUMN)
+        self._conn.commit()
+
+        self._lock = threading.Lock()
+        # 해시별 (마지막 사용 timestamp, 누적 적중 수, 시간대별 접근 수) - flush 전까지 메모리에 보관
+        self._pending: Dict[str, list] = {}
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+
+    def start_flusher(self) -> None:
+        """주기적인 flush 스레드 시작"""
+        if self._flusher or self.flush_interval <= 0:
+            return
+
+        def flush_loop():
+            while not self._closed:
+                time.sleep(self.flush_interval)
+                self.flush()
+
+        self._flusher = threading.Thread(target=flush_loop, name='model-index-flush', daemon=True)
+        self._flusher.start()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM models LIMIT 1').fetchone() is None
+
+    def load_all(self, uploaded_after: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """인덱스의 모델을 metadata_store 형식으로 반환 (uploaded_after 지정 시 그 이후 업로드된 모델만)"""
+        with self._lock:
+            if uploaded_after is None:
+                rows = self._conn.execute(_SELECT).fetchall()
+            else:
+                rows = self._conn.execute(_SELECT + ' WHERE uploaded_at > ?', (uploaded_after,)).fetchall()
+        return {row[0]: _row_metadata(row) for row in rows}
+
+    def get(self, model_hash: str) -> Optional[Dict[str, Any]]:
+        """모델 하나의 메타데이터 (다른 프로세스가 설치한 모델 확인용, 없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(_SELECT + ' WHERE hash = ?', (model_hash,)).fetchone()
+        return _row_metadata(row) if row else None
+
+    def upsert(self, model_hash: str, metadata: Dict[str, Any]) -> None:
+        """모델 항목 추가/교체"""
+        now = time.time()
+        options = option_values(metadata)
+        with self._lock:
+            self._pending.pop(model_hash, None)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO models (hash, file_path, keras_path, size, uploaded_at, last_used, hits, options) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    model_hash,
+                    metadata['file_path'],
+                    metadata.get('keras_path'),
+                    metadata.get('size', 0),
+                    _timestamp(metadata.get('uploaded'), now),
+                    _timestamp(metadata.get('used'), now),
+                    metadata.get('hits', 0),
+                    json.dumps(options),
+                ),
+            )
+            self._conn.commit()
+
+    def set_keras_path(self, model_hash: str, keras_path: str) -> None:
+        with self._lock:
+            self._conn.execute('UPDATE models SET keras_path = ? WHERE hash = ?', (keras_path, model_hash))
+            self._conn.commit()
+
+    def set_options(self, model_hash: str, metadata: Dict[str, Any]) -> None:
+        """options 컬럼만 갱신 (사용 기록은 유지)"""
+        options = option_values(metadata)
+        with self._lock:
+            self._conn.execute('UPDATE models SET options = ? WHERE hash = ?', (json.dumps(options), model_hash))
+            self._conn.commit()
+
+    def last_used(self, model_hash: str) -> Optional[float]:
+        """기록된 마지막 사용 시각 (epoch 초, 다른 프로세스의 flush 포함)"""
+        with self._lock:
+            row = self._conn.execute('SELECT last_used FROM models WHERE hash = ?', (model_hash,)).fetchone()
+        return row[0] if row else None
+
+    def store_bytes(self) -> int:
+        """모든 프로세스가 등록한 모델 폴더 크기(disk_bytes) 합계"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(json_extract(options, '$.disk_bytes')), 0) FROM models"
+            ).fetchone()
+        return row[0]
+
+    def least_recently_used(self) -> List[Tuple[str, int]]:
+        """(해시, 폴더 크기) 목록 - 마지막 사용 시각이 오래된 순"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT hash, COALESCE(json_extract(options, '$.disk_bytes'), 0) FROM models ORDER BY last_used"
+            ).fetchall()
+
+    def missing_disk_bytes(self) -> List[Tuple[str, str]]:
+        """폴더 크기가 기록되지 않은 모델의 (해시, 폴더 경로) - 디스크 한도 도입 전 등록된 모델"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT hash, file_path FROM models WHERE json_extract(options, '$.disk_bytes') IS NULL"
+            ).fetchall()
+
+    def set_disk_bytes(self, model_hash: str, disk_bytes: int) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE models SET options = json_set(options, '$.disk_bytes', ?) WHERE hash = ?",
+                               (disk_bytes, model_hash))
+            self._conn.commit()
+
+    def remove(self, model_hash: str) -> None:
+        with self._lock:
+            self._pending.pop(model_hash, None)
+            self._conn.execute('DELETE FROM models WHERE hash = ?', (model_hash,))
+            self._conn.commit()
+
+    def bump_generation(self, model_hash: str) -> int:
+        """모델 세대를 1 올리고 새 세대 반환 (다른 프로세스는 changes_since로 감지)"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO generations (hash, generation, changed_at) VALUES (?, 1, ?) '
+                'ON CONFLICT(hash) DO UPDATE SET generation = generation + 1, changed_at = excluded.changed_at',
+                (model_hash, time.time()),
+            )
+            row = self._conn.execute('SELECT generation FROM generations WHERE hash = ?', (model_hash,)).fetchone()
+            self._conn.commit()
+        return row[0]
+
+    def generation(self, model_hash: str) -> int:
+        """기록된 모델 세대 (변경 기록이 없으면 0)"""
+        with self._lock:
+            row = self._conn.execute('SELECT generation FROM generations WHERE hash = ?', (model_hash,)).fetchone()
+        return row[0] if row else 0
+
+    def changes_since(self, timestamp: float) -> Dict[str, int]:
+        """timestamp(epoch 초) 이후 세대가 바뀐 해시 -> 세대"""
+        with self._lock:
+            rows = self._conn.execute('SELECT hash, generation FROM generations WHERE changed_at > ?',
+                                      (timestamp,)).fetchall()
+        return dict(rows)
+
+    def access_hours(self) -> Dict[str, List[int]]:
+        """모델별 시간대(한국 시간 0~23시)별 누적 접근 수 (기록이 없는 모델 제외)"""
+        with self._lock:
+            rows = self._conn.execute("SELECT hash, access_hours FROM models WHERE access_hours != '[]'").fetchall()
+        return {model_hash: json.loads(hours) for model_hash, hours in rows}
+
+    def touch(self, model_hash: str, hits: int = 1, hour: Optional[int] = None) -> None:
+        """사용 기록 (다음 flush 때 디스크에 반영, hour = 접근 시간대)"""
+        with self._lock:
+            pending = self._pending.setdefault(model_hash, [0.0, 0, None])
+            pending[0] = time.time()
+            pending[1] += hits
+            if hour is not None:
+                if pending[2] is None:
+                    pending[2] = [0] * _HOURS
+                pending[2][hour] += hits
+
+    def flush(self) -> None:
+        """모아 둔 사용 기록을 한 트랜잭션으로 기록"""
+        with self._lock:
+            if not self._pending or self._closed:
+                return
+            updates = [(last_used, hits, model_hash) for model_hash, (last_used, hits, _) in self._pending.items()]
+            histograms = [(model_hash, hours) for model_hash, (_, _, hours) in self._pending.items() if hours]
+            self._pending.clear()
+            try:
+                self._conn.executemany(
+                    'UPDATE models SET last_used = MAX(last_used, ?), hits = hits + ? WHERE hash = ?', updates
+                )
+                # 시간대별 접근 수는 다른 프로세스의 기록과 합산
+                for model_hash, hours in histograms:
+                    row = self._conn.execute('SELECT access_hours FROM models WHERE hash = ?', (model_hash,)).fetchone()
+                    if row is None:
+                        continue
+                    stored = json.loads(row[0]) or [0] * _HOURS
+                    merged = [a + b for a, b in zip(stored, hours)]
+                    self._conn.execute('UPDATE models SET access_hours = ? WHERE hash = ?',
+                                       (json.dumps(merged), model_hash))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self.logger.error(f"Model index flush failed: {e}")
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._conn.close()
+
+def option_values(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """metadata_store 항목 중 options 컬럼에 저장하는 값 (원격 저장소 메타데이터에도 사용)"""
+    return {key: metadata[key] for key in _OPTION_KEYS if key in metadata}
+
+def _row_metadata(row: tuple) -> Dict[str, Any]:
+    """인덱스 행을 metadata_store 항목으로 변환"""
+    _, file_path, keras_path, size, uploaded_at, last_used, hits, options = row
+    entry = {
+        'file_path': file_path,
+        'keras_path': keras_path,
+        'size': size,
+        'uploaded': utils.from_timestamp(uploaded_at),
+        'used': utils.from_timestamp(last_used),
+        'hits': hits,
+    }
+    entry.update(json.loads(options))
+    return entry
+
+def _timestamp(value: Any, default: float) -> float:
+    """datetime 또는 숫자를 epoch 초로 변환"""
+    if hasattr(value, 'timestamp'):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    return default
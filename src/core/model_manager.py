@@ -1,154 +1,842 @@
 #core/model_manager
 import os
-import shutil
+import atexit
+import fcntl
 import logging
 import threading
 import time
-from zipfile import ZipFile, BadZipFile
-from collections import OrderedDict
-from typing import Dict, Any, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
-import tensorflow as tf
+import psutil
 import numpy as np
 
 from src.common import utils
+from src.common import tracing
 from src.common.metrics import get_metrics
+from src.core import backends
+from src.core.batcher import MicroBatcher
+from src.core.cleanup import TrashBin, UsageHeap, directory_size
+from src.core.inference import InferenceEngine
+from src.core.input_spec import InputSpec, as_array, spec_from_engine
+from src.core.model_cache import ModelCache, estimate_model_bytes
+from src.core.model_index import ModelIndex, option_values
+from src.core.prefetch import AccessStats
+from src.core.remote_store import CHUNK_SIZE, FETCH_DIR, RemoteFetcher, RemoteStore
+from src.core.result_cache import ResultCache, split_rows, stack_rows
+from src.core import upload as model_upload
+from src.core.tf_runtime import get_tf
 
 class ModelManager:
-    def __init__(self, store_path: str, max_cache_size: int = 10):
-        """모델 관리자 초기화 (경로 설정, 캐시 설정)"""
+    def __init__(self, store_path: str, max_cache_size: int = 10, cache_max_bytes: int = 0,
+                 cache_policy: str = 'lru', pinned_models: Iterable[str] = (), batching: bool = False,
+                 max_batch_size: int = 32, max_batch_wait_ms: float = 5, fast_path: bool = True,
+                 max_upload_size: int = 0, upload_spool_memory: int = 32 * 1024 * 1024,
+                 require_digest: bool = False, index_path: Optional[str] = None,
+                 index_flush_interval: float = 30, cleanup_enabled: bool = True,
+                 result_cache: Optional[ResultCache] = None, convert_backends: Iterable[str] = (),
+                 convert_timeout: float = 300, cleanup_interval: float = 5, max_idle_days: float = 7,
+                 store_max_bytes: int = 0, mmap_weights: bool = False,
+                 remote_store: Optional[RemoteStore] = None, fetch_workers: int = 4,
+                 fetch_chunk_size: int = CHUNK_SIZE, remote_miss_ttl: float = 5,
+                 index_sync_interval: float = 5):
+        """모델 관리자 초기화 (경로 설정, 캐시 설정, 배칭 설정)"""
         self.store_path = store_path
         self.max_cache_size = max_cache_size
         self.metadata_store: Dict[str, Dict[str, Any]] = {}
-        self.model_cache = OrderedDict()
+        self.model_cache = ModelCache(
+            max_bytes=cache_max_bytes,
+            max_entries=max_cache_size,
+            policy=cache_policy,
+            pinned=pinned_models,
+        )
+        self.batching = batching
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait_ms = max_batch_wait_ms
+        self.batchers: Dict[str, MicroBatcher] = {}
+        self.fast_path = fast_path
+        self.max_upload_size = max_upload_size
+        self.upload_spool_memory = upload_spool_memory
+        self.require_digest = require_digest
+        self.staging_path = os.path.join(store_path, model_upload.STAGING_DIR)
+        self.index_path = index_path or os.path.join(store_path, '.model_index.sqlite3')
+        self.index_flush_interval = index_flush_interval
+        # 다른 프로세스의 업로드/삭제를 인덱스에서 확인하는 주기 (초, 0 = 정리 작업 때만)
+        self.index_sync_interval = index_sync_interval
+        self.result_cache = result_cache
+        self.convert_backends = [name for name in convert_backends if name != backends.DEFAULT_BACKEND]
+        self.convert_timeout = convert_timeout
+        # 업로드 후 백엔드 변환/검증은 요청과 분리해 한 번에 하나씩 백그라운드에서 실행
+        self._converter = ThreadPoolExecutor(max_workers=1, thread_name_prefix='backend-convert')
+        self.cleanup_interval = cleanup_interval
+        self.max_idle_days = max_idle_days
+        self.store_max_bytes = store_max_bytes
+        self.mmap_weights = mmap_weights
+        # 원격 저장소 (메모리 캐시 -> 로컬 디스크 -> 원격 순으로 조회, None = 로컬만)
+        self.remote_store = remote_store
+        self.fetcher = RemoteFetcher(
+            remote_store, os.path.join(store_path, FETCH_DIR),
+            workers=fetch_workers, chunk_size=fetch_chunk_size,
+        ) if remote_store is not None else None
+        # 원격에도 없던 해시 -> 다시 확인할 시각 (time.monotonic, 잘못된 해시 반복 요청 시 잠금/조회 생략)
+        self.remote_miss_ttl = remote_miss_ttl
+        self._remote_misses: Dict[str, float] = {}
+        # 사전 로드 대상 선정용 접근 빈도/시간대 기록
+        self.access_stats = AccessStats()
+        # 모델 삭제 시 호출할 함수 (모델별 상태를 가진 외부 구성 요소 정리용, 인자: 해시)
+        self.removal_listeners: List[Callable[[str], None]] = []
+        # 로드 시 계산한 모델별 입력 시그니처 (None = 알 수 없음/다중 입력)
+        self._input_specs: Dict[str, Optional[InputSpec]] = {}
+        # 메모리 메트릭을 기록한 모델 (캐시에서 빠지면 라벨 제거)
+        self._memory_labels: set = set()
+        # 마지막 사용 시각 순 힙과 백그라운드 삭제용 휴지통
+        self.usage = UsageHeap()
+        self.trash = TrashBin()
+        self._cleanup_lock = threading.RLock()
+        # 같은 해시의 설치(업로드/원격 설치)를 직렬화하는 잠금 (해시별로 나눈 고정 개수)
+        self._install_locks = [threading.Lock() for _ in range(64)]
+        self._index_synced_at = time.time()
+        self._batchers_lock = threading.Lock()
+        # 해시별로 진행 중인 로드 (single-flight)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # 해시별 모델 세대 (재업로드/삭제/백엔드 변경 시 인덱스에서 증가, 로드 중 바뀌면 로드 결과를 캐시에 넣지 않음)
+        self._generations: Dict[str, int] = {}
+        self._stopped = threading.Event()
         self.metrics = get_metrics()
         self.logger = logging.getLogger(__name__)
         
         # 초기화 작업
         self._load_metadata_store()
-        self._start_cleanup_scheduler()
+        if cleanup_enabled:
+            self._start_cleanup_scheduler()
+            self._resume_conversions()
+        self._start_index_sync()
 
     def _load_metadata_store(self) -> None:
-        """기존 저장된 모델들의 메타데이터 로드"""
-        if not os.path.exists(self.store_path):
-            os.makedirs(self.store_path)
-            return
+        """영속 인덱스에서 모델 메타데이터 로드 (인덱스가 비어 있으면 디렉터리를 한 번 스캔해 채움)"""
+        os.makedirs(self.store_path, exist_ok=True)
+
+        # 중단된 업로드의 스테이징 잔여물 정리
+        model_upload.clear_staging(self.staging_path)
+
+        self.index = ModelIndex(self.index_path, flush_interval=self.index_flush_interval)
+        if self.index.is_empty():
+            self._import_store_directory()
+        self.metadata_store.update(self.index.load_all())
+        self._generations.update(self.index.changes_since(0))
+        for model_hash, metadata in self.metadata_store.items():
+            self.usage.update(model_hash, metadata['used'].timestamp())
+        self.access_stats.seed(self.metadata_store, self.index.access_hours())
+        # 이전 프로세스가 삭제하지 못한 폴더와 설치 도중 중단되어 링크되지 않은 버전 폴더 정리
+        self.trash.empty(self.store_path)
+        for version_path in model_upload.unlinked_versions(self.store_path):
+            self.trash.discard(version_path, self.store_path)
+        self.index.start_flusher()
+        atexit.register(self.index.flush)
 
+    def close(self) -> None:
+        """백그라운드 스레드 중지 후 인덱스를 flush하고 닫음 (종료 시 flush 등록도 해제)"""
+        self._stopped.set()
+        atexit.unregister(self.index.flush)
+        self._converter.shutdown(wait=False)
+        if self.fetcher is not None:
+            self.fetcher.shutdown()
+        with self._batchers_lock:
+            batchers, self.batchers = list(self.batchers.values()), {}
+        for batcher in batchers:
+            batcher.close()
+        self.index.close()
+
+    def _import_store_directory(self) -> None:
+        """인덱스 도입 전 저장된 모델 폴더를 인덱스에 등록"""
         for model_hash in os.listdir(self.store_path):
+            if model_hash.startswith('.'):
+                continue
             model_folder_path = os.path.join(self.store_path, model_hash)
             if os.path.isdir(model_folder_path):
-                self.metadata_store[model_hash] = {
+                self.index.upsert(model_hash, {
                     'file_path': model_folder_path,
                     'used': utils.get_kr_time()
-                }
+                })
+
+    def _sync_from_index(self) -> None:
+        """다른 프로세스의 변경(세대 증가)을 반영 - 업로드/재업로드된 모델은 메타데이터를 갱신하고 삭제된 모델은 잊음"""
+        with self._cleanup_lock:
+            synced_at = time.time()
+            for model_hash, generation in self.index.changes_since(self._index_synced_at - 1).items():
+                self._apply_index_change(model_hash, generation)
+            self._index_synced_at = synced_at
+
+    def _apply_index_change(self, model_hash: str, generation: int) -> None:
+        """인덱스의 모델 세대가 이 프로세스가 아는 세대와 다르면 인덱스 내용으로 갱신 (삭제된 모델은 잊음)"""
+        with self._cleanup_lock:
+            if self._generations.get(model_hash, 0) >= generation:
+                return
+            indexed = self.index.get(model_hash)
+            if indexed is None:
+                self._forget_model(model_hash, generation)
+                return
+            self._register_model(model_hash, indexed)
+            self.usage.update(model_hash, indexed['used'].timestamp())
+            self.access_stats.seed({model_hash: indexed})
+            self._set_generation(model_hash, generation)
+            self._invalidate_results(model_hash)
+
+    def _start_index_sync(self) -> None:
+        """주기적인 인덱스 동기화 스레드 시작 (클러스터의 모든 워커가 다른 워커의 삭제/재업로드를 반영)"""
+        if self.index_sync_interval <= 0:
+            return
+
+        def sync_loop():
+            while not self._stopped.wait(self.index_sync_interval):
+                try:
+                    self._sync_from_index()
+                except Exception as e:
+                    if self._stopped.is_set():
+                        return
+                    self.logger.error(f"Model index sync failed: {e}")
+
+        threading.Thread(target=sync_loop, name='model-index-sync', daemon=True).start()
+
+    @staticmethod
+    def _find_keras_file(model_folder_path: str) -> Optional[str]:
+        """.keras 파일 탐색"""
+        for root, _, files in os.walk(model_folder_path):
+            for file in files:
+                if file.endswith(".keras"):
+                    return os.path.join(root, file)
+        return None
 
     def _start_cleanup_scheduler(self):
-        """주기적인 모델 정리 스케줄러 시작"""
+        """주기적인 모델 정리 스케줄러 시작 (cleanup_interval 시간마다)"""
         def scheduled_cleanup():
             while True:
                 self.clean_old_models()
-                time.sleep(5 * 3600)  # 5시간 대기
+                if self._stopped.wait(self.cleanup_interval * 3600):
+                    return
 
-        thread = threading.Thread(target=scheduled_cleanup, daemon=True)
+        thread = threading.Thread(target=scheduled_cleanup, name='model-cleanup', daemon=True)
         thread.start()
 
     def clean_old_models(self) -> None:
-        """오래된 모델 삭제 (1주일 이상 미사용)"""
-        try:
-            to_remove = []
-            for model_hash, metadata in self.metadata_store.items():
-                if metadata['used'] < utils.one_week_ago():
-                    to_remove.append(model_hash)
-
-            for model_hash in to_remove:
-                remove_path = os.path.join(self.store_path, model_hash)
-                if os.path.exists(remove_path):
-                    shutil.rmtree(remove_path)
-                    self.logger.info(f"Removed old model: {model_hash}")
-                del self.metadata_store[model_hash]
-                
-                # 캐시에서도 제거
-                if model_hash in self.model_cache:
-                    del self.model_cache[model_hash]
-                    self.metrics.set_model_cache_usage(len(self.model_cache))
-                    
-        except Exception as e:
-            self.logger.error(f"Cleanup failed: {e}")
+        """max_idle_days 이상 미사용 모델 삭제 후 디스크 한도 적용 (만료 검사는 만료된 모델 수에 비례)"""
+        with self._cleanup_lock:
+            try:
+                # 다른 프로세스의 업로드/사용 기록은 인덱스에서 확인
+                self.index.flush()
+                self._sync_from_index()
+                cutoff = time.time() - self.max_idle_days * 86400
+                for model_hash in self.usage.pop_expired(cutoff, refresh=self.index.last_used):
+                    self._remove_model(model_hash, 'expired')
+                self.enforce_disk_quota()
+            except Exception as e:
+                self.logger.error(f"Cleanup failed: {e}")
+
+    def enforce_disk_quota(self, keep: Iterable[str] = ()) -> None:
+        """저장소 사용량이 store_max_bytes를 넘으면 가장 오래 사용되지 않은 모델부터 삭제 (keep/고정 모델 제외)
+
+        사용량과 사용 순서는 모든 워커가 공유하는 인덱스 기준이고, 파일 잠금으로 한 번에 한 프로세스만 정리한다.
+        삭제할 모델은 인덱스에서 빼고 세대를 올린 뒤(담당 워커는 동기화 때 메모리에서 버림) 폴더를 휴지통으로 옮긴다.
+        사용량은 모델 폴더만 센다. 휴지통(.trash, 백그라운드 삭제 전), 원격 다운로드(.fetch, 설치 후 삭제),
+        업로드 스테이징 폴더는 일시적이므로 한도에 포함하지 않는다.
+        """
+        if not self.store_max_bytes:
+            return
+        keep = set(keep) | self.model_cache.pinned
+        with self._cleanup_lock, self._quota_lock():
+            # 이 프로세스의 사용 기록을 먼저 반영해 방금 쓴 모델이 삭제되지 않게 함
+            self.index.flush()
+            self._fill_disk_bytes()
+            total = self.index.store_bytes()
+            if total > self.store_max_bytes:
+                for model_hash, disk_bytes in self.index.least_recently_used():
+                    if total <= self.store_max_bytes:
+                        break
+                    if model_hash in keep:
+                        continue
+                    self._remove_model(model_hash, 'quota')
+                    total -= disk_bytes
+            if total > self.store_max_bytes:
+                self.logger.warning(f"Model store uses {total} bytes, over the {self.store_max_bytes} byte quota")
+            self.metrics.set_model_store_bytes(total)
+
+    @contextmanager
+    def _quota_lock(self) -> Iterator[None]:
+        """워커 프로세스 간 디스크 한도 정리 직렬화"""
+        with open(os.path.join(self.store_path, '.quota.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _fill_disk_bytes(self) -> None:
+        """폴더 크기가 기록되지 않은 모델(디스크 한도 도입 전 등록)만 한 번 계산해 인덱스에 기록"""
+        for model_hash, file_path in self.index.missing_disk_bytes():
+            disk_bytes = directory_size(file_path)
+            self.index.set_disk_bytes(model_hash, disk_bytes)
+            if model_hash in self.metadata_store:
+                self.metadata_store[model_hash]['disk_bytes'] = disk_bytes
+
+    def _register_model(self, model_hash: str, metadata: Dict[str, Any]) -> None:
+        """metadata_store에 모델 등록"""
+        with self._cleanup_lock:
+            self.metadata_store[model_hash] = metadata
+
+    def _remove_model(self, model_hash: str, reason: str) -> None:
+        """인덱스에서 먼저 제거하고 세대를 올려 다른 워커에 알린 뒤 폴더를 휴지통으로 옮김 (실제 삭제는 백그라운드)"""
+        self.index.remove(model_hash)
+        generation = self.index.bump_generation(model_hash)
+        # 디스크 한도로 지운 모델은 원격에 남아 있으므로 접근 기록을 유지해 다시 사전 로드할 수 있게 함
+        self._forget_model(model_hash, generation, keep_stats=reason == 'quota' and self.remote_store is not None)
+        if self.trash.discard(os.path.join(self.store_path, model_hash)):
+            self.logger.info(f"Removed model ({reason}): {model_hash}")
+        self.metrics.increment_models_removed(reason)
 
-    def load_model_to_cache(self, model_hash: str) -> Optional[Any]:
-        """모델을 캐시에 로드하고 반환하는 함수 (LRU 방식)"""
-        if model_hash in self.model_cache:
-            self.model_cache.move_to_end(model_hash)
+    def _forget_model(self, model_hash: str, generation: int, keep_stats: bool = False) -> None:
+        """이 프로세스의 메타데이터/캐시/배처/예측 결과에서 모델 제거 (인덱스와 폴더는 건드리지 않음)"""
+        with self._cleanup_lock:
+            self.metadata_store.pop(model_hash, None)
+        self.usage.remove(model_hash)
+        self._set_generation(model_hash, generation)
+        self._invalidate_results(model_hash)
+        self._close_batcher(model_hash)
+        for listener in list(self.removal_listeners):
+            try:
+                listener(model_hash)
+            except Exception as e:
+                self.logger.warning(f"Removal listener failed for {model_hash}: {e}")
+        if not keep_stats:
+            self.access_stats.forget(model_hash)
+
+    def load_model_to_cache(self, model_hash: str) -> Optional[InferenceEngine]:
+        """모델을 캐시에 로드하고 추론 엔진으로 감싸 반환하는 함수 (메모리 예산 기반 축출)"""
+        engine = self.model_cache.get(model_hash)
+        if engine is not None:
             self.metrics.increment_cache_hit()
-            return self.model_cache[model_hash]
+            return engine
 
-        # 캐시 크기 초과 시 가장 오래된 모델 제거
-        if len(self.model_cache) >= self.max_cache_size:
-            self.model_cache.popitem(last=False)
+        with tracing.stage('load'):
+            return self._load_single_flight(model_hash)
 
-        if model_hash not in self.metadata_store:
+    def _load_single_flight(self, model_hash: str) -> InferenceEngine:
+        """같은 해시의 로드가 진행 중이면 그 결과를 기다림 (single-flight)"""
+        with self._inflight_lock:
+            engine = self.model_cache.get(model_hash)
+            if engine is not None:
+                self.metrics.increment_cache_hit()
+                return engine
+            future = self._inflight.get(model_hash)
+            is_loader = future is None
+            if is_loader:
+                future = Future()
+                self._inflight[model_hash] = future
+
+        if not is_loader:
+            self.metrics.increment_model_load_wait()
+            return future.result()
+
+        try:
+            engine = self._load_model(model_hash)
+            future.set_result(engine)
+            return engine
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                # 로드 중 세대가 바뀌었으면 새 로드가 이미 등록되어 있을 수 있음
+                if self._inflight.get(model_hash) is future:
+                    del self._inflight[model_hash]
+
+    def _bump_generation(self, model_hash: str) -> None:
+        """인덱스의 모델 세대를 올리고 캐시된 엔진/입력 시그니처를 버림 (다른 워커는 인덱스 동기화 때 반영)"""
+        self._set_generation(model_hash, self.index.bump_generation(model_hash))
+
+    def _set_generation(self, model_hash: str, generation: int) -> None:
+        """세대를 기록하고 캐시된 엔진/입력 시그니처를 버림 (진행 중인 로드는 결과를 캐시에 넣지 않음)"""
+        with self._inflight_lock:
+            self._generations[model_hash] = max(self._generations.get(model_hash, 0), generation)
+            # 이전 모델을 로드 중인 호출에 이후 요청이 합류하지 않도록 분리
+            self._inflight.pop(model_hash, None)
+            self._input_specs.pop(model_hash, None)
+            self.model_cache.pop(model_hash)
+
+    def _load_model(self, model_hash: str) -> InferenceEngine:
+        """디스크에서 모델을 로드해 캐시에 추가 (해시당 하나의 스레드만 실행)"""
+        with self._inflight_lock:
+            generation = self._generations.get(model_hash, 0)
+        if not self.ensure_local(model_hash):
             raise KeyError(f"Model hash {model_hash} not found")
 
-        model_folder_path = self.metadata_store[model_hash]['file_path']
-        keras_file_path = None
-        
-        # .keras 파일 탐색
-        for root, _, files in os.walk(model_folder_path):
-            for file in files:
-                if file.endswith(".keras"):
-                    keras_file_path = os.path.join(root, file)
-                    break
-            if keras_file_path: break
+        metadata = self.metadata_store[model_hash]
+        keras_file_path = metadata.get('keras_path')
 
-        if not keras_file_path:
-            raise OSError("No .keras file found")
+        # 인덱스에 경로가 없거나 유효하지 않을 때만 .keras 파일 탐색
+        if not keras_file_path or not os.path.exists(keras_file_path):
+            keras_file_path = self._find_keras_file(metadata['file_path'])
+            if not keras_file_path:
+                if self.index.get(model_hash) is None:
+                    # 다른 워커가 삭제했고 아직 동기화 전인 모델
+                    self._forget_model(model_hash, self.index.generation(model_hash))
+                    raise KeyError(f"Model hash {model_hash} not found")
+                raise OSError("No .keras file found")
+            metadata['keras_path'] = keras_file_path
+            self.index.set_keras_path(model_hash, keras_file_path)
 
-        model = tf.keras.models.load_model(keras_file_path)
-        self.model_cache[model_hash] = model
+        # 로드 전후 RSS 변화와 파라미터 크기로 모델 메모리 추정
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+        start = time.perf_counter()
+        engine, size_bytes = self._load_backend(model_hash, metadata)
+        if engine is None:
+            model = get_tf().keras.models.load_model(keras_file_path)
+            size_bytes = estimate_model_bytes(model)
+            engine = InferenceEngine(
+                model,
+                enabled=self.fast_path and self.metadata_store[model_hash].get('fast_path', True),
+            )
+        load_time = time.perf_counter() - start
+        size_bytes = max(size_bytes, process.memory_info().rss - rss_before)
+        spec = spec_from_engine(engine)
+
+        # 로드 중 재업로드/정리된 모델은 캐시에 넣지 않음 (세대 확인과 추가를 같은 락 안에서)
+        with self._inflight_lock:
+            current = self._generations.get(model_hash, 0) == generation and model_hash in self.metadata_store
+            if current:
+                self._input_specs[model_hash] = spec
+                self.model_cache.put(model_hash, engine, size_bytes=size_bytes, load_time=load_time)
         self.metrics.increment_cache_miss()
-        self.metrics.set_model_cache_usage(len(self.model_cache))
-        return model
 
-    def predict(self, model_hash: str, data: np.ndarray) -> Tuple[np.ndarray, int]:
-        """예측 수행 함수"""
+        if model_hash not in self.metadata_store:
+            raise KeyError(f"Model hash {model_hash} not found")
+        if current:
+            self._remember_input_spec(model_hash, metadata, spec)
+        # 재업로드 전에 시작한 요청은 이전 모델로 응답하고, 이후 요청은 새 모델을 로드
+        return engine
+
+    def _remember_input_spec(self, model_hash: str, metadata: Dict[str, Any], spec: Optional[InputSpec]) -> None:
+        """로드한 모델의 입력 시그니처를 인덱스에 기록 (다음 시작 시 로드 전에 검증 가능)"""
+        value = spec.to_dict() if spec else None
+        if metadata.get('input_spec', False) != value:
+            metadata['input_spec'] = value
+            self.index.set_options(model_hash, metadata)
+
+    def known_input_spec(self, model_hash: str) -> Tuple[bool, Optional[InputSpec]]:
+        """(시그니처를 아는지, 시그니처) - 모델을 로드하지 않고 확인"""
+        if model_hash in self._input_specs:
+            return True, self._input_specs[model_hash]
+        if not self.ensure_local(model_hash):
+            raise KeyError(f"Model hash {model_hash} not found")
+        metadata = self.metadata_store[model_hash]
+        if 'input_spec' not in metadata:
+            return False, None
+        spec = InputSpec.from_dict(metadata['input_spec'])
+        self._input_specs[model_hash] = spec
+        return True, spec
+
+    def prepare_input(self, model_hash: str, data: Any) -> np.ndarray:
+        """요청 데이터를 모델 입력 시그니처로 검증하고 네이티브 dtype 배열로 변환 (불일치 시 InvalidInputError)"""
+        known, spec = self.known_input_spec(model_hash)
+        with tracing.stage('convert'):
+            if spec is not None:
+                return spec.coerce(data)
+            array = data if isinstance(data, np.ndarray) else as_array(data)
+        if known:
+            return array
+        # 처음 보는 모델은 로드해서 시그니처를 얻은 뒤 검증
+        self.load_model_to_cache(model_hash)
+        spec = self._input_specs.get(model_hash)
+        return spec.coerce(array) if spec else array
+
+    def ensure_local(self, model_hash: str) -> bool:
+        """모델이 로컬 디스크에 있는지 확인 (없으면 다른 워커가 설치했거나 원격 저장소에 있는 모델을 가져옴)"""
+        if model_hash in self.metadata_store:
+            return True
+        if not model_upload.is_valid_hash(model_hash):
+            return False
+        indexed = self.index.get(model_hash)
+        if indexed is not None and os.path.exists(indexed['file_path']):
+            # 다른 워커가 업로드했고 아직 동기화 전인 모델
+            with self._cleanup_lock:
+                if model_hash not in self.metadata_store:
+                    self._register_model(model_hash, indexed)
+                    self.usage.update(model_hash, indexed['used'].timestamp())
+            return True
+        if self.fetcher is None:
+            return False
+        retry_at = self._remote_misses.get(model_hash)
+        if retry_at is not None:
+            if time.monotonic() < retry_at:
+                return False
+            self._remote_misses.pop(model_hash, None)
+        metadata = self.fetcher.fetch(
+            model_hash,
+            install=lambda archive_path, remote: self._install_remote(model_hash, archive_path, remote),
+            installed=lambda: self.index.get(model_hash),
+        )
+        if metadata is None:
+            self._remember_remote_miss(model_hash)
+            return False
+        if model_hash not in self.metadata_store:
+            self._register_model(model_hash, metadata)
+            self.usage.update(model_hash, metadata['used'].timestamp())
+            self.enforce_disk_quota(keep=(model_hash,))
+        return True
+
+    def _remember_remote_miss(self, model_hash: str) -> None:
+        """원격에도 없는 해시를 remote_miss_ttl초 동안 기억 (기록이 쌓이면 만료된 항목 정리)"""
+        if self.remote_miss_ttl <= 0:
+            return
+        now = time.monotonic()
+        if len(self._remote_misses) >= 1024:
+            for missed, retry_at in list(self._remote_misses.items()):
+                if retry_at <= now:
+                    self._remote_misses.pop(missed, None)
+        self._remote_misses[model_hash] = now + self.remote_miss_ttl
+
+    def _install_remote(self, model_hash: str, archive_path: str, remote: Dict[str, Any]) -> Dict[str, Any]:
+        """원격에서 받은 zip을 업로드와 같은 방식으로 설치하고 인덱스에 등록"""
+        with open(archive_path, 'rb') as archive:
+            staged = model_upload.extract_to_staging(archive, self.staging_path, model_hash)
+        model_folder_path = os.path.join(self.store_path, model_hash)
+        with self._install_lock(model_hash):
+            self._install(staged, model_folder_path)
+
+        now = utils.get_kr_time()
+        metadata = {
+            **{key: value for key, value in remote.items() if key not in ('uploaded', 'archive')},
+            'file_path': model_folder_path,
+            'keras_path': self._find_keras_file(model_folder_path),
+            'uploaded': utils.from_timestamp(remote['uploaded']) if 'uploaded' in remote else now,
+            'used': now,
+            'hits': 0,
+            'disk_bytes': directory_size(model_folder_path),
+        }
+        self.index.upsert(model_hash, metadata)
+        return metadata
+
+    def _install_lock(self, model_hash: str) -> threading.Lock:
+        return self._install_locks[hash(model_hash) % len(self._install_locks)]
+
+    def _install(self, staged: str, model_folder_path: str) -> None:
+        """스테이징 폴더를 모델 경로에 원자적으로 설치하고 교체된 이전 버전은 휴지통으로"""
+        previous = model_upload.install_staged(staged, model_folder_path)
+        if previous:
+            self.trash.discard(previous, self.store_path)
+
+    def _publish(self, model_hash: str, metadata: Dict[str, Any]) -> None:
+        """업로드한 모델을 원격 저장소에 기록 (실패해도 로컬 업로드는 유지)"""
+        remote = option_values(metadata)
+        remote.pop('disk_bytes', None)
+        remote.pop('conversion', None)
+        remote.update(size=metadata['size'], uploaded=metadata['uploaded'].timestamp())
         try:
-            model = self.load_model_to_cache(model_hash)
-            self.metadata_store[model_hash]['used'] = utils.get_kr_time()
-            prediction = model.predict(data)
-            return prediction, 200
+            self.remote_store.publish(model_hash, metadata['file_path'], remote, tmp_dir=self.staging_path)
+        except Exception as e:
+            self.metrics.increment_model_remote_publish_error()
+            self.logger.error(f"Publishing model {model_hash} to the remote store failed: {e}")
+
+    def active_backend(self, model_hash: str) -> str:
+        """사용할 백엔드 (수동 지정 > 업로드 시 선택 > keras)"""
+        metadata = self.metadata_store[model_hash]
+        return metadata.get('backend_override') or metadata.get('backend') or backends.DEFAULT_BACKEND
+
+    def _load_backend(self, model_hash: str, metadata: Dict[str, Any]) -> Tuple[Optional[Any], int]:
+        """변환된 백엔드로 로드해 (실행기, 파일 크기) 반환 (keras이거나 로드 실패 시 Keras로 대체)"""
+        name = self.active_backend(model_hash)
+        if name == backends.DEFAULT_BACKEND:
+            return None, 0
+        try:
+            path = os.path.join(metadata['file_path'], metadata['backends'][name]['file'])
+            runner = backends.load_backend(name, path, shared_weights=metadata.get('mmap', False))
+            return runner, os.path.getsize(path)
+        except Exception as e:
+            self.logger.warning(f"Backend {name} failed to load for {model_hash}, falling back to keras: {e}")
+            return None, 0
+
+    def _touch(self, model_hash: str) -> None:
+        """사용 시각/적중 수 갱신 (인덱스에는 주기적으로 일괄 기록)"""
+        metadata = self.metadata_store[model_hash]
+        metadata['used'] = utils.get_kr_time()
+        metadata['hits'] = metadata.get('hits', 0) + 1
+        self.index.touch(model_hash, hour=metadata['used'].hour)
+        self.usage.update(model_hash, time.time())
+        self.access_stats.record(model_hash)
+
+    def _get_batcher(self, model_hash: str) -> MicroBatcher:
+        """모델별 마이크로 배처 반환 (없으면 생성)"""
+        with self._batchers_lock:
+            batcher = self.batchers.get(model_hash)
+            if batcher is None:
+                batcher = MicroBatcher(
+                    model_hash,
+                    lambda batch: self._run_inference(model_hash, batch),
+                    max_batch_size=self.max_batch_size,
+                    max_wait_ms=self.max_batch_wait_ms,
+                )
+                self.batchers[model_hash] = batcher
+            return batcher
+
+    def _close_batcher(self, model_hash: str) -> None:
+        with self._batchers_lock:
+            batcher = self.batchers.pop(model_hash, None)
+        if batcher:
+            batcher.close()
+
+    def _run_inference(self, model_hash: str, data: np.ndarray,
+                       engine: Optional[InferenceEngine] = None) -> np.ndarray:
+        """캐시된 모델로 단일 forward pass 수행 (engine이 없으면 캐시에서 로드)"""
+        if engine is None:
+            engine = self.load_model_to_cache(model_hash)
+        with tracing.stage('inference'):
+            return engine.predict(data)
+
+    def _invalidate_results(self, model_hash: str) -> None:
+        if self.result_cache is not None:
+            self.result_cache.invalidate(model_hash)
+
+    def _predict_uncached(self, model_hash: str, data: np.ndarray) -> Any:
+        """모델 추론 (배칭 활성화 시 마이크로 배처가 배치마다 엔진을 로드, 아니면 여기서 한 번 로드)"""
+        if self.batching:
+            # 배치 대기 + forward pass는 배처 스레드에서 실행되므로 합쳐서 기록
+            with tracing.stage('batch'):
+                return self._get_batcher(model_hash).submit(data)
+        return self._run_inference(model_hash, data, self.load_model_to_cache(model_hash))
+
+    def predict(self, model_hash: str, data: Any) -> Tuple[np.ndarray, int]:
+        """예측 수행 함수 (입력 검증/변환 후 결과 캐시에서 누락된 행만 추론)"""
+        try:
+            data = self.prepare_input(model_hash, data)
+            cacheable = (self.result_cache is not None and data.ndim > 0
+                         and data.shape[0] > 0 and data.dtype != object)
+            if not cacheable:
+                self._touch(model_hash)
+                return self._predict_uncached(model_hash, data), 200
+
+            with tracing.stage('result_cache'):
+                # 다른 프로세스의 재업로드/삭제는 인덱스의 모델 세대로 확인 (다음 동기화를 기다리지 않음)
+                model_generation = self.index.generation(model_hash)
+                self._apply_index_change(model_hash, model_generation)
+                if model_hash not in self.metadata_store:
+                    raise KeyError(f"Model hash {model_hash} not found")
+                # 추론 중 무효화(재업로드/정리)되면 이전 모델의 결과를 저장하지 않도록 조회 전 세대를 기록
+                generation = self.result_cache.generation(model_hash)
+                keys, rows, missing = self.result_cache.lookup(model_hash, data, model_generation)
+            self._touch(model_hash)
+            if not missing:
+                return stack_rows(rows), 200
+
+            subset = data if len(missing) == len(keys) else data[missing]
+            prediction = self._predict_uncached(model_hash, subset)
+            if isinstance(prediction, dict):
+                # 이름 붙은 다중 출력은 행 단위로 나누지 않고 캐시하지 않음
+                if len(missing) == len(keys):
+                    return prediction, 200
+                return self._predict_uncached(model_hash, data), 200
+            computed = split_rows(prediction, len(missing))
+            self.result_cache.store([keys[i] for i in missing], computed, generation, model_generation)
+            if len(missing) == len(keys):
+                return prediction, 200
+
+            for i, row in zip(missing, computed):
+                rows[i] = row
+            return stack_rows(rows), 200
         except Exception as e:
             self.logger.error(f"Prediction failed: {e}")
             raise
 
-    def upload_model(self, model_file, model_hash: str) -> Tuple[str, int]:
-        """모델 업로드 및 저장 (Zip 해제)"""
-        if not model_hash or len(model_hash) < 8:
-             raise ValueError("Invalid model hash")
-             
-        model_folder_path = os.path.join(self.store_path, model_hash)
-        os.makedirs(model_folder_path, exist_ok=True)
-        temp_zip_path = os.path.join(model_folder_path, 'temp.zip')
-        model_file.save(temp_zip_path)
+    def upload_model(self, model_file, model_hash: str, fast_path: bool = True,
+                     convert: Optional[Iterable[str]] = None, backend: Optional[str] = None,
+                     mmap: Optional[bool] = None) -> Tuple[str, int]:
+        """모델 업로드 및 저장 (스트리밍 해시 검증 -> 스테이징 해제 -> 버전 폴더 링크 교체로 설치)
+
+        백엔드 변환/검증은 설치 후 백그라운드에서 실행하며, 끝나기 전까지는 Keras로 추론한다.
+        """
+        if not model_upload.is_valid_hash(model_hash):
+            raise ValueError("Invalid model hash")
+        convert = self.convert_backends if convert is None else [name for name in convert if name != backends.DEFAULT_BACKEND]
+        mmap = self.mmap_weights if mmap is None else mmap
+        # mmap 공유 가중치는 TFLite flatbuffer로 저장
+        if mmap and 'tflite' not in convert:
+            convert = list(convert) + ['tflite']
+        for name in list(convert) + ([backend] if backend else []):
+            if name not in backends.BACKENDS:
+                raise ValueError(f"Unknown backend: {name}")
+        # 수동 지정 백엔드는 변환 대상이어야 함 (검증 결과는 변환이 끝난 뒤 적용)
+        if backend and backend != backends.DEFAULT_BACKEND and backend not in convert:
+            raise ValueError(f"Backend {backend} is not validated for this model (add it to convert)")
 
+        algorithm = model_upload.digest_algorithm(model_hash)
+        if not algorithm and self.require_digest:
+            raise ValueError("Model hash must be a hex digest (md5/sha1/sha256/sha512)")
+
+        os.makedirs(self.staging_path, exist_ok=True)
+        stream = getattr(model_file, 'stream', model_file)
+        archive, digest, size = model_upload.spool_and_hash(
+            stream, algorithm or 'sha256', self.max_upload_size,
+            self.staging_path, self.upload_spool_memory,
+        )
         try:
-            with ZipFile(temp_zip_path, 'r') as zip_ref:
-                if not any(name.endswith('.keras') for name in zip_ref.namelist()):
-                    raise ValueError("No .keras file in zip")
-                zip_ref.extractall(model_folder_path)
-        except BadZipFile:
-            raise ValueError("Invalid zip file")
+            if algorithm and digest != model_hash.lower():
+                raise model_upload.HashMismatchError(f"Hash mismatch: declared {model_hash}, got {digest}")
+            staged = model_upload.extract_to_staging(archive, self.staging_path, model_hash)
         finally:
-            if os.path.exists(temp_zip_path):
-                os.remove(temp_zip_path)
+            archive.close()
 
-        self.metadata_store[model_hash] = {
+        staged_keras = self._find_keras_file(staged)
+        model_folder_path = os.path.join(self.store_path, model_hash)
+        now = utils.get_kr_time()
+        metadata = {
             'file_path': model_folder_path,
-            'used': utils.get_kr_time()
+            'keras_path': os.path.join(model_folder_path, os.path.relpath(staged_keras, staged)) if staged_keras else None,
+            'size': size,
+            'uploaded': now,
+            'used': now,
+            'hits': 0,
+            'fast_path': fast_path,
+            'disk_bytes': directory_size(staged),
         }
+        if backend == backends.DEFAULT_BACKEND:
+            metadata['backend_override'] = backend
+        if convert and staged_keras:
+            # 변환이 끝나면 결과를 적용할 요청 내용 (재시작 시 정리 담당 프로세스가 다시 실행)
+            metadata['conversion'] = {'status': 'pending', 'backends': list(convert), 'backend': backend, 'mmap': mmap}
+
+        # 같은 해시의 동시 업로드는 설치부터 메타데이터 등록까지 차례로 (마지막 설치가 링크와 인덱스 모두에 반영)
+        with self._install_lock(model_hash):
+            self._install(staged, model_folder_path)
+            self.index.upsert(model_hash, metadata)
+            self._register_model(model_hash, metadata)
+            # 재업로드 시 이전 모델 캐시/예측 결과 무효화
+            self.usage.update(model_hash, now.timestamp())
+            self._bump_generation(model_hash)
+            self._invalidate_results(model_hash)
+            if 'conversion' in metadata:
+                self._converter.submit(self._convert_backends, model_hash, os.path.realpath(model_folder_path))
+        if self.remote_store is not None:
+            self._publish(model_hash, metadata)
+        # 새 모델은 남기고 디스크 한도 초과분 정리
+        self.enforce_disk_quota(keep=(model_hash,))
         return 'Model uploaded successfully', 200
 
-    def get_model_info(self, model_hash: str) -> Dict[str, str]:
-        """모델 정보 반환"""
+    def _resume_conversions(self) -> None:
+        """이전 프로세스가 끝내지 못한 백엔드 변환 다시 실행"""
+        for model_hash, metadata in list(self.metadata_store.items()):
+            if (metadata.get('conversion') or {}).get('status') == 'pending':
+                self._converter.submit(self._convert_backends, model_hash, os.path.realpath(metadata['file_path']))
+
+    def _convert_backends(self, model_hash: str, version_path: str) -> None:
+        """설치된 버전 폴더에서 백엔드 변환/검증 후 선택한 백엔드를 인덱스에 기록 (그사이 재업로드/삭제되면 결과 버림)"""
+        metadata = self.metadata_store.get(model_hash)
+        if metadata is None:
+            return
+        request = metadata['conversion']
+        keras_path = self._find_keras_file(version_path)
+        if keras_path is None:
+            return
+        report = backends.run_conversion(keras_path, version_path, request['backends'], self.convert_timeout)
+
+        with self._install_lock(model_hash):
+            metadata = self.metadata_store.get(model_hash)
+            if (metadata is None or os.path.realpath(metadata['file_path']) != version_path
+                    or self.index.get(model_hash) is None):
+                self.logger.info(f"Discarding backend conversion of replaced model {model_hash}")
+                return
+            status: Dict[str, Any] = {'status': 'done'}
+            metadata['backends'] = report
+            metadata['backend'] = backends.select_backend(report)
+            if request.get('mmap'):
+                if report.get('tflite', {}).get('validated'):
+                    # 지연 시간보다 워커 간 메모리 공유를 우선
+                    metadata['backend'] = 'tflite'
+                    metadata['mmap'] = True
+                else:
+                    self.logger.warning(f"Model {model_hash} could not be converted to TFLite; weights are not shared")
+            if request.get('backend'):
+                # 수동 지정 백엔드는 set_backend와 같은 기준으로 검증 (실패 시 자동 선택 유지)
+                try:
+                    self._check_backend(request['backend'], report, version_path)
+                    metadata['backend_override'] = request['backend']
+                except ValueError as e:
+                    status['error'] = str(e)
+                    self.logger.warning(f"Model {model_hash}: {e}")
+            metadata['conversion'] = status
+            self.index.set_options(model_hash, metadata)
+            # 다음 요청부터 (다른 워커는 동기화 후) 선택된 백엔드로 로드
+            self._bump_generation(model_hash)
+            self._invalidate_results(model_hash)
+        if self.remote_store is not None:
+            self._publish(model_hash, metadata)
+
+    @staticmethod
+    def _check_backend(backend: Optional[str], report: Optional[Dict[str, Any]], folder: str) -> None:
+        """수동 지정 백엔드가 변환 보고서에서 검증되었고 파일이 있는지 확인 (아니면 ValueError)"""
+        if not backend or backend == backends.DEFAULT_BACKEND:
+            return
+        result = (report or {}).get(backend)
+        if not result or not result.get('validated'):
+            raise ValueError(f"Backend {backend} is not validated for this model")
+        if not os.path.exists(os.path.join(folder, result['file'])):
+            raise ValueError(f"Backend {backend} file is missing")
+
+    def set_backend(self, model_hash: str, backend: Optional[str]) -> str:
+        """모델의 백엔드를 수동 지정 (None이면 업로드 시 선택된 백엔드로 복귀), 적용될 백엔드 반환"""
         if model_hash not in self.metadata_store:
             raise KeyError(f"Model {model_hash} not found")
-        return self.metadata_store[model_hash]
\ No newline at end of file
+        metadata = self.metadata_store[model_hash]
+        self._check_backend(backend, metadata.get('backends'), metadata['file_path'])
+        if backend:
+            metadata['backend_override'] = backend
+        else:
+            metadata.pop('backend_override', None)
+        self.index.upsert(model_hash, metadata)
+        # 다음 요청부터 새 백엔드로 로드
+        self._bump_generation(model_hash)
+        self._invalidate_results(model_hash)
+        return self.active_backend(model_hash)
+
+    def update_memory_metrics(self) -> None:
+        """캐시된 모델별 resident/shared 메모리 메트릭 갱신 (mmap 모델은 /proc smaps 기준)"""
+        entries = self.model_cache.entries()
+        mapped = {}
+        if any(getattr(engine, 'mapped_path', None) for _, engine, _ in entries):
+            mapped = {region.path: region for region in psutil.Process().memory_maps()}
+
+        current = set()
+        for model_hash, engine, size_bytes in entries:
+            region = mapped.get(getattr(engine, 'mapped_path', None))
+            if region is not None:
+                self.metrics.set_model_memory_bytes(model_hash, region.rss, region.shared_clean + region.shared_dirty)
+            else:
+                self.metrics.set_model_memory_bytes(model_hash, size_bytes, 0)
+            current.add(model_hash)
+        for model_hash in self._memory_labels - current:
+            self.metrics.remove_model_memory_bytes(model_hash)
+        self._memory_labels = current
+
+    def get_model_info(self, model_hash: str) -> Dict[str, str]:
+        """모델 정보 반환 (tier: memory / disk / remote - 원격에만 있는 모델은 가져오지 않고 원격 메타데이터 반환)"""
+        if model_hash not in self.metadata_store:
+            remote = None
+            if self.remote_store is not None and model_upload.is_valid_hash(model_hash):
+                remote = self.remote_store.read_metadata(model_hash)
+            if remote is None:
+                raise KeyError(f"Model {model_hash} not found")
+            remote.pop('archive', None)
+            return {
+                **remote,
+                'uploaded': utils.from_timestamp(remote['uploaded']) if 'uploaded' in remote else None,
+                'input_spec': remote.get('input_spec'),
+                'active_backend': remote.get('backend_override') or remote.get('backend') or backends.DEFAULT_BACKEND,
+                'tier': 'remote',
+            }
+        # input_spec은 첫 로드 전까지 None
+        return {
+            **self.metadata_store[model_hash],
+            'input_spec': self.metadata_store[model_hash].get('input_spec'),
+            'active_backend': self.active_backend(model_hash),
+            'tier': 'memory' if model_hash in self.model_cache else 'disk',
+        }
\ No newline at end of file
@@ -0,0 +1,161 @@
+#core/multi_predict
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.common.metrics import get_metrics
+from src.core.input_spec import InvalidInputError, as_array
+
+ENSEMBLE_METHODS = ('mean', 'vote')
+
+class MultiModelPredictor:
+    """같은 입력을 여러 모델로 예측 (A/B 변형, 앙상블)
+
+    입력은 요청당 한 번만 변환하고(네이티브 dtype이 같은 모델끼리는 배열 공유),
+    모델별 예측은 크기가 고정된 스레드 풀에서 병렬로 실행한다.
+    모델별 제한 시간을 넘긴 모델은 504로 표시하고 나머지 결과만으로 응답한다.
+    제한 시간을 넘긴 추론이 아직 풀 스레드에서 실행 중인 모델은 끝날 때까지 새 작업을 넣지 않고 503으로 응답한다
+    (느린 모델이 풀을 모두 차지해 다른 모델까지 막지 않도록).
+    """
+
+    def __init__(self, model_manager, workers: int = 4, max_models: int = 16, timeout_ms: float = 0):
+        self.model_manager = model_manager
+        self.max_models = max_models
+        self.timeout_ms = timeout_ms
+        self.metrics = get_metrics()
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='multi-predict')
+        # 제한 시간을 넘긴 뒤에도 실행 중인 모델별 작업
+        self._overdue: Dict[str, Future] = {}
+        self._overdue_lock = threading.Lock()
+
+    def _mark_overdue(self, model_hash: str, future: Future) -> None:
+        """실행 중에 제한 시간을 넘긴 작업 기록 (작업이 끝나면 자동 해제)"""
+        def release(done: Future) -> None:
+            with self._overdue_lock:
+                if self._overdue.get(model_hash) is done:
+                    del self._overdue[model_hash]
+
+        with self._overdue_lock:
+            self._overdue[model_hash] = future
+        future.add_done_callback(release)
+
+    def _submit(self, model_hash: str, array: np.ndarray) -> Optional[Future]:
+        """모델 예측을 풀에 제출 (제한 시간을 넘긴 작업이 아직 실행 중인 모델은 None)"""
+        with self._overdue_lock:
+            if model_hash in self._overdue:
+                return None
+        return self._executor.submit(self.model_manager.predict, model_hash, array)
+
+    def _convert_once(self, model_hashes: List[str], data: Any, results: Dict[str, Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """모델별 입력 준비 (dtype별로 한 번만 변환, 시그니처 불일치/없는 모델은 results에 오류 기록)"""
+        inputs: Dict[str, np.ndarray] = {}
+        by_dtype: Dict[np.dtype, np.ndarray] = {}
+        generic = data if isinstance(data, np.ndarray) else None
+        for model_hash in model_hashes:
+            try:
+                _, spec = self.model_manager.known_input_spec(model_hash)
+                if spec is None:
+                    # 시그니처를 모르는 모델은 ModelManager.predict에서 로드 후 검증
+                    if generic is None:
+                        generic = as_array(data)
+                    inputs[model_hash] = generic
+                elif spec.dtype in by_dtype:
+                    inputs[model_hash] = spec.coerce(by_dtype[spec.dtype])
+                else:
+                    inputs[model_hash] = by_dtype[spec.dtype] = spec.coerce(data)
+            except KeyError:
+                results[model_hash] = {'status': 404, 'error': 'Model not found'}
+            except InvalidInputError as e:
+                results[model_hash] = {'status': 400, 'error': str(e)}
+        return inputs
+
+    def predict(self, model_hashes: List[str], data: Any, ensemble: Optional[str] = None,
+                timeout_ms: Optional[float] = None) -> Dict[str, Any]:
+        """모델별 결과({status, prediction | error})와 선택적 앙상블 결과 반환"""
+        model_hashes = list(dict.fromkeys(model_hashes))
+        if not model_hashes:
+            raise ValueError('At least one model hash is required')
+        if len(model_hashes) > self.max_models:
+            raise ValueError(f'At most {self.max_models} models per request')
+        if ensemble and ensemble not in ENSEMBLE_METHODS:
+            raise ValueError(f'Unknown ensemble method: {ensemble}')
+        timeout_ms = self.timeout_ms if timeout_ms is None else timeout_ms
+
+        results: Dict[str, Dict[str, Any]] = {}
+        inputs = self._convert_once(model_hashes, data, results)
+        start = time.monotonic()
+        futures = {}
+        for model_hash, array in inputs.items():
+            future = self._submit(model_hash, array)
+            if future is None:
+                self.metrics.increment_error_count('predict_multi_busy')
+                results[model_hash] = {'status': 503, 'error': 'Model is still running a timed-out request'}
+            else:
+                futures[model_hash] = future
+        for model_hash, future in futures.items():
+            # 제한 시간은 모델별이지만 모두 요청 시작 시점부터 계산 (병렬 실행)
+            remaining = max(timeout_ms / 1000 - (time.monotonic() - start), 0) if timeout_ms else None
+            try:
+                prediction, _ = future.result(timeout=remaining)
+                results[model_hash] = {'status': 200, 'prediction': prediction}
+                self.metrics.increment_predictions_completed()
+            except FutureTimeoutError:
+                # 아직 시작하지 않았으면 취소 (실행 중인 추론은 끝까지 돌고 결과는 버림)
+                if not future.cancel():
+                    self._mark_overdue(model_hash, future)
+                self.metrics.increment_error_count('predict_multi_timeout')
+                results[model_hash] = {'status': 504, 'error': f'Model did not respond within {timeout_ms:g}ms'}
+            except KeyError:
+                results[model_hash] = {'status': 404, 'error': 'Model not found'}
+            except InvalidInputError as e:
+                results[model_hash] = {'status': 400, 'error': str(e)}
+            except Exception as e:
+                self.metrics.increment_error_count('predict_multi_error')
+                self.logger.error(f"Prediction failed for {model_hash}: {e}")
+                results[model_hash] = {'status': 500, 'error': 'Internal error during prediction'}
+
+        response: Dict[str, Any] = {'results': {model_hash: results[model_hash] for model_hash in model_hashes}}
+        if ensemble:
+            response['ensemble'] = ensemble_result(ensemble, results, model_hashes)
+        return response
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+def ensemble_result(method: str, results: Dict[str, Dict[str, Any]], model_hashes: List[str]) -> Dict[str, Any]:
+    """모델별 결과 중 성공한 예측만 결합한 앙상블 항목 (클러스터 라우터도 워커별 결과를 합친 뒤 사용)"""
+    succeeded = [model_hash for model_hash in model_hashes if results[model_hash]['status'] == 200]
+    if not succeeded:
+        return {'method': method, 'models': [], 'error': 'No model returned a prediction'}
+    try:
+        prediction = ensemble([results[model_hash]['prediction'] for model_hash in succeeded], method)
+    except ValueError as e:
+        return {'method': method, 'models': succeeded, 'error': str(e)}
+    return {'method': method, 'models': succeeded, 'prediction': prediction}
+
+def ensemble(predictions: List[Any], method: str) -> np.ndarray:
+    """예측 결과 결합 (mean: 평균, vote: 행별 예측 클래스 다수결 - 동률이면 작은 클래스)"""
+    try:
+        arrays = [np.asarray(prediction, dtype=np.float64) for prediction in predictions]
+    except (TypeError, ValueError):
+        raise ValueError('Ensembling requires single-output numeric predictions')
+    if len({array.shape for array in arrays}) != 1 or arrays[0].ndim == 0:
+        raise ValueError('Ensembling requires predictions of the same shape')
+
+    if method == 'mean':
+        return np.mean(arrays, axis=0)
+    if method == 'vote':
+        # 다중 클래스는 argmax, 출력이 하나면 0.5 기준 이진 분류로 간주
+        labels = np.stack([
+            (array.reshape(array.shape[0], -1)[:, 0] > 0.5).astype(np.int64)
+            if array.ndim == 1 or array.shape[-1] == 1 else array.argmax(axis=-1)
+            for array in arrays
+        ])
+        counts = np.stack([(labels == label).sum(axis=0) for label in range(int(labels.max()) + 1)])
+        return counts.argmax(axis=0)
+    raise ValueError(f'Unknown ensemble method: {method}')
@@ -0,0 +1,150 @@
+#core/prefetch
+import logging
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from src.common import utils
+from src.common.metrics import get_metrics
+
+HOURS = 24
+
+class AccessStats:
+    """모델별 접근 빈도(지수 감쇠)와 시간대별 접근 분포
+
+    빈도는 half_life 초마다 절반으로 줄어드는 점수로, 시간대 분포는 한국 시간 기준
+    24개 구간의 접근 수로 기록한다. 점수 = 빈도 x (해당 시간대 접근 비율 / 균등 분포 비율).
+    """
+
+    def __init__(self, half_life: float = 86400):
+        self.half_life = half_life
+        # 해시 -> [감쇠 점수, 점수 기준 시각, 시간대별 접근 수 x 24]
+        self._stats: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, model_hash: str) -> bool:
+        return model_hash in self._stats
+
+    def _decayed(self, entry: list, now: float) -> float:
+        return entry[0] * math.pow(0.5, max(now - entry[1], 0) / self.half_life)
+
+    def record(self, model_hash: str, when: Optional[float] = None, count: int = 1) -> None:
+        """접근 기록 (when = epoch 초, 기본값 현재)"""
+        now = time.time() if when is None else when
+        hour = utils.from_timestamp(now).hour
+        with self._lock:
+            entry = self._stats.get(model_hash)
+            if entry is None:
+                entry = self._stats[model_hash] = [0.0, now, [0] * HOURS]
+            # 과거 시각의 기록(seed)은 현재 기준으로 감쇠해 더함
+            if now >= entry[1]:
+                entry[0] = self._decayed(entry, now) + count
+                entry[1] = now
+            else:
+                entry[0] += count * math.pow(0.5, (entry[1] - now) / self.half_life)
+            entry[2][hour] += count
+
+    def seed(self, metadata_store: Dict[str, Dict], access_hours: Optional[Dict[str, List[int]]] = None) -> None:
+        """재시작 후 metadata_store의 마지막 사용 시각/적중 수와 인덱스에 기록된 시간대별 접근 수로 초기화"""
+        access_hours = access_hours or {}
+        for model_hash, metadata in list(metadata_store.items()):
+            used = metadata.get('used')
+            if model_hash in self._stats or not hasattr(used, 'timestamp'):
+                continue
+            self.record(model_hash, used.timestamp(), max(metadata.get('hits', 0), 1))
+            hours = access_hours.get(model_hash)
+            if hours and len(hours) == HOURS:
+                with self._lock:
+                    self._stats[model_hash][2] = list(hours)
+
+    def forget(self, model_hash: str) -> None:
+        with self._lock:
+            self._stats.pop(model_hash, None)
+
+    def score(self, model_hash: str, hours: Iterable[int], now: Optional[float] = None) -> float:
+        """주어진 시간대에 요청될 가능성 점수 (기록이 없으면 0)"""
+        now = time.time() if now is None else now
+        hours = list(hours)
+        with self._lock:
+            entry = self._stats.get(model_hash)
+            if entry is None:
+                return 0.0
+            frequency = self._decayed(entry, now)
+            histogram = entry[2]
+            # 라플라스 평활화: 기록이 적을 때는 균등 분포에 가깝게
+            share = (sum(histogram[h] for h in hours) + 1) / (sum(histogram) + HOURS)
+        return frequency * share * HOURS / max(len(hours), 1)
+
+    def top(self, n: int, hours: Iterable[int], now: Optional[float] = None) -> List[str]:
+        """점수 상위 n개 해시"""
+        hours = list(hours)
+        with self._lock:
+            hashes = list(self._stats)
+        scored = [(self.score(h, hours, now), h) for h in hashes]
+        scored = [item for item in scored if item[0] > 0]
+        scored.sort(reverse=True)
+        return [model_hash for _, model_hash in scored[:n]]
+
+class Prefetcher:
+    """곧 요청될 모델을 첫 요청 전에 미리 준비
+
+    interval초마다 현재와 다음 시간대의 점수 상위 top_n개를 골라, 로컬 디스크에 없으면 원격 저장소에서
+    받아 오고, 캐시에 여유가 있으면 메모리에도 로드한다 (다른 모델을 축출하면서까지 로드하지 않음).
+    """
+
+    def __init__(self, model_manager, interval: float = 0, top_n: int = 3, lookahead_hours: int = 1):
+        self.model_manager = model_manager
+        self.interval = interval
+        self.top_n = top_n
+        self.lookahead_hours = lookahead_hours
+        self.metrics = get_metrics()
+        self.logger = logging.getLogger(__name__)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def candidates(self, now: Optional[float] = None) -> List[str]:
+        hour = utils.from_timestamp(time.time() if now is None else now).hour
+        hours = [(hour + offset) % HOURS for offset in range(self.lookahead_hours + 1)]
+        return self.model_manager.access_stats.top(self.top_n, hours, now)
+
+    def run_once(self, now: Optional[float] = None) -> List[str]:
+        """후보 모델을 준비하고 새로 준비한 해시 목록 반환"""
+        manager = self.model_manager
+        prepared = []
+        for model_hash in self.candidates(now):
+            if model_hash in manager.model_cache:
+                continue
+            try:
+                if model_hash not in manager.metadata_store:
+                    if not manager.ensure_local(model_hash):
+                        # 원격에도 없는 모델은 더 이상 예측하지 않음
+                        manager.access_stats.forget(model_hash)
+                        continue
+                    self.metrics.increment_model_prefetch('disk')
+                    prepared.append(model_hash)
+                if manager.model_cache.has_room():
+                    manager.load_model_to_cache(model_hash)
+                    self.metrics.increment_model_prefetch('memory')
+                    if model_hash not in prepared:
+                        prepared.append(model_hash)
+            except Exception as e:
+                self.logger.warning(f"Prefetch of {model_hash} failed: {e}")
+        return prepared
+
+    def start(self) -> None:
+        """주기적인 사전 로드 시작 (interval 0 = 사용 안 함)"""
+        if self.interval <= 0 or self._thread:
+            return
+
+        def prefetch_loop():
+            while not self._stopped.wait(self.interval):
+                prepared = self.run_once()
+                if prepared:
+                    self.logger.info(f"Prefetched models: {', '.join(prepared)}")
+
+        self._thread = threading.Thread(target=prefetch_loop, name='model-prefetch', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
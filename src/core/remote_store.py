@@ -0,0 +1,291 @@
+#core/remote_store
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+from urllib.parse import urlparse
+from zipfile import ZipFile, ZIP_STORED
+
+from src.common.metrics import get_metrics
+
+# 원격에서 받는 중인 zip과 진행 상태 파일 폴더 (모델 스토어 스캔 시 제외, 재시작 후 이어받기)
+FETCH_DIR = '.fetch'
+CHUNK_SIZE = 8 * 1024 * 1024
+
+class RemoteStore(ABC):
+    """원격 모델 저장소 (모델 폴더를 zip 하나와 메타데이터 JSON으로 저장)
+
+    구현체는 파일 업로드, 메타데이터 읽기/쓰기, 바이트 범위 읽기만 제공하면 된다.
+    메타데이터는 zip 업로드가 끝난 뒤 기록하므로, 메타데이터가 보이면 zip도 완전하다.
+    """
+
+    @abstractmethod
+    def upload_file(self, model_hash: str, local_path: str) -> None:
+        """zip 파일 업로드"""
+
+    @abstractmethod
+    def write_metadata(self, model_hash: str, metadata: Dict[str, Any]) -> None:
+        """메타데이터 기록"""
+
+    @abstractmethod
+    def read_metadata(self, model_hash: str) -> Optional[Dict[str, Any]]:
+        """메타데이터 반환 (없으면 None)"""
+
+    @abstractmethod
+    def read_range(self, model_hash: str, start: int, end: int) -> bytes:
+        """zip의 [start, end) 바이트 범위"""
+
+    def publish(self, model_hash: str, folder: str, metadata: Dict[str, Any],
+                tmp_dir: Optional[str] = None) -> Dict[str, Any]:
+        """모델 폴더를 zip으로 묶어 업로드하고 메타데이터 기록 (기록한 메타데이터 반환)"""
+        fd, archive_path = tempfile.mkstemp(prefix=f'{model_hash}-', suffix='.zip', dir=tmp_dir)
+        os.close(fd)
+        try:
+            # .keras/.tflite는 이미 압축되어 있거나 압축 이득이 작으므로 저장만
+            with ZipFile(archive_path, 'w', ZIP_STORED) as zip_ref:
+                for root, _, files in os.walk(folder):
+                    for file in files:
+                        path = os.path.join(root, file)
+                        zip_ref.write(path, os.path.relpath(path, folder))
+            metadata = dict(metadata, archive={
+                'size': os.path.getsize(archive_path),
+                'sha256': _file_digest(archive_path),
+            })
+            self.upload_file(model_hash, archive_path)
+            self.write_metadata(model_hash, metadata)
+            return metadata
+        finally:
+            os.remove(archive_path)
+
+class FileSystemRemoteStore(RemoteStore):
+    """공유 파일 시스템(NFS 등) 원격 저장소 - <root>/<hash>/model.zip, metadata.json (테스트용 대체 구현 겸용)"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, model_hash: str, name: str) -> str:
+        return os.path.join(self.root, model_hash, name)
+
+    def _replace(self, model_hash: str, name: str, write: Callable[[str], None]) -> None:
+        """임시 파일에 쓴 뒤 rename (읽는 쪽은 이전 파일이나 완전한 새 파일만 봄)"""
+        os.makedirs(os.path.join(self.root, model_hash), exist_ok=True)
+        target = self._path(model_hash, name)
+        tmp_path = f'{target}.{uuid.uuid4().hex}.tmp'
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def upload_file(self, model_hash, local_path):
+        self._replace(model_hash, 'model.zip', lambda tmp_path: shutil.copyfile(local_path, tmp_path))
+
+    def write_metadata(self, model_hash, metadata):
+        def write(tmp_path):
+            with open(tmp_path, 'w') as f:
+                json.dump(metadata, f)
+        self._replace(model_hash, 'metadata.json', write)
+
+    def read_metadata(self, model_hash):
+        try:
+            with open(self._path(model_hash, 'metadata.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def read_range(self, model_hash, start, end):
+        with open(self._path(model_hash, 'model.zip'), 'rb') as f:
+            f.seek(start)
+            return f.read(end - start)
+
+# URL scheme별 원격 저장소 구현 (scheme 없는 경로는 file)
+REMOTE_STORES = {'file': FileSystemRemoteStore}
+
+def create_remote_store(url: str) -> Optional[RemoteStore]:
+    """REMOTE_STORE_URL로 원격 저장소 생성 (비어 있으면 None)"""
+    if not url:
+        return None
+    parsed = urlparse(url)
+    scheme = parsed.scheme or 'file'
+    if scheme not in REMOTE_STORES:
+        raise ValueError(f"Unknown remote store scheme: {scheme}")
+    return REMOTE_STORES[scheme](parsed.path if parsed.scheme else url)
+
+class RemoteFetcher:
+    """원격 zip을 청크 단위로 병렬 다운로드 (이어받기, sha256 검증, 해시별 single-flight)
+
+    받은 청크는 미리 크기를 잡아 둔 .part 파일의 제자리에 기록하고 완료 목록을 .part.json에 남기므로,
+    중단되거나 프로세스가 재시작되어도 남은 청크만 다시 받는다. 같은 해시는 프로세스 안에서는
+    Future로, 워커 프로세스 사이에서는 파일 락으로 한 번만 받는다.
+    """
+
+    def __init__(self, remote: RemoteStore, fetch_dir: str, workers: int = 4,
+                 chunk_size: int = CHUNK_SIZE, retries: int = 3):
+        self.remote = remote
+        self.fetch_dir = fetch_dir
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self._executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix='remote-fetch')
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.metrics = get_metrics()
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(fetch_dir, exist_ok=True)
+
+    def fetch(self, model_hash: str, install: Callable[[str, Dict[str, Any]], Any],
+              installed: Optional[Callable[[], Any]] = None) -> Any:
+        """원격 zip을 받아 install(zip 경로, 원격 메타데이터) 결과 반환 (원격에 없으면 None)
+
+        installed는 락을 잡은 뒤 호출되며, 다른 프로세스가 먼저 설치했으면 그 결과를 반환한다.
+        """
+        with self._lock:
+            future = self._inflight.get(model_hash)
+            is_fetcher = future is None
+            if is_fetcher:
+                future = Future()
+                self._inflight[model_hash] = future
+        if not is_fetcher:
+            return future.result()
+
+        try:
+            with self._file_lock(model_hash):
+                result = installed() if installed else None
+                if result is None:
+                    result = self._fetch_and_install(model_hash, install)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            self.metrics.increment_model_remote_fetch('error')
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(model_hash, None)
+
+    def _fetch_and_install(self, model_hash: str, install: Callable[[str, Dict[str, Any]], Any]) -> Any:
+        metadata = self.remote.read_metadata(model_hash)
+        if metadata is None:
+            self.metrics.increment_model_remote_fetch('missing')
+            return None
+        start = time.perf_counter()
+        archive_path = self._download(model_hash, metadata['archive'])
+        try:
+            result = install(archive_path, metadata)
+        finally:
+            os.remove(archive_path)
+        self.metrics.increment_model_remote_fetch('ok')
+        self.logger.info(f"Fetched model {model_hash} from remote store "
+                         f"({metadata['archive']['size']} bytes, {time.perf_counter() - start:.2f}s)")
+        return result
+
+    def _download(self, model_hash: str, archive: Dict[str, Any]) -> str:
+        """남은 청크를 병렬로 받아 검증한 zip 경로 반환"""
+        size, digest = archive['size'], archive['sha256']
+        final_path = os.path.join(self.fetch_dir, f'{model_hash}.zip')
+        part_path = final_path + '.part'
+        progress_path = part_path + '.json'
+
+        progress = _read_json(progress_path)
+        # 원격 zip이 바뀌었거나 청크 크기가 다르면 처음부터
+        if not progress or progress.get('sha256') != digest or progress.get('chunk_size') != self.chunk_size \
+                or not os.path.exists(part_path):
+            progress = {'sha256': digest, 'chunk_size': self.chunk_size, 'done': []}
+        done = set(progress['done'])
+
+        chunk_count = (size + self.chunk_size - 1) // self.chunk_size
+        missing = [i for i in range(chunk_count) if i not in done]
+        fd = os.open(part_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            futures = {self._executor.submit(self._fetch_chunk, fd, model_hash, i, size): i for i in missing}
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    done.add(futures[future])
+                    _write_json(progress_path, dict(progress, done=sorted(done)))
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                # 이미 제출된 청크가 끝난 뒤 fd를 닫도록 대기
+                for future in futures:
+                    if not future.cancelled():
+                        try:
+                            future.result()
+                        except Exception:
+                            continue
+                raise
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        if _file_digest(part_path) != digest:
+            os.remove(part_path)
+            os.remove(progress_path)
+            raise IOError(f"Checksum mismatch for remote model {model_hash}")
+        os.replace(part_path, final_path)
+        os.remove(progress_path)
+        return final_path
+
+    def _fetch_chunk(self, fd: int, model_hash: str, index: int, size: int) -> None:
+        """청크 하나를 받아 .part 파일의 해당 위치에 기록 (실패 시 재시도)"""
+        start = index * self.chunk_size
+        end = min(start + self.chunk_size, size)
+        for attempt in range(self.retries + 1):
+            try:
+                data = self.remote.read_range(model_hash, start, end)
+                if len(data) != end - start:
+                    raise IOError(f"Short read for chunk {index}: {len(data)} of {end - start} bytes")
+                os.pwrite(fd, data, start)
+                self.metrics.increment_model_remote_fetch_bytes(len(data))
+                return
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                self.logger.warning(f"Chunk {index} of {model_hash} failed, retrying: {e}")
+                time.sleep(0.1 * 2 ** attempt)
+
+    @contextmanager
+    def _file_lock(self, model_hash: str) -> Iterator[None]:
+        """워커 프로세스 간 같은 해시 동시 다운로드 방지"""
+        with open(os.path.join(self.fetch_dir, f'{model_hash}.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+def _file_digest(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _write_json(path: str, value: Dict[str, Any]) -> None:
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(value, f)
+    os.replace(tmp_path, path)
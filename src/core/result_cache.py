@@ -0,0 +1,137 @@
+#core/result_cache
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.common.metrics import get_metrics
+
+# 항목당 키/메타데이터 오버헤드 추정치 (bytes)
+_ENTRY_OVERHEAD = 128
+
+class ResultCache:
+    """예측 결과 캐시 (행 단위)
+
+    키는 (모델 해시, dtype, 행 shape, 행 바이트 digest)이며, TTL과 바이트 한도 기반 LRU로 관리한다.
+    배치 입력은 행마다 조회하므로 일부만 적중한 배치는 나머지 행만 예측하면 된다.
+    모델별 무효화 세대를 두어, 조회 이후 무효화된 모델의 결과는 저장하지 않는다 (같은 프로세스 안).
+    항목에는 저장 당시의 모델 세대(인덱스 기준)를 함께 두고 조회 시 현재 세대와 다르면 누락으로 처리해,
+    다른 프로세스가 재업로드/삭제한 모델의 결과도 TTL을 기다리지 않고 버린다.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.total_bytes = 0
+        self.metrics = get_metrics()
+
+        self._entries: 'OrderedDict[Tuple, Tuple[float, Any, int, Optional[int]]]' = OrderedDict()
+        self._by_model: Dict[str, Set[Tuple]] = {}
+        # 모델별 무효화 횟수 (조회 시점과 다르면 그 사이 무효화된 것)
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _row_keys(model_hash: str, data: np.ndarray) -> List[Tuple]:
+        data = np.ascontiguousarray(data)
+        dtype, shape = data.dtype.str, data.shape[1:]
+        return [
+            (model_hash, dtype, shape, hashlib.blake2b(data[i], digest_size=16).digest())
+            for i in range(data.shape[0])
+        ]
+
+    def generation(self, model_hash: str) -> int:
+        """모델의 현재 무효화 세대 (조회 전에 받아 store에 전달)"""
+        with self._lock:
+            return self._generations.get(model_hash, 0)
+
+    def lookup(self, model_hash: str, data: np.ndarray,
+               model_generation: Optional[int] = None) -> Tuple[List[Tuple], List[Optional[Any]], List[int]]:
+        """행별 조회 결과 반환 (키 목록, 적중한 행의 결과, 누락된 행 인덱스 - 모델 세대가 다른 항목은 누락)"""
+        keys = self._row_keys(model_hash, data)
+        results: List[Optional[Any]] = [None] * len(keys)
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and (entry[0] < now or entry[3] != model_generation):
+                    self._remove(key)
+                    entry = None
+                if entry is None:
+                    missing.append(i)
+                else:
+                    self._entries.move_to_end(key)
+                    results[i] = entry[1]
+        self.metrics.record_result_cache_lookup(len(keys) - len(missing), len(missing))
+        return keys, results, missing
+
+    def store(self, keys: List[Tuple], rows: List[Any], generation: Optional[int] = None,
+              model_generation: Optional[int] = None) -> None:
+        """행별 결과 저장 (바이트 한도 초과 시 오래된 항목부터 축출, generation 이후 무효화된 모델은 버림)
+
+        model_generation은 조회 때 사용한 모델 세대로, 이후 조회에서 세대가 다르면 누락으로 처리된다.
+        """
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in zip(keys, rows):
+                if generation is not None and self._generations.get(key[0], 0) != generation:
+                    continue
+                nbytes = _ENTRY_OVERHEAD + _nbytes(value)
+                if nbytes > self.max_bytes:
+                    continue
+                self._remove(key)
+                self._entries[key] = (expires_at, value, nbytes, model_generation)
+                self._by_model.setdefault(key[0], set()).add(key)
+                self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+            self.metrics.set_result_cache_bytes(self.total_bytes)
+
+    def invalidate(self, model_hash: str) -> None:
+        """모델의 모든 캐시 결과 삭제 (정리/재업로드 시)"""
+        with self._lock:
+            self._generations[model_hash] = self._generations.get(model_hash, 0) + 1
+            for key in list(self._by_model.pop(model_hash, ())):
+                self._remove(key)
+            self.metrics.set_result_cache_bytes(self.total_bytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_model.clear()
+            self.total_bytes = 0
+            self.metrics.set_result_cache_bytes(0)
+
+    def _remove(self, key: Tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.total_bytes -= entry[2]
+        keys = self._by_model.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_model[key[0]]
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(v) for v in value)
+    return int(np.asarray(value).nbytes)
+
+def split_rows(prediction: Any, rows: int) -> List[Any]:
+    """배치 예측 결과를 행별 결과 목록으로 분할 (다중 출력 지원)"""
+    if isinstance(prediction, (list, tuple)):
+        outputs = [np.asarray(output) for output in prediction]
+        return [type(prediction)(np.array(output[i]) for output in outputs) for i in range(rows)]
+    prediction = np.asarray(prediction)
+    return [np.array(prediction[i]) for i in range(rows)]
+
+def stack_rows(rows: List[Any]) -> Any:
+    """행별 결과를 배치 결과로 결합"""
+    if isinstance(rows[0], (list, tuple)):
+        return type(rows[0])(np.stack([row[j] for row in rows]) for j in range(len(rows[0])))
+    return np.stack(rows)
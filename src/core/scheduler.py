@@ -0,0 +1,325 @@
+#core/scheduler
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from src.common import tracing
+from src.common.metrics import get_metrics
+
+# 요청별 우선순위 헤더와 처리 시간 제한 헤더 (밀리초)
+PRIORITY_HEADER = 'X-Priority'
+TIMEOUT_HEADER = 'X-Request-Timeout-Ms'
+
+# 우선순위 클래스 (앞쪽이 먼저 실행)
+PRIORITIES = ('high', 'normal', 'low')
+DEFAULT_PRIORITY = PRIORITIES.index('normal')
+
+class QueueFullError(RuntimeError):
+    """모델별 대기열이 가득 찬 경우 (429)"""
+
+class DeadlineExceededError(TimeoutError):
+    """요청 마감 시각이 지난 경우 (504)"""
+
+def parse_priority(value: Optional[str]) -> int:
+    """우선순위 헤더 값을 클래스 번호로 변환 (없으면 normal)"""
+    if not value:
+        return DEFAULT_PRIORITY
+    try:
+        return PRIORITIES.index(value.strip().lower())
+    except ValueError:
+        raise ValueError(f"Unknown priority: {value} (expected one of {', '.join(PRIORITIES)})") from None
+
+class AIMDLimit:
+    """지연 시간 목표 기반 동시 실행 한도 (AIMD)
+
+    추론 시간이 목표 이내면 한도를 요청마다 1/한도씩(한도만큼 완료되면 1) 늘리고,
+    목표를 넘으면 backoff 배로 줄인다. 줄인 시점 이전에 시작한 요청의 지연으로는 다시 줄이지 않는다.
+    목표가 0이면 max_limit으로 고정.
+    """
+
+    def __init__(self, max_limit: int, target_latency: float = 0, min_limit: int = 1, backoff: float = 0.5):
+        self.max_limit = max(max_limit, 1)
+        self.min_limit = min(max(min_limit, 1), self.max_limit)
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.value = float(self.min_limit if target_latency else self.max_limit)
+        self._decreased_at = 0.0
+
+    @property
+    def limit(self) -> int:
+        return int(self.value)
+
+    def update(self, latency: float, started: float) -> bool:
+        """완료된 요청의 추론 시간 반영 (정수 한도가 바뀌면 True)"""
+        if not self.target_latency:
+            return False
+        before = self.limit
+        if latency > self.target_latency:
+            if started >= self._decreased_at:
+                self.value = max(self.min_limit, self.value * self.backoff)
+                self._decreased_at = time.monotonic()
+        else:
+            self.value = min(self.max_limit, self.value + 1 / self.value)
+        return self.limit != before
+
+class _Task:
+    __slots__ = ('model_hash', 'data', 'priority', 'deadline', 'submitted', 'context', 'future')
+
+    def __init__(self, model_hash: str, data: Any, priority: int, deadline: Optional[float]):
+        self.model_hash = model_hash
+        self.data = data
+        self.priority = priority
+        self.deadline = deadline
+        self.submitted = time.perf_counter()
+        # 요청 추적 컨텍스트를 작업 스레드로 전달
+        self.context = contextvars.copy_context()
+        self.future: Future = Future()
+        self.future.priority = PRIORITIES[priority]
+
+class _ModelQueue:
+    """모델별 우선순위 대기열과 동시 실행 한도"""
+    __slots__ = ('tasks', 'depth', 'running', 'limit', 'removed')
+
+    def __init__(self, limit: AIMDLimit):
+        self.tasks: List[Deque[_Task]] = [deque() for _ in PRIORITIES]
+        # 대기 + 실행 중 요청 수 (취소된 요청 제외)
+        self.depth = 0
+        self.running = 0
+        self.limit = limit
+        # 모델이 삭제되어 비는 즉시 제거할 대기열
+        self.removed = False
+
+class InferenceScheduler:
+    """모델별 추론 스케줄러
+
+    모델마다 크기가 제한된 대기열과 동시 실행 한도를 두고, 공유 작업 스레드가 우선순위 클래스 순으로,
+    같은 클래스 안에서는 대기 중인 모델을 돌아가며(라운드 로빈) 하나씩 꺼내 실행한다.
+    모델별 한도의 기본값은 작업 스레드 수의 절반이므로 요청이 몰린 모델이 모든 스레드를 차지하지 못한다.
+    하위 클래스의 맨 앞 요청은 aging_ms만큼 기다릴 때마다 한 단계씩 승격되어 상위 클래스에 계속 밀리지 않는다.
+    target_latency_ms를 지정하면 모델별 한도는 추론 시간에 따라 AIMD로 조절된다.
+    마감 시각이 지난 요청은 스레드가 꺼내는 시점에 모델을 호출하지 않고 버린다.
+    """
+
+    def __init__(self, model_manager, workers: int = 4, max_queue_per_model: int = 64,
+                 max_concurrency_per_model: int = 0, target_latency_ms: float = 0, aging_ms: float = 1000):
+        self.model_manager = model_manager
+        self.workers = max(workers, 1)
+        self.max_queue_per_model = max_queue_per_model
+        # 한 모델이 쓸 수 있는 스레드 수 (기본값: 작업 스레드의 절반 - 나머지는 다른 모델 몫)
+        self.max_concurrency_per_model = max_concurrency_per_model or max(self.workers // 2, 1)
+        self.target_latency = target_latency_ms / 1000
+        # 하위 우선순위 요청을 한 단계 승격하는 대기 시간 (초, 0 = 엄격한 우선순위)
+        self.aging = aging_ms / 1000
+        self.metrics = get_metrics()
+        self.logger = logging.getLogger(__name__)
+
+        self._queues: Dict[str, _ModelQueue] = {}
+        # 우선순위별로 대기 요청이 있는 모델 (라운드 로빈 순서)
+        self._ready: List[Deque[str]] = [deque() for _ in PRIORITIES]
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._work_loop, name=f'inference-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def queue_depth(self, model_hash: str) -> int:
+        with self._cond:
+            queue = self._queues.get(model_hash)
+            return queue.depth if queue else 0
+
+    def concurrency_limit(self, model_hash: str) -> int:
+        with self._cond:
+            queue = self._queues.get(model_hash)
+            return queue.limit.limit if queue else 0
+
+    def submit(self, model_hash: str, data: Any, priority: int = DEFAULT_PRIORITY,
+               deadline: Optional[float] = None) -> Future:
+        """예측 요청을 모델 대기열에 추가 (deadline은 time.monotonic() 기준 절대 시각, 가득 차면 QueueFullError)"""
+        task = _Task(model_hash, data, priority, deadline)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('Inference scheduler is shut down')
+            queue = self._queues.get(model_hash)
+            if queue is None:
+                queue = self._queues[model_hash] = _ModelQueue(
+                    AIMDLimit(self.max_concurrency_per_model, self.target_latency)
+                )
+            if self.max_queue_per_model and queue.depth >= self.max_queue_per_model:
+                self.metrics.increment_inference_rejection('queue_full', PRIORITIES[priority])
+                raise QueueFullError(f"Too many pending requests for model {model_hash}")
+            queue.depth += 1
+            depth = queue.depth
+            if not queue.tasks[priority]:
+                self._ready[priority].append(model_hash)
+            queue.tasks[priority].append(task)
+            self._cond.notify()
+        self.metrics.set_inference_queue_depth(model_hash, depth)
+        task.future.add_done_callback(lambda future: self._finished(model_hash, future))
+        return task.future
+
+    def predict(self, model_hash: str, data: Any, priority: int = DEFAULT_PRIORITY,
+                deadline: Optional[float] = None) -> Tuple[Any, int]:
+        """예측 요청을 대기열에 넣고 결과를 기다림 (마감이 지나면 DeadlineExceededError)"""
+        future = self.submit(model_hash, data, priority, deadline)
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            return future.result(timeout)
+        except DeadlineExceededError:
+            raise
+        except FutureTimeoutError:
+            self.expire(future)
+            raise DeadlineExceededError('Request deadline exceeded') from None
+
+    def expire(self, future: Future) -> bool:
+        """마감이 지나 결과를 기다리지 않는 요청 처리 (아직 시작 전이면 취소, 버려진 요청이면 True)"""
+        if future.cancel() or not future.done():
+            self.metrics.increment_inference_rejection('deadline', future.priority)
+            return True
+        return False
+
+    def remove_model(self, model_hash: str) -> None:
+        """삭제된 모델의 대기열과 메트릭 레이블 제거 (처리 중인 요청이 있으면 모두 끝난 뒤 제거)"""
+        with self._cond:
+            queue = self._queues.get(model_hash)
+            if queue is not None:
+                queue.removed = True
+                if not self._drop_if_idle(model_hash, queue):
+                    return
+        self._remove_labels(model_hash)
+
+    def _drop_if_idle(self, model_hash: str, queue: _ModelQueue) -> bool:
+        """대기/실행 중인 요청이 없는 대기열 삭제 (self._cond 보유 상태에서 호출)"""
+        if queue.depth or queue.running or any(queue.tasks):
+            return False
+        del self._queues[model_hash]
+        return True
+
+    def _remove_labels(self, model_hash: str) -> None:
+        self.metrics.remove_inference_queue_depth(model_hash)
+        self.metrics.remove_inference_concurrency_limit(model_hash)
+
+    def _finished(self, model_hash: str, future: Future) -> None:
+        """완료/실패/취소된 요청을 대기열 깊이에서 제외"""
+        with self._cond:
+            queue = self._queues.get(model_hash)
+            if queue is None:
+                return
+            queue.depth -= 1
+            depth = queue.depth
+            # 없는 모델로 들어온 요청이나 삭제된 모델의 대기열은 남기지 않음
+            not_found = not future.cancelled() and isinstance(future.exception(), KeyError)
+            dropped = (queue.removed or not_found) and self._drop_if_idle(model_hash, queue)
+        if dropped:
+            self._remove_labels(model_hash)
+        else:
+            self.metrics.set_inference_queue_depth(model_hash, depth)
+
+    def _class_order(self) -> List[int]:
+        """우선순위 클래스를 확인할 순서 (맨 앞 요청이 aging만큼 기다릴 때마다 한 단계씩 앞으로, 동률이면 원래 순서)"""
+        if not self.aging:
+            return list(range(len(PRIORITIES)))
+        now = time.perf_counter()
+        effective = []
+        for priority, ready in enumerate(self._ready):
+            waited = 0.0
+            if priority and ready:
+                head = self._queues[ready[0]].tasks[priority]
+                waited = now - head[0].submitted if head else 0.0
+            effective.append((priority - int(waited / self.aging), priority))
+        return [priority for _, priority in sorted(effective)]
+
+    def _next_task(self, expired: List[_Task]) -> Optional[_Task]:
+        """실행할 요청 선택 (승격을 반영한 우선순위 순, 같은 우선순위는 모델 라운드 로빈, 한도에 걸린 모델은 건너뜀)"""
+        now = time.monotonic()
+        for priority in self._class_order():
+            ready = self._ready[priority]
+            for _ in range(len(ready)):
+                model_hash = ready.popleft()
+                queue = self._queues[model_hash]
+                tasks = queue.tasks[priority]
+                if queue.running >= queue.limit.limit:
+                    ready.append(model_hash)
+                    continue
+                task = tasks.popleft()
+                if tasks:
+                    ready.append(model_hash)
+                # 기다리다 포기한(취소된) 요청은 건너뜀
+                if not task.future.set_running_or_notify_cancel():
+                    if queue.removed and self._drop_if_idle(model_hash, queue):
+                        self._remove_labels(model_hash)
+                    continue
+                if task.deadline is not None and now >= task.deadline:
+                    expired.append(task)
+                    continue
+                queue.running += 1
+                return task
+        return None
+
+    def _work_loop(self) -> None:
+        while True:
+            expired: List[_Task] = []
+            with self._cond:
+                task = self._next_task(expired)
+                while task is None and not expired:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                    task = self._next_task(expired)
+            for dropped in expired:
+                self.metrics.increment_inference_rejection('deadline', dropped.future.priority)
+                dropped.future.set_exception(DeadlineExceededError('Request deadline exceeded before inference'))
+            if task is not None:
+                self._execute(task)
+
+    def _execute(self, task: _Task) -> None:
+        wait = time.perf_counter() - task.submitted
+        self.metrics.observe_inference_queue_wait(task.future.priority, wait)
+        started = time.monotonic()
+        try:
+            result, error = task.context.run(self._call, task, wait), None
+        except BaseException as e:
+            result, error = None, e
+        latency = time.monotonic() - started
+
+        with self._cond:
+            queue = self._queues[task.model_hash]
+            queue.running -= 1
+            # 실패한 요청(없는 모델, 잘못된 입력)의 시간은 한도 조절에 쓰지 않음
+            changed = error is None and queue.limit.update(latency, started)
+            limit = queue.limit.limit
+            self._cond.notify()
+        if changed:
+            self.metrics.set_inference_concurrency_limit(task.model_hash, limit)
+
+        if error is None:
+            task.future.set_result(result)
+        else:
+            task.future.set_exception(error)
+
+    def _call(self, task: _Task, wait: float) -> Tuple[Any, int]:
+        trace = tracing.current_trace()
+        if trace is not None:
+            trace.add('queue', wait)
+        with tracing.attach_thread(trace):
+            return self.model_manager.predict(task.model_hash, task.data)
+
+    def shutdown(self) -> None:
+        """대기 중인 요청을 취소하고 작업 스레드 종료"""
+        with self._cond:
+            self._closed = True
+            tasks = [task for queue in self._queues.values() for tasks in queue.tasks for task in tasks]
+            for queue in self._queues.values():
+                for tasks in queue.tasks:
+                    tasks.clear()
+            for ready in self._ready:
+                ready.clear()
+            self._cond.notify_all()
+        for task in tasks:
+            task.future.cancel()
@@ -0,0 +1,55 @@
+#core/tf_runtime
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+# TF_CPP_MIN_LOG_LEVEL 값 (0 = 전체, 1 = INFO 제외, 2 = WARNING 제외, 3 = ERROR 제외)
+_CPP_LOG_LEVELS = {'DEBUG': '0', 'INFO': '0', 'WARNING': '1', 'ERROR': '2', 'CRITICAL': '3', 'FATAL': '3'}
+
+_settings = {'intra_op_threads': 0, 'inter_op_threads': 0, 'log_level': 'WARNING'}
+_tf: Optional[Any] = None
+_import_seconds: Optional[float] = None
+_lock = threading.Lock()
+logger = logging.getLogger(__name__)
+
+def configure(intra_op_threads: int = 0, inter_op_threads: int = 0, log_level: str = 'WARNING') -> None:
+    """TensorFlow import 전에 적용할 설정 (스레드 수 0 = TF 기본값)"""
+    _settings.update(intra_op_threads=intra_op_threads, inter_op_threads=inter_op_threads,
+                     log_level=log_level.upper())
+    # C++ 로그 레벨은 import 전에 환경 변수로만 지정 가능 (이미 지정된 값은 유지)
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', _CPP_LOG_LEVELS.get(_settings['log_level'], '1'))
+
+def is_loaded() -> bool:
+    return _tf is not None
+
+def import_seconds() -> Optional[float]:
+    """TensorFlow import에 걸린 시간 (아직 import 전이면 None)"""
+    return _import_seconds
+
+def get_tf() -> Any:
+    """TensorFlow 모듈 반환 (첫 호출 시 import 후 스레드/로그 설정 적용)"""
+    global _tf, _import_seconds
+    if _tf is not None:
+        return _tf
+    with _lock:
+        if _tf is None:
+            start = time.perf_counter()
+            import tensorflow as tf
+            _apply_settings(tf)
+            _import_seconds = time.perf_counter() - start
+            _tf = tf
+            logger.info(f"TensorFlow {tf.__version__} imported in {_import_seconds:.2f}s")
+    return _tf
+
+def _apply_settings(tf: Any) -> None:
+    tf.get_logger().setLevel(_settings['log_level'])
+    try:
+        if _settings['intra_op_threads']:
+            tf.config.threading.set_intra_op_parallelism_threads(_settings['intra_op_threads'])
+        if _settings['inter_op_threads']:
+            tf.config.threading.set_inter_op_parallelism_threads(_settings['inter_op_threads'])
+    except RuntimeError as e:
+        # 다른 코드가 먼저 TF 런타임을 초기화한 경우 스레드 수는 바꿀 수 없음
+        logger.warning(f"TensorFlow thread settings not applied: {e}")
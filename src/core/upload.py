@@ -0,0 +1,140 @@
+#core/upload
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from typing import BinaryIO, List, Optional, Tuple
+from zipfile import ZipFile, BadZipFile
+
+CHUNK_SIZE = 1024 * 1024
+
+# 스테이징/삭제 대기 폴더 (모델 스토어 스캔 시 제외)
+STAGING_DIR = '.staging'
+# 설치된 모델 버전 폴더 (모델 경로는 현재 버전을 가리키는 심볼릭 링크)
+VERSIONS_DIR = '.versions'
+
+# hex digest 길이로 해시 알고리즘 추정
+_DIGEST_ALGORITHMS = {32: 'md5', 40: 'sha1', 64: 'sha256', 128: 'sha512'}
+_HASH_PATTERN = re.compile(r'^[A-Za-z0-9_-][A-Za-z0-9_.-]{7,}$')
+
+class UploadTooLargeError(ValueError):
+    """업로드 크기 제한 초과"""
+
+class HashMismatchError(ValueError):
+    """업로드 내용의 digest가 선언된 해시와 다름"""
+
+def is_valid_hash(model_hash: str) -> bool:
+    """경로로 안전하게 쓸 수 있는 모델 해시인지 확인"""
+    return bool(model_hash) and bool(_HASH_PATTERN.match(model_hash))
+
+def digest_algorithm(model_hash: str) -> Optional[str]:
+    """해시 문자열이 hex digest이면 해당 알고리즘 이름 반환"""
+    algorithm = _DIGEST_ALGORITHMS.get(len(model_hash))
+    if algorithm and re.fullmatch(r'[0-9a-fA-F]+', model_hash):
+        return algorithm
+    return None
+
+def spool_and_hash(stream: BinaryIO, algorithm: str, max_size: int, spool_dir: str,
+                   spool_memory: int) -> Tuple[BinaryIO, str, int]:
+    """스트림을 한 번 읽으면서 digest 계산 (크기 제한 초과 시 즉시 중단)
+
+    탐색 가능한 스트림(이미 스풀된 multipart 파일 등)은 복사하지 않고 되감아 그대로 반환하고,
+    그렇지 않으면 SpooledTemporaryFile에 기록한다.
+    """
+    hasher = hashlib.new(algorithm)
+    seekable = getattr(stream, 'seekable', lambda: False)()
+    target = stream if seekable else tempfile.SpooledTemporaryFile(max_size=spool_memory, dir=spool_dir)
+    size = 0
+    try:
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_size and size > max_size:
+                raise UploadTooLargeError(f"Model file exceeds {max_size} bytes")
+            hasher.update(chunk)
+            if not seekable:
+                target.write(chunk)
+        target.seek(0)
+    except Exception:
+        if not seekable:
+            target.close()
+        raise
+    return target, hasher.hexdigest(), size
+
+def extract_to_staging(archive: BinaryIO, staging_root: str, model_hash: str) -> str:
+    """zip을 스테이징 폴더에 해제 (경로 탈출 검사, .keras 포함 여부 검사)"""
+    os.makedirs(staging_root, exist_ok=True)
+    staging_path = tempfile.mkdtemp(prefix=f'{model_hash}-', dir=staging_root)
+    try:
+        with ZipFile(archive, 'r') as zip_ref:
+            names = zip_ref.namelist()
+            if not any(name.endswith('.keras') for name in names):
+                raise ValueError("No .keras file in zip")
+            root = os.path.realpath(staging_path)
+            for name in names:
+                target = os.path.realpath(os.path.join(root, name))
+                if os.path.commonpath([root, target]) != root:
+                    raise ValueError(f"Unsafe path in zip: {name}")
+            zip_ref.extractall(staging_path)
+    except BadZipFile:
+        shutil.rmtree(staging_path, ignore_errors=True)
+        raise ValueError("Invalid zip file")
+    except Exception:
+        shutil.rmtree(staging_path, ignore_errors=True)
+        raise
+    return staging_path
+
+def install_staged(staging_path: str, final_path: str) -> Optional[str]:
+    """스테이징 폴더를 새 버전 폴더로 옮기고 최종 경로의 심볼릭 링크를 os.replace로 원자적으로 교체
+
+    읽는 쪽은 언제나 이전 버전이나 새 버전 중 하나를 보며, 교체된 이전 버전 폴더 경로를 반환한다 (삭제는 호출자).
+    링크 도입 전에 설치된 실제 폴더는 처음 재업로드할 때 한 번만 버전 폴더로 옮긴 뒤 링크로 바꾼다.
+    """
+    store_root = os.path.dirname(os.path.abspath(final_path))
+    versions_root = os.path.join(store_root, VERSIONS_DIR)
+    os.makedirs(versions_root, exist_ok=True)
+    name = os.path.basename(final_path)
+    version = f'{name}-{uuid.uuid4().hex}'
+    os.rename(staging_path, os.path.join(versions_root, version))
+    link = os.path.join(store_root, f'.{version}.link')
+    os.symlink(os.path.join(VERSIONS_DIR, version), link)
+
+    previous = None
+    if os.path.islink(final_path):
+        previous = os.path.realpath(final_path)
+    elif os.path.exists(final_path):
+        previous = os.path.join(versions_root, f'{name}-{uuid.uuid4().hex}')
+        os.rename(final_path, previous)
+    os.replace(link, final_path)
+    return previous
+
+def unlinked_versions(store_root: str, min_age: float = 3600) -> List[str]:
+    """어떤 모델 링크도 가리키지 않는 버전 폴더 (설치 도중 중단된 업로드, min_age초 이상 지난 것만)"""
+    versions_root = os.path.join(store_root, VERSIONS_DIR)
+    if not os.path.isdir(versions_root):
+        return []
+    linked = set()
+    for name in os.listdir(store_root):
+        path = os.path.join(store_root, name)
+        if os.path.islink(path):
+            linked.add(os.path.realpath(path))
+    cutoff = time.time() - min_age
+    unlinked = []
+    for name in os.listdir(versions_root):
+        path = os.path.join(versions_root, name)
+        try:
+            if path not in linked and os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                unlinked.append(path)
+        except OSError:
+            continue
+    return unlinked
+
+def clear_staging(staging_root: str) -> None:
+    """이전 프로세스가 남긴 스테이징 잔여물 삭제"""
+    if os.path.isdir(staging_root):
+        shutil.rmtree(staging_root, ignore_errors=True)
@@ -0,0 +1,131 @@
+#core/warmup
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.core import tf_runtime
+
+class ModelWarmer:
+    """모델 사전 로드 및 워밍업
+
+    지정한 해시(또는 최근 사용 상위 N개)를 백그라운드에서 캐시에 로드하고,
+    모델 입력 시그니처로 만든 합성 입력으로 forward pass를 한 번 실행해 그래프 트레이싱 비용을 미리 치른다.
+    preload_backend이면 그 전에 TensorFlow import도 백그라운드에서 끝내 둔다.
+    owns를 지정하면(클러스터 모드) 이 워커가 해시 링에서 담당하는 모델만 워밍업한다.
+    워밍업 대상이 모두 처리되면 ready 상태가 된다.
+    """
+
+    def __init__(self, model_manager, hashes: Iterable[str] = (), top_n: int = 0,
+                 on_upload: bool = False, batch_sizes: Iterable[int] = (1,), preload_backend: bool = False,
+                 owns: Optional[Callable[[str], bool]] = None):
+        self.model_manager = model_manager
+        self.preload_backend = preload_backend
+        self.hashes = list(hashes)
+        self.top_n = top_n
+        self.on_upload = on_upload
+        self.batch_sizes = tuple(batch_sizes) or (1,)
+        self.owns = owns
+        self.logger = logging.getLogger(__name__)
+
+        self.warm: Dict[str, float] = {}
+        self.failed: Dict[str, str] = {}
+        self.pending: List[str] = []
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def select_hashes(self) -> List[str]:
+        """워밍업 대상 선택 (명시 목록 + 마지막 사용 시각 기준 상위 N개, 클러스터 모드에서는 담당 모델만)"""
+        owned = self.owns or (lambda model_hash: True)
+        selected = [h for h in self.hashes if h in self.model_manager.metadata_store and owned(h)]
+        if self.top_n > 0:
+            recent = sorted(
+                self.model_manager.metadata_store.items(),
+                key=lambda item: (_timestamp(item[1].get('used')), item[1].get('hits', 0)),
+                reverse=True,
+            )
+            recent = [model_hash for model_hash, _ in recent if owned(model_hash)]
+            for model_hash in recent[:self.top_n]:
+                if model_hash not in selected:
+                    selected.append(model_hash)
+        return selected
+
+    def start(self) -> None:
+        """백그라운드 워밍업 시작 (대상이 없으면 즉시 ready)"""
+        self.pending = self.select_hashes()
+        if not self.pending and not self.preload_backend:
+            self._ready.set()
+            return
+        thread = threading.Thread(target=self._warm_all, name='model-warmup', daemon=True)
+        thread.start()
+
+    def _warm_all(self) -> None:
+        if self.preload_backend:
+            try:
+                tf_runtime.get_tf()
+            except Exception as e:
+                self.logger.error(f"Backend preload failed: {e}")
+        for model_hash in list(self.pending):
+            self.warm_model(model_hash)
+        self._ready.set()
+        self.logger.info(f"Warm-up finished: {len(self.warm)} warm, {len(self.failed)} failed")
+
+    def warm_async(self, model_hash: str) -> None:
+        """업로드 직후 등 단일 모델을 백그라운드에서 워밍업"""
+        threading.Thread(target=self.warm_model, args=(model_hash,), daemon=True).start()
+
+    def warm_model(self, model_hash: str) -> bool:
+        """모델 로드 후 합성 입력으로 forward pass 실행"""
+        start = time.perf_counter()
+        try:
+            engine = self.model_manager.load_model_to_cache(model_hash)
+            for batch_size in self.batch_sizes:
+                data = synthetic_input(getattr(engine, 'model', engine), batch_size)
+                if data is not None:
+                    engine.predict(data)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.warm[model_hash] = elapsed
+                self.failed.pop(model_hash, None)
+            self.logger.info(f"Warmed model {model_hash} in {elapsed:.2f}s")
+            return True
+        except Exception as e:
+            with self._lock:
+                self.failed[model_hash] = str(e)
+            self.logger.error(f"Warm-up failed for {model_hash}: {e}")
+            return False
+        finally:
+            with self._lock:
+                if model_hash in self.pending:
+                    self.pending.remove(model_hash)
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'ready': self.is_ready(),
+                'warm': sorted(self.warm),
+                'pending': list(self.pending),
+                'failed': dict(self.failed),
+                'backend_loaded': tf_runtime.is_loaded(),
+            }
+
+def synthetic_input(model: Any, batch_size: int = 1) -> Optional[np.ndarray]:
+    """모델의 선언된 입력 시그니처로 0 배열 생성 (단일 입력 모델만)"""
+    inputs = getattr(model, 'inputs', None)
+    if not isinstance(inputs, (list, tuple)) or len(inputs) != 1:
+        return None
+    spec = inputs[0]
+    shape = (batch_size,) + tuple(dim or 1 for dim in tuple(spec.shape)[1:])
+    dtype = getattr(spec.dtype, 'as_numpy_dtype', spec.dtype)
+    return np.zeros(shape, dtype=np.dtype(dtype))
+
+def _timestamp(value: Any) -> float:
+    return value.timestamp() if hasattr(value, 'timestamp') else 0.0
@@ -0,0 +1,9 @@
+#gunicorn_config
+"""gunicorn 설정 (python -m src.cluster가 워커/라우터를 실행할 때 사용)"""
+import os
+
+def child_exit(server, worker):
+    """종료된 gunicorn 워커 프로세스의 Prometheus 멀티프로세스 메트릭 파일 정리"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
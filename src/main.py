@@ -6,9 +6,20 @@ from src.config import Config
 from src.api.health import health_bp
 from src.api.metrics import metrics_bp
 from src.api.model_routes import model_bp
+from src.api.job_routes import job_bp
 from src.core.model_manager import ModelManager
+from src.core.batch_jobs import BatchJobManager
+from src.core.hash_ring import ConsistentHashRing
+from src.core.multi_predict import MultiModelPredictor
+from src.core.prefetch import Prefetcher
+from src.core.remote_store import create_remote_store
+from src.core.warmup import ModelWarmer
+from src.core.result_cache import ResultCache
+from src.core.scheduler import InferenceScheduler
+from src.core import tf_runtime
 from src.common.utils import set_folder
 from src.common.metrics import get_metrics
+from src.common.tracing import configure_profiler
 from his_mon import setup_logging, ResourceMonitor
 
 _setup_done = False
@@ -18,11 +29,105 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    # TensorFlow는 첫 사용(또는 워밍업 스레드)에서 import되므로 /health는 바로 응답 가능
+    tf_runtime.configure(
+        intra_op_threads=app.config['TF_INTRA_OP_THREADS'],
+        inter_op_threads=app.config['TF_INTER_OP_THREADS'],
+        log_level=app.config['TF_LOG_LEVEL'],
+    )
+
     # 폴더 생성
     set_folder(app.config['MODEL_STORE_PATH'])
     
     # 모델 매니저 주입 (싱글톤처럼 앱 컨텍스트에 부착)
-    app.model_manager = ModelManager(app.config['MODEL_STORE_PATH'])
+    app.model_manager = ModelManager(
+        app.config['MODEL_STORE_PATH'],
+        max_cache_size=app.config['MODEL_CACHE_MAX_MODELS'],
+        cache_max_bytes=app.config['MODEL_CACHE_MAX_BYTES'],
+        cache_policy=app.config['MODEL_CACHE_POLICY'],
+        pinned_models=app.config['MODEL_CACHE_PINNED'],
+        batching=app.config['BATCHING_ENABLED'],
+        max_batch_size=app.config['BATCH_MAX_SIZE'],
+        max_batch_wait_ms=app.config['BATCH_MAX_WAIT_MS'],
+        fast_path=app.config['INFERENCE_FAST_PATH'],
+        max_upload_size=app.config['MAX_MODEL_FILE_SIZE'],
+        upload_spool_memory=app.config['UPLOAD_SPOOL_MAX_MEMORY'],
+        require_digest=app.config['UPLOAD_REQUIRE_DIGEST'],
+        index_path=app.config['MODEL_INDEX_PATH'],
+        index_flush_interval=app.config['MODEL_INDEX_FLUSH_INTERVAL'],
+        index_sync_interval=app.config['MODEL_INDEX_SYNC_INTERVAL'],
+        cleanup_enabled=app.config['BACKGROUND_TASKS'],
+        cleanup_interval=app.config['MODEL_CLEANUP_INTERVAL'],
+        max_idle_days=app.config['MODEL_MAX_IDLE_DAYS'],
+        store_max_bytes=app.config['MODEL_STORE_MAX_BYTES'],
+        mmap_weights=app.config['MODEL_MMAP_WEIGHTS'],
+        result_cache=ResultCache(
+            max_bytes=app.config['RESULT_CACHE_MAX_BYTES'],
+            ttl=app.config['RESULT_CACHE_TTL'],
+        ) if app.config['RESULT_CACHE_ENABLED'] else None,
+        convert_backends=app.config['BACKEND_CONVERT'],
+        convert_timeout=app.config['BACKEND_CONVERT_TIMEOUT'],
+        remote_store=create_remote_store(app.config['REMOTE_STORE_URL']),
+        fetch_workers=app.config['REMOTE_FETCH_WORKERS'],
+        fetch_chunk_size=app.config['REMOTE_FETCH_CHUNK_SIZE'],
+        remote_miss_ttl=app.config['REMOTE_MISS_TTL'],
+    )
+
+    # 곧 요청될 모델 사전 로드 (원격 -> 디스크, 캐시 여유가 있으면 메모리까지)
+    app.prefetcher = Prefetcher(
+        app.model_manager,
+        interval=app.config['PREFETCH_INTERVAL'],
+        top_n=app.config['PREFETCH_TOP_N'],
+    )
+    app.prefetcher.start()
+
+    # 모델 워밍업 (백그라운드로 미리 로드, 완료 전까지 /ready는 503)
+    # 클러스터 워커는 라우터와 같은 해시 링으로 자신이 담당하는 모델만 워밍업
+    owns = None
+    if app.config['CLUSTER_WORKER_URLS'] and app.config['CLUSTER_WORKER_URL']:
+        ring = ConsistentHashRing(app.config['CLUSTER_WORKER_URLS'])
+        worker_url = app.config['CLUSTER_WORKER_URL']
+        owns = lambda model_hash: ring.get_node(model_hash) == worker_url
+    app.warmer = ModelWarmer(
+        app.model_manager,
+        hashes=app.config['WARMUP_HASHES'],
+        top_n=app.config['WARMUP_TOP_N'],
+        on_upload=app.config['WARMUP_ON_UPLOAD'],
+        batch_sizes=app.config['WARMUP_BATCH_SIZES'],
+        preload_backend=app.config['TF_PRELOAD'],
+        owns=owns,
+    )
+    app.warmer.start()
+
+    # /predict 추론 스케줄러 (모델별 대기열, 적응형 동시 실행 한도, 우선순위)
+    app.scheduler = InferenceScheduler(
+        app.model_manager,
+        workers=app.config['SCHEDULER_WORKERS'],
+        max_queue_per_model=app.config['SCHEDULER_MAX_QUEUE_PER_MODEL'],
+        max_concurrency_per_model=app.config['SCHEDULER_MAX_CONCURRENCY_PER_MODEL'],
+        target_latency_ms=app.config['SCHEDULER_TARGET_LATENCY_MS'],
+        aging_ms=app.config['SCHEDULER_AGING_MS'],
+    ) if app.config['SCHEDULER_ENABLED'] else None
+    if app.scheduler is not None:
+        app.model_manager.removal_listeners.append(app.scheduler.remove_model)
+
+    # 여러 모델 예측 (입력 한 번 변환, 모델별 병렬 실행)
+    app.multi_predictor = MultiModelPredictor(
+        app.model_manager,
+        workers=app.config['MULTI_PREDICT_WORKERS'],
+        max_models=app.config['MULTI_PREDICT_MAX_MODELS'],
+        timeout_ms=app.config['MULTI_PREDICT_TIMEOUT_MS'],
+    )
+
+    # 대량 예측 작업 관리자 (중단된 작업 재개)
+    app.job_manager = BatchJobManager(
+        app.config['JOB_STORE_PATH'],
+        app.model_manager,
+        workers=app.config['JOB_WORKERS'],
+        batch_size=app.config['JOB_BATCH_SIZE'],
+    )
+    if app.config['BACKGROUND_TASKS']:
+        app.job_manager.resume_pending()
 
     if not _setup_done:
         # 로깅 설정
@@ -32,10 +137,20 @@ def create_app(config_class=Config):
             tags=Config.LOKI_TAGS,
         )
 
-        # 리소스 모니터 시작
-        metrics = get_metrics()
-        monitor = ResourceMonitor(metrics_obj=metrics, interval=5)
-        monitor.start()
+        # 지연 시간 메트릭 라벨 한도 및 느린 요청 프로파일러
+        get_metrics().max_model_labels = app.config['METRICS_MAX_MODEL_LABELS']
+        configure_profiler(
+            app.config['PROFILE_SAMPLE_RATE'],
+            top_n=app.config['PROFILE_TOP_N'],
+            report_interval=app.config['PROFILE_REPORT_INTERVAL'],
+            sample_interval_ms=app.config['PROFILE_SAMPLE_INTERVAL_MS'],
+        )
+
+        # 리소스 모니터 시작 (클러스터에서는 백그라운드 작업 담당 워커만)
+        if app.config['BACKGROUND_TASKS']:
+            metrics = get_metrics()
+            monitor = ResourceMonitor(metrics_obj=metrics, interval=5)
+            monitor.start()
 
         globals()["_setup_done"] = True
 
@@ -43,6 +158,7 @@ def create_app(config_class=Config):
     app.register_blueprint(health_bp)
     app.register_blueprint(metrics_bp)
     app.register_blueprint(model_bp)
+    app.register_blueprint(job_bp)
 
     return app
 
@@ -0,0 +1,280 @@
+#router
+import http.client
+import itertools
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlsplit
+
+from src.common import tensor_codec
+from src.common.metrics import collect_latest
+from src.core.hash_ring import ConsistentHashRing
+from src.core.multi_predict import ENSEMBLE_METHODS, ensemble_result
+
+# 프록시가 그대로 전달하지 않는 hop-by-hop 헤더
+_HOP_BY_HOP = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailers', 'transfer-encoding', 'upgrade',
+}
+_CHUNK_SIZE = 64 * 1024
+# 이 크기 이하의 요청 본문은 메모리에 읽어 두어 연결이 끊기면 재시도
+_BUFFERED_BODY_LIMIT = 1024 * 1024
+
+class _BodyReader:
+    """Content-Length 바이트까지만 읽는 요청 본문 래퍼
+
+    keep-alive 연결의 wsgi.input은 본문이 끝나도 EOF를 주지 않으므로, http.client가 EOF까지 읽지 않도록 길이를 제한한다.
+    """
+
+    def __init__(self, stream, length: int):
+        self._stream = stream
+        self._remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._stream.read(size)
+        self._remaining -= len(data)
+        if not data:
+            self._remaining = 0
+        return data
+
+class ModelRouter:
+    """모델 해시 기반 프런트 라우터 (WSGI)
+
+    `hash` 쿼리 파라미터가 있는 요청은 일관된 해싱으로 항상 같은 워커에 보내 모델이 한 워커에만 로드되게 하고,
+    해시가 없는 요청(작업 조회 등)은 워커에 순서대로 분배한다. `/health`와 `/metrics`는 라우터가 직접 응답하며,
+    `/metrics`는 멀티프로세스 모드에서 모든 워커의 값을 합산한다.
+    `/predict_multi`의 해시 목록은 담당 워커별로 나눠 병렬로 보내고, 결과를 합쳐 앙상블은 라우터에서 계산한다.
+    """
+
+    def __init__(self, worker_urls: Iterable[str], timeout: float = 60, replicas: int = 100,
+                 max_multi_models: int = 0):
+        self.workers: List[str] = list(worker_urls)
+        self.ring = ConsistentHashRing(self.workers, replicas=replicas)
+        self.timeout = timeout
+        # /predict_multi 요청당 모델 수 한도 (워커별로 나눠 보내므로 라우터에서 확인, 0 = 워커에 맡김)
+        self.max_multi_models = max_multi_models
+        self._fanout = ThreadPoolExecutor(max_workers=4 * max(len(self.workers), 1), thread_name_prefix='router-fanout')
+        self.logger = logging.getLogger(__name__)
+        self._round_robin = itertools.cycle(self.workers)
+        self._round_robin_lock = threading.Lock()
+        self._local = threading.local()
+
+    def worker_for(self, model_hash: str) -> str:
+        return self.ring.get_node(model_hash)
+
+    def _next_worker(self) -> str:
+        with self._round_robin_lock:
+            return next(self._round_robin)
+
+    def _connection(self, worker_url: str) -> http.client.HTTPConnection:
+        """스레드별 keep-alive 연결 재사용"""
+        connections: Dict[str, http.client.HTTPConnection] = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        conn = connections.get(worker_url)
+        if conn is None:
+            parts = urlsplit(worker_url)
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=self.timeout)
+            connections[worker_url] = conn
+        return conn
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '/')
+        if path == '/health':
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            return [b'Healthy']
+        if path == '/metrics':
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            return [collect_latest()]
+        if path == '/ready':
+            return self._readiness(start_response)
+
+        query = environ.get('QUERY_STRING', '')
+        model_hash = parse_qs(query).get('hash', [None])[0]
+        worker_url = self.worker_for(model_hash) if model_hash else self._next_worker()
+        try:
+            if path == '/predict_multi':
+                groups = self._group_by_worker(query)
+                too_many = self.max_multi_models and sum(map(len, groups.values())) > self.max_multi_models
+                if len(groups) > 1 or too_many:
+                    return self._predict_multi(groups, environ, start_response)
+                worker_url = next(iter(groups), worker_url)
+            return self._proxy(worker_url, environ, start_response)
+        except (OSError, http.client.HTTPException) as e:
+            self.logger.error(f"Proxy to {worker_url} failed: {e}")
+            getattr(self._local, 'connections', {}).pop(worker_url, None)
+            start_response('502 Bad Gateway', [('Content-Type', 'application/json')])
+            return [b'{"error": "Worker unavailable"}']
+
+    def _readiness(self, start_response):
+        """모든 워커가 ready일 때만 200"""
+        not_ready = []
+        for worker_url in self.workers:
+            try:
+                conn = self._connection(worker_url)
+                conn.request('GET', '/ready')
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    not_ready.append(worker_url)
+            except (OSError, http.client.HTTPException):
+                getattr(self._local, 'connections', {}).pop(worker_url, None)
+                not_ready.append(worker_url)
+        body = json.dumps({'ready': not not_ready, 'not_ready': not_ready}).encode()
+        start_response('200 OK' if not not_ready else '503 Service Unavailable',
+                       [('Content-Type', 'application/json')])
+        return [body]
+
+    def _group_by_worker(self, query: str) -> Dict[str, List[str]]:
+        """/predict_multi 해시 목록(쉼표 구분, hash 반복 가능)을 담당 워커별로 묶음"""
+        groups: Dict[str, List[str]] = {}
+        model_hashes = [h for value in parse_qs(query).get('hash', []) for h in value.split(',') if h]
+        for model_hash in dict.fromkeys(model_hashes):
+            groups.setdefault(self.worker_for(model_hash), []).append(model_hash)
+        return groups
+
+    def _predict_multi(self, groups: Dict[str, List[str]], environ, start_response):
+        """담당 워커마다 자기 모델만 예측하도록 나눠 보내고 모델별 결과를 합침 (모델은 담당 워커에만 로드)"""
+        params = parse_qsl(environ.get('QUERY_STRING', ''), keep_blank_values=True)
+        model_hashes = [h for hashes in groups.values() for h in hashes]
+        method = dict(params).get('ensemble')
+        if self.max_multi_models and len(model_hashes) > self.max_multi_models:
+            return self._json(start_response, 400, {'error': f'At most {self.max_multi_models} models per request'})
+        if method and method not in ENSEMBLE_METHODS:
+            return self._json(start_response, 400, {'error': f'Unknown ensemble method: {method}'})
+
+        # 같은 본문을 여러 워커에 보내야 하므로 메모리에 읽어 둠
+        body = b''.join(self._read_chunks(self._body_stream(environ)))
+        headers = self._forward_headers(environ)
+        headers['Content-Length'] = str(len(body))
+        params = [(key, value) for key, value in params if key not in ('hash', 'ensemble')]
+
+        def forward(worker_url: str, hashes: List[str]) -> Tuple[int, bytes]:
+            target = f"{environ.get('PATH_INFO')}?{urlencode(params + [('hash', ','.join(hashes))])}"
+            try:
+                response = self._send(worker_url, 'POST', target, body, headers)
+                return response.status, response.read()
+            except (OSError, http.client.HTTPException):
+                getattr(self._local, 'connections', {}).pop(worker_url, None)
+                raise
+
+        futures = {worker_url: self._fanout.submit(forward, worker_url, hashes) for worker_url, hashes in groups.items()}
+        results: Dict[str, Dict] = {}
+        for worker_url, future in futures.items():
+            try:
+                status, payload = future.result()
+            except (OSError, http.client.HTTPException) as e:
+                self.logger.error(f"Proxy to {worker_url} failed: {e}")
+                results.update({h: {'status': 502, 'error': 'Worker unavailable'} for h in groups[worker_url]})
+                continue
+            if status != 200:
+                # 입력 형식 오류 등 요청 자체의 오류는 워커 응답을 그대로 전달
+                start_response(f'{status} {HTTPStatus(status).phrase}', [('Content-Type', 'application/json')])
+                return [payload]
+            results.update(json.loads(payload)['results'])
+
+        response = {'results': {h: results[h] for h in model_hashes}}
+        if method:
+            response['ensemble'] = tensor_codec.to_jsonable(ensemble_result(method, results, model_hashes))
+        return self._json(start_response, 200, response)
+
+    @staticmethod
+    def _json(start_response, status: int, payload) -> List[bytes]:
+        start_response(f'{status} {HTTPStatus(status).phrase}', [('Content-Type', 'application/json')])
+        return [json.dumps(payload).encode()]
+
+    @staticmethod
+    def _forward_headers(environ) -> Dict[str, str]:
+        """hop-by-hop 헤더를 제외한 요청 헤더"""
+        headers = {
+            key[5:].replace('_', '-').title(): value
+            for key, value in environ.items()
+            if key.startswith('HTTP_') and key[5:].replace('_', '-').lower() not in _HOP_BY_HOP
+        }
+        if environ.get('CONTENT_TYPE'):
+            headers['Content-Type'] = environ['CONTENT_TYPE']
+        return headers
+
+    @staticmethod
+    def _body_stream(environ):
+        """요청 본문 스트림 (Content-Length가 있으면 그 길이까지만 읽음)"""
+        if not environ.get('CONTENT_LENGTH') and 'chunked' in environ.get('HTTP_TRANSFER_ENCODING', '').lower():
+            return environ['wsgi.input']
+        return _BodyReader(environ['wsgi.input'], int(environ.get('CONTENT_LENGTH') or 0))
+
+    def _send(self, worker_url: str, method: str, target: str, body, headers: Dict[str, str]) -> http.client.HTTPResponse:
+        """워커에 요청을 보내고 응답 헤더까지 받음 (끊어진 keep-alive 연결은 본문을 다시 보낼 수 있을 때 한 번 재연결)"""
+        conn = self._connection(worker_url)
+        try:
+            conn.request(method, target, body=body, headers=headers)
+            return conn.getresponse()
+        except (OSError, http.client.HTTPException):
+            # 스트리밍 중인 본문은 재전송 불가
+            conn.close()
+            if body is not None and not isinstance(body, bytes):
+                raise
+            conn.request(method, target, body=body, headers=headers)
+            return conn.getresponse()
+
+    def _proxy(self, worker_url: str, environ, start_response):
+        """요청 본문과 응답을 청크 단위로 중계"""
+        path = environ.get('PATH_INFO', '/')
+        query = environ.get('QUERY_STRING', '')
+        target = f'{path}?{query}' if query else path
+
+        headers = self._forward_headers(environ)
+        body = None
+        if not environ.get('CONTENT_LENGTH') and 'chunked' in environ.get('HTTP_TRANSFER_ENCODING', '').lower():
+            # 길이를 모르는 chunked 본문은 서버가 디코딩한 wsgi.input을 EOF까지 읽어 전달
+            # (Content-Length 없이 이터레이터를 넘기면 http.client가 chunked로 다시 인코딩)
+            body = self._read_chunks(environ['wsgi.input'])
+            length = 0
+        else:
+            length = int(environ.get('CONTENT_LENGTH') or 0)
+            headers['Content-Length'] = str(length)
+        if length:
+            body = environ['wsgi.input']
+            if length <= _BUFFERED_BODY_LIMIT:
+                body = body.read(length)
+            else:
+                body = _BodyReader(body, length)
+
+        response = self._send(worker_url, environ['REQUEST_METHOD'], target, body, headers)
+        response_headers = [
+            (key, value) for key, value in response.getheaders()
+            if key.lower() not in _HOP_BY_HOP
+        ]
+        start_response(f'{response.status} {response.reason}', response_headers)
+        return self._stream(response)
+
+    @staticmethod
+    def _read_chunks(stream):
+        while True:
+            chunk = stream.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+    @staticmethod
+    def _stream(response):
+        while True:
+            chunk = response.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+def create_router(worker_urls: Optional[Iterable[str]] = None, timeout: Optional[float] = None) -> ModelRouter:
+    """프런트 라우터 팩토리 함수 (인자를 생략하면 CLUSTER_WORKER_URLS, ROUTER_TIMEOUT 설정 사용 - gunicorn 진입점)"""
+    from src.config import Config
+    return ModelRouter(
+        Config.CLUSTER_WORKER_URLS if worker_urls is None else worker_urls,
+        timeout=Config.ROUTER_TIMEOUT if timeout is None else timeout,
+        max_multi_models=Config.MULTI_PREDICT_MAX_MODELS,
+    )
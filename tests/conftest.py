@@ -1,14 +1,21 @@
 import pytest
 from prometheus_client import REGISTRY
 
+from src.config import Config
 from src.main import create_app
 
 @pytest.fixture
-def app():
-    """테스트용 Flask 애플리케이션을 반환하는 fixture"""
-    app = create_app()
+def app(tmp_path):
+    """테스트용 Flask 애플리케이션을 반환하는 fixture (모델/작업 저장소는 테스트별 임시 폴더)"""
+    class TestConfig(Config):
+        MODEL_STORE_PATH = str(tmp_path / 'models')
+        MODEL_INDEX_PATH = str(tmp_path / 'models' / '.model_index.sqlite3')
+        JOB_STORE_PATH = str(tmp_path / 'jobs')
+
+    app = create_app(TestConfig)
     app.testing = True # 테스트 모드 설정
-    return app
+    yield app
+    app.model_manager.close()
 
 @pytest.fixture
 def client(app):
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import threading
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+
+from werkzeug.test import EnvironBuilder
+
+from src.asgi import AsyncModelApp
+from tests.test_upload_model import create_test_model_zip
+
+def make_app(app, **kwargs):
+    """ASGI 앱 생성 (Flask 라우트 테스트의 카운터 값과 섞이지 않도록 요청 메트릭은 모의 객체 사용)"""
+    asgi_app = AsyncModelApp(app, **kwargs)
+    asgi_app.metrics = MagicMock()
+    return asgi_app
+
+def call(asgi_app, method, path, query='', body=b'', headers=()):
+    """ASGI 앱을 한 번 호출해 (상태 코드, 헤더, 본문) 반환"""
+    return asyncio.run(_call(asgi_app, method, path, query, body, headers))
+
+async def _call(asgi_app, method, path, query='', body=b'', headers=()):
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': query.encode(),
+        'headers': [(k.lower().encode(), v.encode()) for k, v in headers],
+    }
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi_app(scope, receive, send)
+    response_headers = {k.decode().lower(): v.decode() for k, v in sent[0]['headers']}
+    return sent[0]['status'], response_headers, b''.join(m.get('body', b'') for m in sent[1:])
+
+@pytest.fixture
+def mocked_model(app):
+    """입력 합계를 돌려주는 모의 모델 등록"""
+    with patch('src.core.model_manager.os.walk') as mock_walk, \
+         patch('tensorflow.keras.models.load_model') as mock_load_model:
+        mock_walk.return_value = [('/fake/path', [], ['model.keras'])]
+        mock_model = MagicMock()
+        mock_model.predict.side_effect = lambda data: np.asarray(data).sum(axis=1, keepdims=True)
+        mock_load_model.return_value = mock_model
+
+        app.model_manager.metadata_store['asynchash1'] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+        app.model_manager.model_cache.clear()
+        yield mock_model
+
+def test_async_predict_success(app, mocked_model):
+    """ASGI 경로 예측 성공 테스트"""
+    asgi_app = make_app(app)
+
+    status, headers, body = call(asgi_app, 'POST', '/predict', 'hash=asynchash1',
+                                 json.dumps([[1.0, 2.0]]).encode(), [('Content-Type', 'application/json')])
+
+    assert status == 200
+    assert headers['content-type'] == 'application/json'
+    assert json.loads(body)['prediction'] == [[3.0]]
+    assert 'queue;dur=' in headers['server-timing']
+    asgi_app.metrics.increment_predictions_completed.assert_called_once()
+
+def test_async_predict_errors(app):
+    """데이터 누락 400, 없는 모델 404 테스트"""
+    asgi_app = make_app(app)
+
+    status, _, body = call(asgi_app, 'POST', '/predict', 'hash=asynchash1', b'{}',
+                           [('Content-Type', 'application/json')])
+    assert status == 400
+    assert 'Missing' in json.loads(body)['error']
+
+    status, _, body = call(asgi_app, 'POST', '/predict', 'hash=nonexistent', b'[[0.5, 0.5]]',
+                           [('Content-Type', 'application/json')])
+    assert status == 404
+    assert json.loads(body)['error'] == 'Model not found'
+
+def test_async_queue_full_returns_429(app, mocked_model, get_metric_value):
+    """모델별 대기열이 가득 차면 429로 거절하는지 테스트"""
+    release = threading.Event()
+    mocked_model.predict.side_effect = lambda data: (release.wait(5), np.asarray(data))[1]
+    asgi_app = make_app(app, workers=1, max_queue_per_model=1)
+    headers = [('Content-Type', 'application/json')]
+
+    async def scenario():
+        first = asyncio.create_task(_call(asgi_app, 'POST', '/predict', 'hash=asynchash1', b'[[1.0]]', headers))
+        while asgi_app.executor.queue_depth('asynchash1') == 0:
+            await asyncio.sleep(0.01)
+        second = await _call(asgi_app, 'POST', '/predict', 'hash=asynchash1', b'[[2.0]]', headers)
+        release.set()
+        return await first, second
+
+    first, second = asyncio.run(scenario())
+    assert first[0] == 200
+    assert second[0] == 429
+    assert second[1]['retry-after'] == '1'
+    asgi_app.metrics.increment_error_count.assert_called_with('predict_queue_full')
+    assert get_metric_value('async_rejections', {'reason': 'queue_full'}) >= 1
+    assert asgi_app.executor.queue_depth('asynchash1') == 0
+
+def test_async_expired_request_never_reaches_model(app, mocked_model):
+    """마감이 지난 대기 요청은 504로 응답하고 모델을 호출하지 않는지 테스트"""
+    release = threading.Event()
+    mocked_model.predict.side_effect = lambda data: (release.wait(5), np.asarray(data))[1]
+    asgi_app = make_app(app, workers=1)
+    headers = [('Content-Type', 'application/json')]
+
+    async def scenario():
+        first = asyncio.create_task(_call(asgi_app, 'POST', '/predict', 'hash=asynchash1', b'[[1.0]]', headers))
+        while asgi_app.executor.queue_depth('asynchash1') == 0:
+            await asyncio.sleep(0.01)
+        second = await _call(asgi_app, 'POST', '/predict', 'hash=asynchash1', b'[[2.0]]',
+                             headers + [('X-Request-Timeout-Ms', '50')])
+        release.set()
+        return await first, second
+
+    first, second = asyncio.run(scenario())
+    assert first[0] == 200
+    assert second[0] == 504
+    assert mocked_model.predict.call_count == 1
+
+def test_async_get_model_and_fallback_routes(app):
+    """get_model 처리와 나머지 경로의 Flask 위임 테스트"""
+    asgi_app = make_app(app)
+
+    status, _, body = call(asgi_app, 'GET', '/get_model', 'hash=nonexistent')
+    assert status == 404
+    assert json.loads(body)['error'] == 'No such model'
+
+    status, _, body = call(asgi_app, 'GET', '/health')
+    assert status == 200
+    assert body == b'Healthy'
+
+    status, _, body = call(asgi_app, 'POST', '/upload_model', 'hash=abc')
+    assert status == 400
+    assert 'Missing' in json.loads(body)['error']
+
+def test_async_upload_model(app, tmp_path):
+    """multipart 및 application/zip 본문 업로드 테스트"""
+    asgi_app = make_app(app)
+
+    builder = EnvironBuilder(method='POST', data={'model_file': (create_test_model_zip(), 'model.zip')})
+    environ = builder.get_environ()
+    status, _, body = call(asgi_app, 'POST', '/upload_model', 'hash=asyncupload1',
+                           environ['wsgi.input'].read(), [('Content-Type', environ['CONTENT_TYPE'])])
+    assert status == 200
+    assert 'asyncupload1' in app.model_manager.metadata_store
+
+    status, _, body = call(asgi_app, 'POST', '/upload_model', 'hash=asyncupload2',
+                           create_test_model_zip().getvalue(), [('Content-Type', 'application/zip')])
+    assert status == 200
+    assert (tmp_path / 'models' / 'asyncupload2').is_dir()
+
+def test_shares_flask_scheduler(app):
+    """Flask 앱의 추론 스케줄러를 공유하고, 공유한 스케줄러는 ASGI 실행기가 종료하지 않는지 테스트"""
+    from src.core.scheduler import InferenceScheduler
+
+    scheduler = InferenceScheduler(app.model_manager, workers=1)
+    asgi_app = make_app(app, scheduler=scheduler)
+    assert asgi_app.executor.scheduler is scheduler
+
+    asgi_app.executor.shutdown()
+    with patch.object(app.model_manager, 'predict', return_value=(np.array([[1.0]]), 200)):
+        assert scheduler.submit('sharedhash1', [[1.0]]).result(timeout=5)[1] == 200
+    scheduler.shutdown()
@@ -0,0 +1,173 @@
+import io
+import os
+import threading
+import zipfile
+from unittest.mock import patch
+import numpy as np
+import pytest
+import tensorflow as tf
+from prometheus_client import REGISTRY
+
+from src.core import backends
+
+@pytest.fixture(scope='module')
+def keras_model_path(tmp_path_factory):
+    """변환 테스트용 작은 Keras 모델 저장"""
+    path = tmp_path_factory.mktemp('backend_model') / 'model.keras'
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(4,)),
+        tf.keras.layers.Dense(8, activation='relu'),
+        tf.keras.layers.Dense(2),
+    ])
+    model.save(str(path))
+    return str(path)
+
+def test_convert_and_validate_tflite(keras_model_path, tmp_path):
+    """TFLite 변환 결과가 원본 출력과 일치하고 지연 시간이 측정되는지 테스트"""
+    report = backends.convert_and_validate(keras_model_path, str(tmp_path), ['tflite', 'unknown'], iterations=2)
+
+    assert report['keras']['validated'] is True
+    assert report['tflite']['validated'] is True
+    assert report['tflite']['max_abs_error'] < backends.VALIDATION_ATOL
+    assert report['tflite']['latency_ms'] > 0
+    assert os.path.isfile(tmp_path / 'model.tflite')
+    assert report['unknown'] == {'validated': False, 'error': 'Unknown backend: unknown'}
+
+    runner = backends.load_backend('tflite', str(tmp_path / 'model.tflite'))
+    assert runner.inputs[0].shape == (None, 4)
+    assert runner.predict(np.ones((3, 4))).shape == (3, 2)
+
+def test_select_backend_prefers_fastest_validated():
+    """검증된 백엔드 중 가장 빠른 것을 선택하는지 테스트"""
+    report = {
+        'keras': {'validated': True, 'latency_ms': 1.0},
+        'tflite': {'validated': True, 'latency_ms': 0.1},
+        'onnx': {'validated': False, 'error': 'Outputs differ from the Keras model'},
+    }
+    assert backends.select_backend(report) == 'tflite'
+
+    report['tflite']['validated'] = False
+    assert backends.select_backend(report) == 'keras'
+    assert backends.select_backend({}) == 'keras'
+
+def test_manager_serves_selected_backend(client, keras_model_path, tmp_path):
+    """모델 관리자가 선택된 백엔드로 로드하고 수동 지정/해제가 반영되는지 테스트"""
+    backends.convert_and_validate(keras_model_path, str(tmp_path), ['tflite'], iterations=1)
+    manager = client.application.model_manager
+    manager.metadata_store['backendhash1'] = {
+        'file_path': str(tmp_path),
+        'keras_path': keras_model_path,
+        'used': '2024-04-27T12:00:00',
+        'backend': 'tflite',
+        'backends': {'keras': {'validated': True}, 'tflite': {'file': 'model.tflite', 'validated': True}},
+    }
+    manager.model_cache.clear()
+
+    assert isinstance(manager.load_model_to_cache('backendhash1'), backends.TFLiteRunner)
+    assert manager.get_model_info('backendhash1')['active_backend'] == 'tflite'
+
+    with pytest.raises(ValueError):
+        manager.set_backend('backendhash1', 'onnx')
+    assert manager.set_backend('backendhash1', 'keras') == 'keras'
+    engine = manager.load_model_to_cache('backendhash1')
+    assert not isinstance(engine, backends.TFLiteRunner)
+    assert manager.set_backend('backendhash1', None) == 'tflite'
+
+def test_missing_backend_file_falls_back_to_keras(client, keras_model_path, tmp_path):
+    """변환 파일을 읽을 수 없으면 Keras 모델로 대체되는지 테스트"""
+    manager = client.application.model_manager
+    manager.metadata_store['backendhash2'] = {
+        'file_path': str(tmp_path),
+        'keras_path': keras_model_path,
+        'used': '2024-04-27T12:00:00',
+        'backend': 'tflite',
+        'backends': {'tflite': {'file': 'model.tflite', 'validated': True}},
+    }
+    manager.model_cache.clear()
+
+    engine = manager.load_model_to_cache('backendhash2')
+    assert not isinstance(engine, backends.TFLiteRunner)
+    assert engine.predict(np.ones((1, 4))).shape == (1, 2)
+
+def test_mmap_weights_report_shared_memory(client, keras_model_path, tmp_path):
+    """mmap 모델은 delegate 없이 파일을 매핑해 로드하고 resident/shared 메모리를 기록하는지 테스트"""
+    backends.convert_and_validate(keras_model_path, str(tmp_path), ['tflite'], iterations=1)
+    manager = client.application.model_manager
+    manager.metadata_store['mmaphash1'] = {
+        'file_path': str(tmp_path),
+        'keras_path': keras_model_path,
+        'used': '2024-04-27T12:00:00',
+        'backend': 'tflite',
+        'mmap': True,
+        'backends': {'tflite': {'file': 'model.tflite', 'validated': True}},
+    }
+    manager.model_cache.clear()
+
+    runner = manager.load_model_to_cache('mmaphash1')
+    assert runner.mapped_path == os.path.realpath(tmp_path / 'model.tflite')
+    assert runner.predict(np.ones((2, 4))).shape == (2, 2)
+
+    client.get('/metrics')
+    resident = REGISTRY.get_sample_value('model_memory_bytes', {'model': 'mmaphash1', 'kind': 'resident'})
+    assert resident > 0
+    assert REGISTRY.get_sample_value('model_memory_bytes', {'model': 'mmaphash1', 'kind': 'shared'}) is not None
+
+    # 캐시에서 빠진 모델의 라벨은 제거
+    manager.model_cache.pop('mmaphash1')
+    manager.update_memory_metrics()
+    assert REGISTRY.get_sample_value('model_memory_bytes', {'model': 'mmaphash1', 'kind': 'resident'}) is None
+
+def test_set_model_backend_endpoint(client):
+    """백엔드 지정 엔드포인트의 오류 응답 테스트"""
+    response = client.post('/set_model_backend?hash=nosuchbackendhash&backend=tflite')
+    assert response.status_code == 404
+
+    response = client.post('/set_model_backend')
+    assert response.status_code == 400
+
+def test_upload_rejects_unvalidated_backend(client, keras_model_path):
+    """변환/검증되지 않은 백엔드를 지정한 업로드는 400으로 거절하고 설치하지 않는지 테스트"""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.write(keras_model_path, 'model.keras')
+    archive.seek(0)
+
+    response = client.post('/upload_model?hash=uploadbackend1&convert=&backend=tflite',
+                           data={'model_file': (archive, 'model.zip')}, content_type='multipart/form-data')
+
+    assert response.status_code == 400
+    assert 'not validated' in response.json['error']
+    manager = client.application.model_manager
+    assert 'uploadbackend1' not in manager.metadata_store
+    assert not os.path.exists(os.path.join(manager.staging_path, 'uploadbackend1'))
+
+def test_upload_converts_backends_in_background(client, keras_model_path):
+    """업로드는 Keras 모델을 바로 설치하고 백엔드 변환 결과는 백그라운드에서 끝난 뒤 적용하는지 테스트"""
+    release = threading.Event()
+
+    def convert(keras_path, out_dir, names, timeout):
+        release.wait(5)
+        open(os.path.join(out_dir, 'model.tflite'), 'wb').close()
+        return {'keras': {'validated': True, 'latency_ms': 2.0},
+                'tflite': {'file': 'model.tflite', 'validated': True, 'latency_ms': 1.0}}
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.write(keras_model_path, 'model.keras')
+    archive.seek(0)
+    manager = client.application.model_manager
+
+    with patch('src.core.backends.run_conversion', side_effect=convert):
+        response = client.post('/upload_model?hash=asyncconvert1&convert=tflite&backend=tflite',
+                               data={'model_file': (archive, 'model.zip')}, content_type='multipart/form-data')
+        assert response.status_code == 200
+        assert manager.active_backend('asyncconvert1') == 'keras'
+        assert manager.get_model_info('asyncconvert1')['conversion']['status'] == 'pending'
+        generation = manager.index.generation('asyncconvert1')
+        release.set()
+        manager._converter.submit(lambda: None).result(timeout=10)
+
+    assert manager.active_backend('asyncconvert1') == 'tflite'
+    assert manager.index.get('asyncconvert1')['conversion'] == {'status': 'done'}
+    assert manager.index.get('asyncconvert1')['backend_override'] == 'tflite'
+    assert manager.index.generation('asyncconvert1') == generation + 1
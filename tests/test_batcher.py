@@ -0,0 +1,65 @@
+import threading
+import numpy as np
+from unittest.mock import MagicMock
+from prometheus_client import REGISTRY
+
+from src.core.batcher import MicroBatcher
+
+def test_batcher_merges_concurrent_requests():
+    """동시 요청이 하나의 forward pass로 묶이는지 테스트"""
+    calls = []
+    def predict_fn(batch):
+        calls.append(batch.shape[0])
+        return batch * 2
+
+    batcher = MicroBatcher('batchhash1', predict_fn, max_batch_size=8, max_wait_ms=200)
+    results = {}
+
+    def worker(i):
+        results[i] = batcher.submit(np.array([[i, i]], dtype=np.float32))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.close()
+
+    # 각 요청은 자신의 행만 돌려받아야 함
+    for i in range(4):
+        assert results[i].tolist() == [[i * 2, i * 2]]
+    assert sum(calls) == 4
+    assert len(calls) < 4
+    assert REGISTRY.get_sample_value('batch_size_count') >= 1
+
+def test_batcher_splits_multi_output():
+    """다중 출력 모델의 결과 분배 테스트"""
+    batcher = MicroBatcher('batchhash2', lambda batch: [batch, batch.sum(axis=1)],
+                           max_batch_size=4, max_wait_ms=200)
+    results = {}
+
+    def worker(i):
+        results[i] = batcher.submit(np.array([[i, 1]] * (i + 1)))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.close()
+
+    assert results[1][0].shape == (2, 2)
+    assert results[1][1].tolist() == [2, 2]
+
+def test_batcher_propagates_errors():
+    """배치 예측 실패 시 요청에 예외가 전달되는지 테스트"""
+    predict_fn = MagicMock(side_effect=ValueError('boom'))
+    batcher = MicroBatcher('batchhash3', predict_fn, max_wait_ms=1)
+
+    try:
+        batcher.submit(np.array([[1.0]]))
+        assert False, 'expected ValueError'
+    except ValueError as e:
+        assert str(e) == 'boom'
+    finally:
+        batcher.close()
@@ -0,0 +1,107 @@
+import os
+from datetime import timedelta
+from unittest.mock import patch
+from prometheus_client import REGISTRY
+
+from src.common import utils
+from src.core.cleanup import UsageHeap
+from src.core.model_manager import ModelManager
+from tests.test_upload_model import create_test_model_zip
+
+def test_usage_heap_pops_only_expired():
+    """만료된 항목만 사용 시각 순으로 꺼내고, 이후 사용된 항목은 남기는지 테스트"""
+    heap = UsageHeap()
+    heap.update('a', 10)
+    heap.update('b', 20)
+    heap.update('c', 30)
+    heap.update('a', 40)  # 다시 사용됨
+
+    assert heap.pop_expired(35) == ['b', 'c']
+    assert 'a' in heap and len(heap) == 1
+
+    # 다른 프로세스에서 더 최근에 사용된 모델은 만료되지 않음
+    heap.update('d', 5)
+    assert heap.pop_expired(35, refresh=lambda model_hash: 50) == []
+    assert heap.last_used('d') == 50
+    assert heap.pop_oldest() == ('a', 40)
+
+def test_old_models_are_renamed_then_deleted(tmp_path):
+    """오래된 모델은 즉시 목록/폴더에서 빠지고 실제 삭제는 백그라운드에서 되는지 테스트"""
+    manager = ModelManager(str(tmp_path), cleanup_enabled=False)
+    manager.upload_model(create_test_model_zip(), 'cleanuphash1')
+    manager.upload_model(create_test_model_zip(), 'cleanuphash2')
+    metadata = manager.metadata_store['cleanuphash1']
+    metadata['used'] = utils.get_kr_time() - timedelta(days=8)
+    manager.index.upsert('cleanuphash1', metadata)
+    manager.usage.update('cleanuphash1', metadata['used'].timestamp())
+
+    manager.clean_old_models()
+
+    assert 'cleanuphash1' not in manager.metadata_store
+    assert 'cleanuphash1' not in manager.index.load_all()
+    assert not os.path.exists(tmp_path / 'cleanuphash1')
+    assert os.path.exists(tmp_path / 'cleanuphash2')
+    manager.trash.join()
+    assert os.listdir(tmp_path / '.trash') == []
+
+def test_disk_quota_evicts_least_recently_used(tmp_path):
+    """디스크 한도를 넘으면 가장 오래 사용되지 않은 모델부터 삭제하는지 테스트"""
+    manager = ModelManager(str(tmp_path), cleanup_enabled=False)
+    manager.upload_model(create_test_model_zip(), 'quotahash1')
+    model_bytes = manager.metadata_store['quotahash1']['disk_bytes']
+    manager.store_max_bytes = model_bytes * 2
+    manager.upload_model(create_test_model_zip(), 'quotahash2')
+    manager.index.touch('quotahash1')  # quotahash1이 더 최근에 사용됨 (정리 전에 인덱스에 반영)
+    before = REGISTRY.get_sample_value('models_removed_total', {'reason': 'quota'}) or 0
+
+    manager.upload_model(create_test_model_zip(), 'quotahash3')
+
+    assert set(manager.metadata_store) == {'quotahash1', 'quotahash3'}
+    assert not os.path.exists(tmp_path / 'quotahash2')
+    assert REGISTRY.get_sample_value('models_removed_total', {'reason': 'quota'}) == before + 1
+    assert REGISTRY.get_sample_value('model_store_bytes') == model_bytes * 2
+
+def test_disk_usage_is_tracked_without_rescanning(tmp_path):
+    """업로드/재업로드/삭제 시 인덱스의 저장소 사용량 합계를 갱신하고 기존 모델 폴더는 다시 계산하지 않는지 테스트"""
+    manager = ModelManager(str(tmp_path), cleanup_enabled=False, store_max_bytes=10 ** 9)
+    manager.upload_model(create_test_model_zip(), 'usagehash1')
+    manager.upload_model(create_test_model_zip(), 'usagehash2')
+    model_bytes = manager.metadata_store['usagehash1']['disk_bytes']
+    assert manager.index.store_bytes() == model_bytes * 2
+
+    manager.upload_model(create_test_model_zip(), 'usagehash2')
+    assert manager.index.store_bytes() == model_bytes * 2
+
+    with patch('src.core.model_manager.directory_size', return_value=model_bytes) as directory_size:
+        manager.upload_model(create_test_model_zip(), 'usagehash3')
+    assert directory_size.call_count == 1
+    assert manager.index.store_bytes() == model_bytes * 3
+
+    manager._remove_model('usagehash1', 'expired')
+    assert manager.index.store_bytes() == model_bytes * 2
+
+def test_disk_quota_sees_other_workers_models(tmp_path):
+    """디스크 한도를 다른 워커가 올린 모델까지 포함한 인덱스 기준으로 적용하는지 테스트"""
+    manager = ModelManager(str(tmp_path), cleanup_enabled=False, index_sync_interval=0)
+    other = ModelManager(str(tmp_path), cleanup_enabled=False, index_sync_interval=0)
+    other.upload_model(create_test_model_zip(), 'otherhash1')
+    model_bytes = other.index.store_bytes()
+    manager.store_max_bytes = model_bytes
+
+    manager.upload_model(create_test_model_zip(), 'ownhash1')
+
+    assert 'otherhash1' not in manager.index.load_all()
+    assert not os.path.exists(tmp_path / 'otherhash1')
+    other._sync_from_index()
+    assert 'otherhash1' not in other.metadata_store
+
+def test_index_sync_picks_up_other_workers_uploads(tmp_path):
+    """다른 프로세스가 인덱스에 등록한 모델도 정리 대상이 되는지 테스트"""
+    manager = ModelManager(str(tmp_path), cleanup_enabled=False)
+    other = ModelManager(str(tmp_path), cleanup_enabled=False)
+    other.upload_model(create_test_model_zip(), 'synchash1')
+
+    manager.clean_old_models()
+
+    assert 'synchash1' in manager.metadata_store
+    assert 'synchash1' in manager.usage
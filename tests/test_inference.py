@@ -0,0 +1,42 @@
+import numpy as np
+import tensorflow as tf
+from unittest.mock import MagicMock
+
+from src.core.inference import InferenceEngine
+
+def build_model():
+    inputs = tf.keras.Input(shape=(4,))
+    outputs = tf.keras.layers.Dense(2)(inputs)
+    return tf.keras.Model(inputs, outputs)
+
+def test_fast_path_matches_predict():
+    """fast path 결과가 model.predict와 같은지 테스트"""
+    model = build_model()
+    engine = InferenceEngine(model)
+    data = np.random.rand(3, 4).astype(np.float32)
+
+    result = engine.predict(data)
+
+    assert engine.enabled
+    assert result.shape == (3, 2)
+    np.testing.assert_allclose(result, model.predict(data, verbose=0), rtol=1e-5, atol=1e-6)
+
+def test_fast_path_buckets_bound_retracing():
+    """같은 bucket의 배치 크기는 하나의 시그니처를 공유하는지 테스트"""
+    engine = InferenceEngine(build_model(), buckets=(4, 8))
+
+    for rows in (1, 3, 4):
+        engine.predict(np.zeros((rows, 4), dtype=np.float32))
+    assert engine.signature_count == 1
+
+    engine.predict(np.zeros((6, 4), dtype=np.float32))
+    assert engine.signature_count == 2
+
+def test_fast_path_opt_out_and_fallback():
+    """opt-out 또는 Keras 모델이 아닌 경우 model.predict 사용 테스트"""
+    mock_model = MagicMock()
+    mock_model.predict.return_value = np.array([[0.8, 0.2]])
+    assert not InferenceEngine(mock_model).enabled
+    assert InferenceEngine(mock_model).predict(np.zeros((1, 2))).tolist() == [[0.8, 0.2]]
+
+    assert not InferenceEngine(build_model(), enabled=False).enabled
@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.core.input_spec import InputSpec, InvalidInputError, spec_from_engine
+
+def test_coerce_converts_to_native_dtype():
+    """JSON 리스트는 모델 dtype으로 바로 변환되고, 같은 dtype 배열은 복사되지 않는지 테스트"""
+    spec = InputSpec((None, 2), np.dtype('float32'))
+
+    assert spec.coerce([[1, 2], [3, 4]]).dtype == np.float32
+    array = np.ones((3, 2), dtype=np.float32)
+    assert spec.coerce(array) is array
+    assert spec.coerce(np.ones((1, 2))).dtype == np.float32
+
+@pytest.mark.parametrize('data', [
+    [[1.0, 2.0, 3.0]],        # 특성 수 불일치
+    [1.0, 2.0],               # 배치 차원 누락
+    [[1.0, 2.0], [3.0]],      # ragged
+    [['a', 'b']],             # 숫자가 아님
+])
+def test_coerce_rejects_mismatched_input(data):
+    """시그니처와 맞지 않는 입력은 InvalidInputError로 거절하는지 테스트"""
+    with pytest.raises(InvalidInputError):
+        InputSpec((None, 2), np.dtype('float32')).coerce(data)
+
+def test_integer_spec_rejects_fractional_values():
+    """정수 입력 모델에 소수 값이 들어오면 잘라내지 않고 거절하는지 테스트"""
+    spec = InputSpec((None, 3), np.dtype('int32'))
+    assert spec.coerce([[1, 2, 3]]).dtype == np.int32
+    with pytest.raises(InvalidInputError):
+        spec.coerce([[1.5, 2, 3]])
+
+def test_narrowing_casts_keep_values():
+    """더 좁은 dtype으로의 변환은 값이 범위 안일 때만 허용되는지 테스트"""
+    spec = InputSpec((None, 2), np.dtype('float32'))
+    assert spec.coerce(np.array([[1, 2]])).dtype == np.float32
+    with pytest.raises(InvalidInputError):
+        spec.coerce(np.array([[1e300, 1.0]]))
+
+    spec = InputSpec((None, 2), np.dtype('int8'))
+    assert spec.coerce([[1, -2]]).dtype == np.int8
+    with pytest.raises(InvalidInputError):
+        spec.coerce([[1, 300]])
+
+def test_spec_round_trip_and_unknown_models():
+    """dict 직렬화 왕복과 시그니처를 알 수 없는 엔진 처리 테스트"""
+    spec = InputSpec((None, 4), np.dtype('float32'))
+    assert spec.to_dict() == {'shape': [None, 4], 'dtype': 'float32'}
+    assert InputSpec.from_dict(spec.to_dict()) == spec
+    assert spec_from_engine(MagicMock()) is None
+    assert spec_from_engine('hot_engine') is None
+
+@patch('src.api.model_routes.metrics')
+@patch('src.core.model_manager.os.walk')
+@patch('tensorflow.keras.models.load_model')
+def test_predict_validates_against_model_signature(mock_load_model, mock_walk, mock_metrics, client):
+    """로드 시 계산한 시그니처로 검증해 잘못된 요청은 추론 전에 400을 반환하는지 테스트"""
+    mock_walk.return_value = [('/fake/path', [], ['model.keras'])]
+    mock_model = MagicMock()
+    mock_model.inputs = [SimpleNamespace(shape=(None, 2), dtype='float32')]
+    mock_model.predict.return_value = np.array([[0.8, 0.2]])
+    mock_load_model.return_value = mock_model
+
+    manager = client.application.model_manager
+    manager.metadata_store['spechash1'] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+    manager.model_cache.clear()
+
+    response = client.post('/predict?hash=spechash1', json=[[1, 2]])
+    assert response.status_code == 200
+    assert mock_model.predict.call_args[0][0].dtype == np.float32
+
+    response = client.post('/predict?hash=spechash1', json=[[1, 2, 3]])
+    assert response.status_code == 400
+    assert 'does not match (?, 2)' in response.json['error']
+    assert mock_model.predict.call_count == 1
+    mock_metrics.increment_error_count.assert_called_with('predict_invalid_data')
+
+    response = client.get('/get_model?hash=spechash1')
+    assert response.json['message']['input_spec'] == {'shape': [None, 2], 'dtype': 'float32'}
+
+def test_ragged_input_for_unknown_signature_returns_400(client):
+    """시그니처를 모르는 모델에 ragged 입력이 오면 500이 아니라 400을 반환하는지 테스트"""
+    manager = client.application.model_manager
+    manager.metadata_store['raggedhash1'] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+
+    response = client.post('/predict?hash=raggedhash1', json=[[1.0, 2.0], [3.0]])
+    assert response.status_code == 400
+    assert 'cannot be converted' in response.json['error']
@@ -0,0 +1,112 @@
+import io
+import json
+import time
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.core.batch_jobs import BatchJobManager, COMPLETED
+
+@pytest.fixture
+def job_manager(client, tmp_path):
+    """임시 폴더를 쓰는 작업 관리자와 입력에 1을 더하는 모의 모델 등록"""
+    with patch('src.core.model_manager.os.walk') as mock_walk, \
+         patch('tensorflow.keras.models.load_model') as mock_load_model:
+        mock_walk.return_value = [('/fake/path', [], ['model.keras'])]
+        mock_model = MagicMock()
+        mock_model.predict.side_effect = lambda data: np.asarray(data) + 1
+        mock_load_model.return_value = mock_model
+
+        manager = client.application.model_manager
+        manager.metadata_store['jobhash123'] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+        manager.model_cache.clear()
+
+        job_manager = BatchJobManager(str(tmp_path / 'jobs'), manager, workers=1, batch_size=2)
+        client.application.job_manager = job_manager
+        yield job_manager
+        job_manager.shutdown()
+
+def wait_for(client, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(f'/jobs/{job_id}').json
+        if job['status'] not in ('queued', 'running'):
+            return job
+        time.sleep(0.02)
+    raise AssertionError('job did not finish')
+
+def test_jsonl_job_end_to_end(client, job_manager):
+    """JSONL 작업 제출 -> 상태 조회 -> 결과 다운로드 테스트"""
+    lines = [json.dumps([i, i]) for i in range(4)] + [json.dumps({'id': 'last', 'data': [9, 9]})]
+    response = client.post('/jobs?hash=jobhash123',
+                           data={'input_file': (io.BytesIO('\n'.join(lines).encode()), 'rows.jsonl')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 202
+
+    job = wait_for(client, response.json['job_id'])
+    assert job['status'] == COMPLETED
+    assert job['committed_rows'] == 5
+    assert job['rows_per_sec'] > 0
+
+    result = client.get(f"/jobs/{job['job_id']}/result")
+    records = [json.loads(line) for line in result.data.decode().splitlines()]
+    assert [r['index'] for r in records] == list(range(5))
+    assert records[1]['prediction'] == [2, 2]
+    assert records[4] == {'index': 4, 'prediction': [10, 10], 'id': 'last'}
+
+def test_npy_job(client, job_manager):
+    """npy 입력 작업 테스트"""
+    buffer = io.BytesIO()
+    np.save(buffer, np.zeros((3, 2), dtype=np.float32))
+    buffer.seek(0)
+    response = client.post('/jobs?hash=jobhash123', data={'input_file': (buffer, 'rows.npy')},
+                           content_type='multipart/form-data')
+
+    job = wait_for(client, response.json['job_id'])
+    assert job['status'] == COMPLETED
+    assert job['committed_rows'] == 3
+
+def test_job_resumes_from_last_commit(client, job_manager):
+    """커밋 이후 기록된 불완전한 출력을 버리고 이어서 처리하는지 테스트"""
+    rows = b'[0, 0]\n[1, 1]\n[2, 2]\n'
+    job = job_manager.create_job('jobhash123', MagicMock(save=lambda path: open(path, 'wb').write(rows)), 'jsonl')
+    wait_for(client, job['job_id'])
+
+    # 첫 청크(2행)만 커밋된 상태에서 중단된 것처럼 상태를 되돌림
+    output_path = job_manager.output_path(job['job_id'])
+    committed = open(output_path, 'rb').read().split(b'\n', 2)
+    state = job_manager.get_job(job['job_id'])
+    state.update(status='running', committed_rows=2, input_offset=len(b'[0, 0]\n[1, 1]\n'),
+                 output_bytes=len(committed[0]) + len(committed[1]) + 2)
+    job_manager._write_state(state)
+    with open(output_path, 'ab') as f:
+        f.write(b'{"index": 2, "partial')
+
+    assert job_manager.resume_pending() == [job['job_id']]
+    job = wait_for(client, job['job_id'])
+    records = [json.loads(line) for line in open(output_path).read().splitlines()]
+    assert [r['index'] for r in records] == [0, 1, 2]
+
+def test_job_errors(client, job_manager):
+    """작업 관련 오류 응답 테스트"""
+    assert client.post('/jobs?hash=jobhash123').status_code == 400
+    response = client.post('/jobs?hash=missing123', data={'input_file': (io.BytesIO(b'[1]'), 'a.jsonl')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 404
+    assert client.get('/jobs/unknownjob').status_code == 404
+
+def test_job_for_model_only_in_shared_tier(client, job_manager):
+    """이 워커의 메타데이터에 없는 모델도 ensure_local로 가져와 작업을 등록하는지 테스트"""
+    manager = client.application.model_manager
+    with patch.object(manager, 'ensure_local', return_value=True) as ensure_local:
+        response = client.post('/jobs?hash=remotehash1', data={'input_file': (io.BytesIO(b'[1]'), 'a.jsonl')},
+                               content_type='multipart/form-data')
+    assert response.status_code == 202
+    ensure_local.assert_called_once_with('remotehash1')
+
+def test_dict_outputs_are_written_per_row():
+    """이름 있는 다중 출력이 행마다 {이름: 값}으로 기록되는지 테스트"""
+    prediction = {'score': np.array([[0.1], [0.2]]), 'label': np.array([1, 0])}
+    lines = BatchJobManager._format_rows(prediction, [None, 'b'], 4).decode().splitlines()
+    assert json.loads(lines[0]) == {'index': 4, 'prediction': {'score': [0.1], 'label': 1}}
+    assert json.loads(lines[1]) == {'index': 5, 'prediction': {'score': [0.2], 'label': 0}, 'id': 'b'}
@@ -0,0 +1,70 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from src.core.model_cache import EvictionPolicy, ModelCache
+
+def test_cache_evicts_under_byte_budget():
+    """바이트 예산 초과 시 LRU 순서로 축출되는지 테스트"""
+    cache = ModelCache(max_bytes=100, max_entries=10)
+    cache.put('a', 'model_a', size_bytes=40)
+    cache.put('b', 'model_b', size_bytes=40)
+    cache.get('a')
+    cache.put('c', 'model_c', size_bytes=40)
+
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+    assert cache.total_bytes == 80
+    assert REGISTRY.get_sample_value('model_cache_bytes', {'model': 'c'}) == 40
+    assert REGISTRY.get_sample_value('model_cache_bytes', {'model': 'b'}) is None
+    assert REGISTRY.get_sample_value('model_cache_evictions_total', {'policy': 'lru'}) >= 1
+
+def test_cache_refuses_entry_larger_than_budget():
+    """바이트 예산보다 큰 모델은 다른 모델을 축출하지 않고 캐시하지 않는지 테스트"""
+    cache = ModelCache(max_bytes=100, max_entries=10)
+    cache.put('a', 'model_a', size_bytes=40)
+
+    assert cache.put('huge', 'model_huge', size_bytes=150) is False
+    assert 'huge' not in cache and 'a' in cache
+    assert cache.total_bytes == 40
+
+def test_cache_never_evicts_pinned():
+    """고정된 모델은 축출되지 않는지 테스트"""
+    cache = ModelCache(max_entries=2, pinned=['a'])
+    cache.put('a', 'model_a')
+    cache.put('b', 'model_b')
+    cache.put('c', 'model_c')
+
+    assert 'a' in cache
+    assert 'b' not in cache
+
+def test_cache_lfu_policy():
+    """LFU 정책은 적중 횟수가 적은 모델을 축출하는지 테스트"""
+    cache = ModelCache(max_entries=2, policy='lfu')
+    cache.put('a', 'model_a')
+    cache.put('b', 'model_b')
+    for _ in range(3):
+        cache.get('a')
+    cache.get('b')
+    cache.put('c', 'model_c')
+
+    assert 'a' in cache
+    assert 'b' not in cache
+
+def test_cache_cost_policy_keeps_expensive_models():
+    """cost 정책은 다시 로드하는 비용이 큰 모델을 유지하는지 테스트"""
+    cache = ModelCache(max_entries=2, policy='cost')
+    cache.put('slow', 'model_slow', load_time=5.0)
+    cache.put('fast', 'model_fast', load_time=0.1)
+    cache.get('slow')
+    cache.put('new', 'model_new', load_time=1.0)
+
+    assert 'slow' in cache
+    assert 'fast' not in cache
+
+def test_cache_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        ModelCache(policy='random')
+
+def test_eviction_policy_requires_victim():
+    with pytest.raises(TypeError):
+        EvictionPolicy()
@@ -0,0 +1,90 @@
+import pytest
+from src.common import utils
+from src.core.model_index import ModelIndex
+
+def test_index_roundtrip(tmp_path):
+    """인덱스에 기록한 메타데이터가 다시 열었을 때 복원되는지 테스트"""
+    path = str(tmp_path / 'index.sqlite3')
+    index = ModelIndex(path)
+    uploaded = utils.get_kr_time()
+    index.upsert('indexhash1', {
+        'file_path': '/store/indexhash1',
+        'keras_path': '/store/indexhash1/model.keras',
+        'size': 123,
+        'uploaded': uploaded,
+        'used': uploaded,
+        'fast_path': False,
+    })
+    index.close()
+
+    metadata = ModelIndex(path).load_all()['indexhash1']
+    assert metadata['keras_path'] == '/store/indexhash1/model.keras'
+    assert metadata['size'] == 123
+    assert metadata['fast_path'] is False
+    assert abs(metadata['used'].timestamp() - uploaded.timestamp()) < 1e-3
+
+def test_index_batches_usage_updates(tmp_path):
+    """사용 기록은 flush 시점에 한 번에 반영되는지 테스트"""
+    index = ModelIndex(str(tmp_path / 'index.sqlite3'))
+    index.upsert('indexhash2', {'file_path': '/store/indexhash2', 'used': 0})
+
+    for _ in range(3):
+        index.touch('indexhash2')
+    assert index.load_all()['indexhash2']['hits'] == 0
+
+    index.flush()
+    metadata = index.load_all()['indexhash2']
+    assert metadata['hits'] == 3
+    assert metadata['used'].timestamp() > 0
+
+def test_manager_loads_from_index(tmp_path):
+    """매니저가 디렉터리 스캔 없이 인덱스에서 메타데이터를 읽는지 테스트"""
+    from src.core.model_manager import ModelManager
+
+    store = tmp_path / 'store'
+    (store / 'legacyhash1').mkdir(parents=True)
+    manager = ModelManager(str(store))
+    assert 'legacyhash1' in manager.metadata_store
+
+    # 인덱스가 채워진 뒤에는 디스크에만 있는 폴더를 다시 스캔하지 않음
+    (store / 'untracked1').mkdir()
+    manager.close()
+    assert 'untracked1' not in ModelManager(str(store)).metadata_store
+
+def test_removal_reaches_other_worker(tmp_path):
+    """다른 워커가 삭제/재업로드한 모델을 인덱스 세대로 감지해 메모리에서 잊는지 테스트"""
+    import io
+    import zipfile
+    from src.core.model_manager import ModelManager
+
+    def model_zip():
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr('model.keras', b'dummy content')
+        archive.seek(0)
+        return archive
+
+    store = str(tmp_path / 'store')
+    owner = ModelManager(store, cleanup_enabled=False, index_sync_interval=0)
+    cleaner = ModelManager(store, cleanup_enabled=False, index_sync_interval=0)
+
+    owner.upload_model(model_zip(), 'sharedhash1')
+    owner.model_cache.put('sharedhash1', 'old_engine')
+    cleaner._sync_from_index()
+    assert 'sharedhash1' in cleaner.metadata_store
+
+    cleaner._remove_model('sharedhash1', 'expired')
+    cleaner.trash.join()
+    # 동기화 전에 로드하면 폴더가 없어도 500이 아니라 KeyError(404)
+    owner.model_cache.pop('sharedhash1')
+    with pytest.raises(KeyError):
+        owner.load_model_to_cache('sharedhash1')
+    assert 'sharedhash1' not in owner.metadata_store
+
+    owner.upload_model(model_zip(), 'sharedhash1')
+    owner.model_cache.put('sharedhash1', 'cached_engine')
+    cleaner._sync_from_index()
+    cleaner._remove_model('sharedhash1', 'expired')
+    owner._sync_from_index()
+    assert 'sharedhash1' not in owner.metadata_store
+    assert 'sharedhash1' not in owner.model_cache
@@ -0,0 +1,133 @@
+import io
+import threading
+import time
+import zipfile
+import numpy as np
+from unittest.mock import patch, MagicMock
+
+@patch('src.core.model_manager.os.walk')
+@patch('tensorflow.keras.models.load_model')
+def test_concurrent_cold_loads_are_single_flight(mock_load_model, mock_walk, client):
+    """같은 해시의 동시 콜드 로드가 한 번만 실행되는지 테스트"""
+    mock_walk.return_value = [('/fake/path', [], ['model.keras'])]
+
+    def slow_load(path):
+        time.sleep(0.2)
+        model = MagicMock()
+        model.predict.return_value = np.array([[1.0]])
+        return model
+    mock_load_model.side_effect = slow_load
+
+    manager = client.application.model_manager
+    manager.metadata_store['singleflight1'] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+    manager.model_cache.clear()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.load_model_to_cache('singleflight1')))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert mock_load_model.call_count == 1
+    assert len(results) == 8
+    assert all(engine is results[0] for engine in results)
+    assert not manager._inflight
+
+@patch('src.core.model_manager.os.walk')
+@patch('tensorflow.keras.models.load_model')
+def test_hot_lookup_not_blocked_by_cold_load(mock_load_model, mock_walk, client):
+    """콜드 로드 중에도 캐시된 모델 조회가 막히지 않는지 테스트"""
+    mock_walk.return_value = [('/fake/path', [], ['model.keras'])]
+    release = threading.Event()
+
+    def blocking_load(path):
+        release.wait(5)
+        return MagicMock()
+    mock_load_model.side_effect = blocking_load
+
+    manager = client.application.model_manager
+    manager.metadata_store['coldhash1'] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+    manager.model_cache.clear()
+    manager.model_cache.put('hothash1', 'hot_engine')
+
+    loader = threading.Thread(target=manager.load_model_to_cache, args=('coldhash1',))
+    loader.start()
+    try:
+        assert manager.load_model_to_cache('hothash1') == 'hot_engine'
+    finally:
+        release.set()
+        loader.join()
+
+@patch('src.core.model_manager.os.walk')
+@patch('tensorflow.keras.models.load_model')
+def test_failed_load_propagates_to_waiters(mock_load_model, mock_walk, client):
+    """로드 실패가 대기 중인 호출자에게도 전달되고 다음 호출에서 재시도되는지 테스트"""
+    mock_walk.return_value = [('/fake/path', [], ['model.keras'])]
+    mock_load_model.side_effect = OSError('corrupt')
+
+    manager = client.application.model_manager
+    manager.metadata_store['brokenhash1'] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+
+    for _ in range(2):
+        try:
+            manager.load_model_to_cache('brokenhash1')
+            assert False, 'expected OSError'
+        except OSError:
+            pass
+    assert mock_load_model.call_count == 2
+
+@patch('src.core.model_manager.os.walk')
+@patch('tensorflow.keras.models.load_model')
+def test_predict_resolves_engine_once(mock_load_model, mock_walk, client):
+    """예측 한 번에 캐시 조회(적중 집계/LRU 갱신)가 한 번만 일어나는지 테스트"""
+    mock_walk.return_value = [('/fake/path', [], ['model.keras'])]
+    mock_model = MagicMock()
+    mock_model.predict.return_value = np.array([[1.0]])
+    mock_load_model.return_value = mock_model
+
+    manager = client.application.model_manager
+    manager.metadata_store['oncehash1'] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+    manager.model_cache.clear()
+    manager.load_model_to_cache('oncehash1')
+
+    with patch.object(manager, 'load_model_to_cache', wraps=manager.load_model_to_cache) as load:
+        manager.predict('oncehash1', [[1.0]])
+    assert load.call_count == 1
+
+def test_load_started_before_reupload_is_not_cached(tmp_path):
+    """재업로드 전에 시작한 로드는 끝나도 이전 모델을 캐시에 넣지 않는지 테스트"""
+    from src.core.model_manager import ModelManager
+
+    def model_zip():
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr('model.keras', b'dummy content')
+        archive.seek(0)
+        return archive
+
+    manager = ModelManager(str(tmp_path), cleanup_enabled=False)
+    manager.upload_model(model_zip(), 'staleload1')
+    loading, release = threading.Event(), threading.Event()
+    old_model, new_model = MagicMock(), MagicMock()
+
+    def load(path):
+        if not loading.is_set():
+            loading.set()
+            release.wait(5)
+            return old_model
+        return new_model
+
+    with patch('tensorflow.keras.models.load_model', side_effect=load):
+        results = []
+        loader = threading.Thread(target=lambda: results.append(manager.load_model_to_cache('staleload1')))
+        loader.start()
+        assert loading.wait(5)
+        manager.upload_model(model_zip(), 'staleload1')
+        release.set()
+        loader.join()
+
+        assert results[0].model is old_model
+        assert 'staleload1' not in manager.model_cache
+        assert manager.load_model_to_cache('staleload1').model is new_model
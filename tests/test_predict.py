@@ -1,6 +1,5 @@
 import numpy as np
 from unittest.mock import patch, MagicMock
-from collections import OrderedDict
 
 @patch('src.core.model_manager.os.walk')
 @patch('src.core.model_manager.os.path.exists')
@@ -25,7 +24,7 @@ def test_predict_success(mock_load_model, mock_exists, mock_walk, client, get_me
     }
     manager = client.application.model_manager
     manager.metadata_store['testhash123'] = test_metadata
-    manager.model_cache = OrderedDict()
+    manager.model_cache.clear()
 
     # 테스트 실행
     response = client.post('/predict?hash=testhash123', json=[[0.5, 0.5]])
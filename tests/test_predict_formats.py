@@ -0,0 +1,85 @@
+import io
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.common import tensor_codec
+
+@pytest.fixture
+def echo_model(client):
+    """입력에 1을 더해 돌려주는 모의 모델을 등록"""
+    with patch('src.core.model_manager.os.walk') as mock_walk, \
+         patch('tensorflow.keras.models.load_model') as mock_load_model:
+        mock_walk.return_value = [('/fake/path', [], ['model.keras'])]
+        mock_model = MagicMock()
+        mock_model.predict.side_effect = lambda data: np.asarray(data) + 1
+        mock_load_model.return_value = mock_model
+
+        manager = client.application.model_manager
+        manager.metadata_store['formathash1'] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+        manager.model_cache.clear()
+        yield mock_model
+
+def test_predict_raw_roundtrip(client, echo_model):
+    """raw little-endian 입출력 테스트"""
+    data = np.arange(6, dtype=np.float32).reshape(2, 3)
+    response = client.post('/predict?hash=formathash1', data=data.tobytes(),
+                           content_type=tensor_codec.RAW,
+                           headers={'X-Tensor-Shape': '2,3', 'X-Tensor-Dtype': 'float32',
+                                    'Accept': tensor_codec.RAW})
+
+    assert response.status_code == 200
+    assert response.headers['X-Tensor-Shape'] == '2,3'
+    result = np.frombuffer(response.data, dtype=response.headers['X-Tensor-Dtype']).reshape(2, 3)
+    np.testing.assert_array_equal(result, data + 1)
+
+def test_predict_npy_request_json_response(client, echo_model):
+    """npy 입력 + 기본 JSON 응답 테스트"""
+    buffer = io.BytesIO()
+    np.save(buffer, np.array([[1, 2]], dtype=np.int32))
+    response = client.post('/predict?hash=formathash1', data=buffer.getvalue(), content_type=tensor_codec.NPY)
+
+    assert response.status_code == 200
+    assert response.json['prediction'] == [[2, 3]]
+
+def test_predict_npy_response(client, echo_model):
+    """JSON 입력 + npy 응답 테스트"""
+    response = client.post('/predict?hash=formathash1', json=[[0.5, 0.5]],
+                           headers={'Accept': tensor_codec.NPY})
+
+    assert response.status_code == 200
+    assert response.mimetype == tensor_codec.NPY
+    np.testing.assert_array_equal(np.load(io.BytesIO(response.data)), [[1.5, 1.5]])
+
+@pytest.mark.skipif(tensor_codec.msgpack is None, reason='msgpack not installed')
+def test_predict_msgpack_roundtrip(client, echo_model):
+    """msgpack-numpy 형식 입출력 테스트"""
+    payload = tensor_codec._to_msgpack(np.ones((1, 2), dtype=np.float32))
+    response = client.post('/predict?hash=formathash1',
+                           data=tensor_codec.msgpack.packb(payload, use_bin_type=True),
+                           content_type=tensor_codec.MSGPACK, headers={'Accept': tensor_codec.MSGPACK})
+
+    assert response.status_code == 200
+    result = tensor_codec.decode(response.data, tensor_codec.MSGPACK, {})
+    np.testing.assert_array_equal(result, [[2, 2]])
+
+@pytest.mark.skipif(tensor_codec.pyarrow is None, reason='pyarrow not installed')
+def test_predict_arrow_roundtrip(client, echo_model):
+    """Arrow tensor IPC 입출력 테스트"""
+    body, _ = tensor_codec.encode(np.zeros((2, 2), dtype=np.float64), tensor_codec.ARROW)
+    response = client.post('/predict?hash=formathash1', data=body, content_type=tensor_codec.ARROW,
+                           headers={'Accept': tensor_codec.ARROW})
+
+    assert response.status_code == 200
+    result = tensor_codec.decode(response.data, tensor_codec.ARROW, {})
+    np.testing.assert_array_equal(result, np.ones((2, 2)))
+
+def test_predict_rejects_bad_payloads(client, echo_model, get_metric_value):
+    """잘못된 shape과 지원하지 않는 형식 테스트"""
+    response = client.post('/predict?hash=formathash1', data=b'\x00' * 10, content_type=tensor_codec.RAW,
+                           headers={'X-Tensor-Shape': '2,3', 'X-Tensor-Dtype': 'float32'})
+    assert response.status_code == 400
+    assert get_metric_value('ml_api_errors', {'type': 'predict_invalid_data'}) >= 1
+
+    response = client.post('/predict?hash=formathash1', data=b'a,b', content_type='text/csv')
+    assert response.status_code == 415
@@ -0,0 +1,95 @@
+import time
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from src.core.multi_predict import ensemble
+
+def make_engine(prediction, delay=0):
+    engine = MagicMock()
+    def predict(data):
+        time.sleep(delay)
+        return np.array(prediction)
+    engine.predict.side_effect = predict
+    return engine
+
+@pytest.fixture
+def multi_client(client):
+    """캐시에 모의 모델 3개를 넣은 클라이언트 (마지막 모델은 느림)"""
+    manager = client.application.model_manager
+    manager.model_cache.clear()
+    engines = {
+        'multihash1': make_engine([[0.2, 0.8], [0.9, 0.1]]),
+        'multihash2': make_engine([[0.4, 0.6], [0.3, 0.7]]),
+        'multihash3': make_engine([[1.0, 0.0], [1.0, 0.0]], delay=0.5),
+    }
+    for model_hash, engine in engines.items():
+        manager.metadata_store[model_hash] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+        manager.model_cache.put(model_hash, engine)
+    client.application.multi_predictor.metrics = MagicMock()
+    return client, engines
+
+def test_ensemble_mean_and_vote():
+    """평균과 다수결(다중 클래스/이진) 앙상블 테스트"""
+    a = np.array([[0.2, 0.8], [0.9, 0.1]])
+    b = np.array([[0.6, 0.4], [0.7, 0.3]])
+    c = np.array([[0.1, 0.9], [0.2, 0.8]])
+
+    assert np.allclose(ensemble([a, b], 'mean'), [[0.4, 0.6], [0.8, 0.2]])
+    assert ensemble([a, b, c], 'vote').tolist() == [1, 0]
+    assert ensemble([np.array([[0.9], [0.1]]), np.array([[0.8], [0.7]])], 'vote').tolist() == [1, 0]
+    with pytest.raises(ValueError):
+        ensemble([a, np.array([[0.5]])], 'mean')
+
+def test_predict_multi_converts_input_once(multi_client):
+    """입력은 한 번만 변환해 모든 모델에 전달하고 모델별 결과와 앙상블을 반환하는지 테스트"""
+    client, engines = multi_client
+
+    response = client.post('/predict_multi?hash=multihash1,multihash2&hash=nosuchmultihash&ensemble=mean',
+                           json=[[1.0, 2.0], [3.0, 4.0]])
+
+    assert response.status_code == 200
+    results = response.json['results']
+    assert list(results) == ['multihash1', 'multihash2', 'nosuchmultihash']
+    assert results['multihash1'] == {'status': 200, 'prediction': [[0.2, 0.8], [0.9, 0.1]]}
+    assert results['nosuchmultihash']['status'] == 404
+    assert response.json['ensemble']['models'] == ['multihash1', 'multihash2']
+    assert np.allclose(response.json['ensemble']['prediction'], [[0.3, 0.7], [0.6, 0.4]])
+    assert engines['multihash1'].predict.call_args[0][0] is engines['multihash2'].predict.call_args[0][0]
+
+def test_slow_model_times_out_without_blocking_others(multi_client):
+    """모델별 제한 시간을 넘긴 모델만 504로 표시하고 나머지 결과로 응답하는지 테스트"""
+    client, _ = multi_client
+
+    start = time.monotonic()
+    response = client.post('/predict_multi?hash=multihash1,multihash3&ensemble=vote&timeout_ms=100',
+                           json=[[1.0, 2.0], [3.0, 4.0]])
+
+    assert time.monotonic() - start < 0.4
+    assert response.json['results']['multihash1']['status'] == 200
+    assert response.json['results']['multihash3']['status'] == 504
+    assert response.json['ensemble'] == {'method': 'vote', 'models': ['multihash1'], 'prediction': [1, 0]}
+
+def test_timed_out_model_gets_no_new_work_while_running(multi_client):
+    """제한 시간을 넘기고 실행 중인 모델에는 새 작업을 넣지 않고, 끝나면 다시 받는지 테스트"""
+    client, engines = multi_client
+
+    query = '/predict_multi?hash=multihash1,multihash3&timeout_ms=100'
+    assert client.post(query, json=[[1.0, 2.0]]).json['results']['multihash3']['status'] == 504
+    response = client.post(query, json=[[1.0, 2.0]])
+    assert response.json['results']['multihash1']['status'] == 200
+    assert response.json['results']['multihash3']['status'] == 503
+    assert engines['multihash3'].predict.call_count == 1
+
+    time.sleep(0.6)
+    response = client.post('/predict_multi?hash=multihash3', json=[[1.0, 2.0]])
+    assert response.json['results']['multihash3']['status'] == 200
+
+def test_predict_multi_rejects_invalid_requests(multi_client):
+    """모델 목록 누락/알 수 없는 앙상블 방식은 400을 반환하는지 테스트"""
+    client, _ = multi_client
+
+    assert client.post('/predict_multi', json=[[1.0, 2.0]]).status_code == 400
+    response = client.post('/predict_multi?hash=multihash1&ensemble=median', json=[[1.0, 2.0]])
+    assert response.status_code == 400
+    assert 'Unknown ensemble method' in response.json['error']
@@ -0,0 +1,170 @@
+import io
+import os
+import zipfile
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from src.common import utils
+from src.core.model_manager import ModelManager
+from src.core.prefetch import AccessStats, Prefetcher
+from src.core.remote_store import FileSystemRemoteStore, RemoteFetcher, RemoteStore, create_remote_store
+
+def create_large_model_zip(size=50000):
+    """청크 여러 개로 나뉘는 크기의 테스트용 모델 ZIP"""
+    memory_file = io.BytesIO()
+    with zipfile.ZipFile(memory_file, 'w') as zf:
+        zf.writestr('model.keras', os.urandom(size))
+    memory_file.seek(0)
+    return memory_file
+
+def create_replica(tmp_path, name, remote, **kwargs):
+    return ModelManager(str(tmp_path / name), cleanup_enabled=False, remote_store=remote,
+                        fetch_chunk_size=4096, **kwargs)
+
+class FlakyRemote(FileSystemRemoteStore):
+    """지정한 횟수만큼 청크를 읽은 뒤부터 실패하는 원격 저장소"""
+
+    def __init__(self, root, fail_after=None):
+        super().__init__(root)
+        self.fail_after = fail_after
+        self.reads = 0
+
+    def read_range(self, model_hash, start, end):
+        self.reads += 1
+        if self.fail_after is not None and self.reads > self.fail_after:
+            raise IOError('connection reset')
+        return super().read_range(model_hash, start, end)
+
+@patch('tensorflow.keras.models.load_model')
+def test_second_replica_fetches_model_from_remote(mock_load_model, tmp_path):
+    """업로드를 받지 않은 레플리카가 원격 저장소에서 모델을 받아 서빙하는지 테스트"""
+    mock_load_model.return_value = MagicMock()
+    remote = FileSystemRemoteStore(str(tmp_path / 'remote'))
+    uploader = create_replica(tmp_path, 'a', remote)
+    uploader.upload_model(create_large_model_zip(), 'remotehash1', fast_path=False)
+
+    replica = create_replica(tmp_path, 'b', remote)
+    info = replica.get_model_info('remotehash1')
+    assert info['tier'] == 'remote' and info['fast_path'] is False
+    assert 'remotehash1' not in replica.metadata_store
+
+    replica.load_model_to_cache('remotehash1')
+
+    metadata = replica.metadata_store['remotehash1']
+    assert metadata['file_path'] == str(tmp_path / 'b' / 'remotehash1')
+    with open(metadata['keras_path'], 'rb') as f, \
+            open(uploader.metadata_store['remotehash1']['keras_path'], 'rb') as original:
+        assert f.read() == original.read()
+    assert replica.index.get('remotehash1')['fast_path'] is False
+    assert replica.get_model_info('remotehash1')['tier'] == 'memory'
+    assert os.listdir(replica.fetcher.fetch_dir) == ['remotehash1.lock']
+
+def test_unknown_hash_is_not_found(tmp_path):
+    """원격에도 없거나 경로로 쓸 수 없는 해시는 KeyError"""
+    replica = create_replica(tmp_path, 'b', FileSystemRemoteStore(str(tmp_path / 'remote')))
+
+    assert replica.ensure_local('missinghash1') is False
+    assert replica.ensure_local('../remote') is False
+    with pytest.raises(KeyError):
+        replica.get_model_info('missinghash1')
+
+def test_remote_misses_are_cached_briefly(tmp_path):
+    """원격에 없던 해시는 remote_miss_ttl 동안 원격 조회 없이 바로 없음으로 처리하는지 테스트"""
+    remote = FileSystemRemoteStore(str(tmp_path / 'remote'))
+    replica = create_replica(tmp_path, 'b', remote, remote_miss_ttl=60)
+
+    with patch.object(remote, 'read_metadata', wraps=remote.read_metadata) as read_metadata:
+        assert replica.ensure_local('missinghash2') is False
+        with pytest.raises(KeyError):
+            replica.known_input_spec('missinghash2')
+        assert read_metadata.call_count == 1
+
+        replica._remote_misses['missinghash2'] = 0
+        assert replica.ensure_local('missinghash2') is False
+        assert read_metadata.call_count == 2
+
+def test_interrupted_fetch_resumes_from_received_chunks(tmp_path):
+    """중단된 다운로드는 받은 청크를 건너뛰고 나머지만 받는지 테스트"""
+    uploader = create_replica(tmp_path, 'a', FileSystemRemoteStore(str(tmp_path / 'remote')))
+    uploader.upload_model(create_large_model_zip(), 'resumehash1')
+    archive_size = uploader.remote_store.read_metadata('resumehash1')['archive']['size']
+    chunk_count = (archive_size + 4095) // 4096
+
+    remote = FlakyRemote(str(tmp_path / 'remote'), fail_after=5)
+    fetcher = RemoteFetcher(remote, str(tmp_path / 'fetch'), workers=1, chunk_size=4096, retries=0)
+    install = lambda archive_path, metadata: zipfile.ZipFile(archive_path).namelist()
+    with pytest.raises(IOError):
+        fetcher.fetch('resumehash1', install)
+    assert os.path.exists(tmp_path / 'fetch' / 'resumehash1.zip.part.json')
+
+    remote.fail_after, remote.reads = None, 0
+    assert fetcher.fetch('resumehash1', install) == ['model.keras']
+    assert remote.reads == chunk_count - 5
+    assert not os.path.exists(tmp_path / 'fetch' / 'resumehash1.zip.part')
+
+def test_access_stats_prefer_frequent_models_at_their_usual_hour():
+    """접근 빈도와 시간대 분포로 후보 순위를 매기는지 테스트"""
+    tz = utils.get_kr_time().tzinfo
+    now = tz.localize(datetime(2024, 5, 2, 8, 30)).timestamp()
+    yesterday_9 = tz.localize(datetime(2024, 5, 1, 9, 0)).timestamp()
+    yesterday_21 = tz.localize(datetime(2024, 5, 1, 21, 0)).timestamp()
+    month_ago_9 = tz.localize(datetime(2024, 4, 2, 9, 0)).timestamp()
+
+    stats = AccessStats()
+    stats.record('morning', yesterday_9, count=5)
+    stats.record('evening', yesterday_21, count=5)
+    stats.record('stale', month_ago_9, count=5)
+
+    assert stats.top(2, [8, 9], now) == ['morning', 'evening']
+    assert stats.top(1, [21, 22], now) == ['evening']
+    assert stats.score('stale', [8, 9], now) < stats.score('evening', [8, 9], now)
+    stats.forget('morning')
+    assert stats.top(1, [8, 9], now) == ['evening']
+
+def test_access_hours_survive_restart(tmp_path):
+    """시간대별 접근 수가 인덱스에 기록되어 재시작 후 사전 로드 순위에 반영되는지 테스트"""
+    manager = create_replica(tmp_path, 'a', None)
+    manager.upload_model(create_large_model_zip(100), 'hourshash1')
+    for _ in range(3):
+        manager._touch('hourshash1')
+    hour = manager.metadata_store['hourshash1']['used'].hour
+    manager.close()
+
+    restarted = create_replica(tmp_path, 'a', None)
+    assert restarted.index.access_hours()['hourshash1'][hour] == 3
+    histogram = restarted.access_stats._stats['hourshash1'][2]
+    assert histogram[hour] == 3 and sum(histogram) == 3
+
+def test_remote_store_requires_primitives():
+    with pytest.raises(TypeError):
+        RemoteStore()
+
+@patch('tensorflow.keras.models.load_model')
+def test_prefetcher_pulls_models_before_first_request(mock_load_model, tmp_path):
+    """사전 로드가 원격 전용 모델을 디스크와 메모리에 미리 준비하는지 테스트"""
+    mock_load_model.return_value = MagicMock()
+    remote = FileSystemRemoteStore(str(tmp_path / 'remote'))
+    uploader = create_replica(tmp_path, 'a', remote)
+    uploader.upload_model(create_large_model_zip(), 'prefetchhash1')
+    uploader.upload_model(create_large_model_zip(), 'prefetchhash2')
+
+    replica = create_replica(tmp_path, 'b', remote, max_cache_size=1)
+    replica.access_stats.record('prefetchhash1', count=3)
+    replica.access_stats.record('prefetchhash2')
+    replica.access_stats.record('goneprefetch1')
+
+    prefetched = Prefetcher(replica, top_n=3).run_once()
+
+    assert prefetched == ['prefetchhash1', 'prefetchhash2']
+    assert 'prefetchhash1' in replica.model_cache
+    # 캐시가 가득 차면 다른 모델을 축출하지 않고 디스크까지만 준비
+    assert 'prefetchhash2' in replica.metadata_store and 'prefetchhash2' not in replica.model_cache
+    assert 'goneprefetch1' not in replica.access_stats
+
+def test_create_remote_store(tmp_path):
+    assert create_remote_store('') is None
+    assert isinstance(create_remote_store(f'file://{tmp_path}'), FileSystemRemoteStore)
+    with pytest.raises(ValueError):
+        create_remote_store('s3://bucket/models')
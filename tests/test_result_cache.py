@@ -0,0 +1,136 @@
+import time
+from datetime import timedelta
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+from prometheus_client import REGISTRY
+
+from src.common import utils
+from src.core.result_cache import ResultCache
+
+@pytest.fixture
+def cached_manager(client):
+    """결과 캐시를 켠 매니저와 입력 합계를 돌려주는 모의 모델"""
+    with patch('src.core.model_manager.os.walk') as mock_walk, \
+         patch('tensorflow.keras.models.load_model') as mock_load_model:
+        mock_walk.return_value = [('/fake/path', [], ['model.keras'])]
+        mock_model = MagicMock()
+        mock_model.predict.side_effect = lambda data: np.asarray(data).sum(axis=1, keepdims=True)
+        mock_load_model.return_value = mock_model
+
+        manager = client.application.model_manager
+        manager.result_cache = ResultCache(max_bytes=1024 * 1024, ttl=60)
+        manager.metadata_store['resulthash1'] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+        manager.model_cache.clear()
+        yield manager, mock_model
+        manager.result_cache = None
+
+def test_partial_hit_computes_missing_rows_only(cached_manager):
+    """일부 행만 적중한 배치는 누락된 행만 예측하는지 테스트"""
+    manager, mock_model = cached_manager
+    manager.predict('resulthash1', np.array([[1.0, 2.0], [3.0, 4.0]]))
+
+    prediction, _ = manager.predict('resulthash1', np.array([[3.0, 4.0], [5.0, 6.0], [1.0, 2.0]]))
+
+    assert prediction.tolist() == [[7.0], [11.0], [3.0]]
+    assert mock_model.predict.call_count == 2
+    assert mock_model.predict.call_args[0][0].tolist() == [[5.0, 6.0]]
+    assert REGISTRY.get_sample_value('result_cache_hits_total') >= 2
+    assert REGISTRY.get_sample_value('result_cache_bytes') > 0
+
+def test_full_hit_skips_inference(cached_manager):
+    """모든 행이 적중하면 모델을 호출하지 않는지 테스트"""
+    manager, mock_model = cached_manager
+    data = np.array([[1.0, 1.0]])
+    manager.predict('resulthash1', data)
+    manager.predict('resulthash1', data)
+
+    assert mock_model.predict.call_count == 1
+
+def test_dtype_is_part_of_key(cached_manager):
+    """같은 값이라도 dtype이 다르면 별도 항목인지 테스트"""
+    manager, mock_model = cached_manager
+    manager.predict('resulthash1', np.array([[1, 1]], dtype=np.float32))
+    manager.predict('resulthash1', np.array([[1, 1]], dtype=np.float64))
+
+    assert mock_model.predict.call_count == 2
+
+def test_invalidated_on_reupload_and_cleanup(cached_manager):
+    """모델 재업로드/정리 시 결과가 무효화되는지 테스트"""
+    manager, mock_model = cached_manager
+    data = np.array([[2.0, 2.0]])
+    manager.predict('resulthash1', data)
+
+    manager._invalidate_results('resulthash1')
+    manager.predict('resulthash1', data)
+    assert mock_model.predict.call_count == 2
+
+    # 1주일 이상 미사용 모델 정리 시 결과도 삭제
+    two_weeks_ago = utils.get_kr_time() - timedelta(weeks=2)
+    manager.metadata_store['resulthash1']['used'] = two_weeks_ago
+    manager.usage.update('resulthash1', two_weeks_ago.timestamp())
+    manager.clean_old_models()
+    assert 'resulthash1' not in manager.metadata_store
+    assert manager.result_cache.total_bytes == 0
+
+def test_results_computed_before_invalidation_are_dropped(cached_manager):
+    """조회와 저장 사이에 무효화된 모델의 결과는 저장하지 않는지 테스트"""
+    manager, mock_model = cached_manager
+    data = np.array([[4.0, 4.0]])
+
+    def predict_then_reupload(batch):
+        manager._invalidate_results('resulthash1')
+        return np.asarray(batch).sum(axis=1, keepdims=True)
+
+    mock_model.predict.side_effect = predict_then_reupload
+    manager.predict('resulthash1', data)
+    assert manager.result_cache.total_bytes == 0
+
+    mock_model.predict.side_effect = lambda batch: np.asarray(batch).sum(axis=1, keepdims=True)
+    manager.predict('resulthash1', data)
+    manager.predict('resulthash1', data)
+    assert mock_model.predict.call_count == 2
+
+def test_invalidated_by_other_process_generation(cached_manager):
+    """다른 프로세스가 인덱스의 모델 세대를 올리면 저장된 결과를 쓰지 않는지 테스트"""
+    manager, mock_model = cached_manager
+    manager.index.upsert('resulthash1', manager.metadata_store['resulthash1'])
+    data = np.array([[5.0, 5.0]])
+    manager.predict('resulthash1', data)
+
+    manager.index.bump_generation('resulthash1')  # 다른 워커의 재업로드
+    manager.predict('resulthash1', data)
+    manager.predict('resulthash1', data)
+    assert mock_model.predict.call_count == 2
+
+    manager.index.remove('resulthash1')  # 다른 워커의 삭제
+    manager.index.bump_generation('resulthash1')
+    with pytest.raises(KeyError):
+        manager.predict('resulthash1', data)
+
+def test_dict_outputs_are_not_cached(cached_manager):
+    """이름 붙은 다중 출력(dict)은 캐시하지 않고 그대로 반환하는지 테스트"""
+    manager, mock_model = cached_manager
+    mock_model.predict.side_effect = lambda data: {'score': np.asarray(data).sum(axis=1, keepdims=True)}
+
+    prediction, _ = manager.predict('resulthash1', np.array([[1.0, 2.0]]))
+
+    assert prediction['score'].tolist() == [[3.0]]
+    assert manager.result_cache.total_bytes == 0
+
+def test_ttl_and_byte_budget():
+    """TTL 만료와 바이트 한도 축출 테스트"""
+    cache = ResultCache(max_bytes=400, ttl=0.05)
+    keys, _, missing = cache.lookup('budgethash1', np.arange(4, dtype=np.float32).reshape(4, 1))
+    assert missing == [0, 1, 2, 3]
+
+    cache.store(keys, [np.zeros(4, dtype=np.float32)] * 4)
+    assert cache.total_bytes <= 400
+    _, results, missing = cache.lookup('budgethash1', np.arange(4, dtype=np.float32).reshape(4, 1))
+    assert missing[:2] == [0, 1]
+    assert results[3] is not None
+
+    time.sleep(0.06)
+    _, _, missing = cache.lookup('budgethash1', np.arange(4, dtype=np.float32).reshape(4, 1))
+    assert missing == [0, 1, 2, 3]
+    assert cache.total_bytes == 0
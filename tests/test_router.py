@@ -0,0 +1,142 @@
+import io
+import threading
+import pytest
+from flask import Flask, request, jsonify
+from werkzeug.serving import make_server
+from werkzeug.test import EnvironBuilder
+
+from src.core.hash_ring import ConsistentHashRing
+from src.router import ModelRouter
+
+def test_hash_ring_is_stable():
+    """같은 키는 같은 노드로, 노드 추가 시 일부 키만 이동하는지 테스트"""
+    ring = ConsistentHashRing(['w0', 'w1', 'w2'])
+    keys = [f'model{i}' for i in range(300)]
+    before = {key: ring.get_node(key) for key in keys}
+
+    assert all(ring.get_node(key) == node for key, node in before.items())
+    assert set(before.values()) == {'w0', 'w1', 'w2'}
+
+    ring.add_node('w3')
+    moved = [key for key in keys if ring.get_node(key) != before[key]]
+    assert 0 < len(moved) < len(keys) / 2
+    assert all(ring.get_node(key) == 'w3' for key in moved)
+
+@pytest.fixture
+def workers():
+    """요청을 받은 워커 이름을 돌려주는 테스트 워커 2개 실행"""
+    servers = []
+    for name in ('worker0', 'worker1'):
+        app = Flask(name)
+
+        @app.route('/predict', methods=['POST'])
+        def predict(name=name):
+            return jsonify({'worker': name, 'hash': request.args.get('hash'), 'data': request.get_json()})
+
+        @app.route('/upload_model', methods=['POST'])
+        def upload_model(name=name):
+            return jsonify({'worker': name, 'size': len(request.get_data())})
+
+        @app.route('/predict_multi', methods=['POST'])
+        def predict_multi(name=name):
+            value = 1.0 if name == 'worker0' else 3.0
+            return jsonify({'results': {
+                h: {'status': 200, 'prediction': [[value]], 'worker': name, 'data': request.get_json()}
+                for h in request.args['hash'].split(',')
+            }})
+
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    yield [f'http://127.0.0.1:{server.server_port}' for server in servers]
+    for server in servers:
+        server.shutdown()
+
+def test_router_pins_hash_to_worker(workers):
+    """같은 모델 해시의 요청은 항상 같은 워커로 전달되는지 테스트"""
+    router = ModelRouter(workers)
+    client = Flask('router_test').test_client()
+    client.application.wsgi_app = router
+
+    seen = {}
+    for i in range(20):
+        model_hash = f'routerhash{i % 5}'
+        response = client.post(f'/predict?hash={model_hash}', json=[[i]])
+        assert response.status_code == 200
+        assert response.json['data'] == [[i]]
+        seen.setdefault(model_hash, set()).add(response.json['worker'])
+
+    assert all(len(names) == 1 for names in seen.values())
+    expected = {h: 'worker0' if router.worker_for(h) == workers[0] else 'worker1' for h in seen}
+    assert {h: names.pop() for h, names in seen.items()} == expected
+
+def test_router_answers_health_and_reports_dead_worker():
+    """라우터 자체 헬스체크와 워커 장애 시 502 응답 테스트"""
+    router = ModelRouter(['http://127.0.0.1:1'])
+    client = Flask('router_test').test_client()
+    client.application.wsgi_app = router
+
+    assert client.get('/health').status_code == 200
+    assert client.post('/predict?hash=routerhash1', json=[[1]]).status_code == 502
+
+class KeepAliveInput(io.BytesIO):
+    """본문 뒤에 EOF가 오지 않는 keep-alive 연결의 wsgi.input 흉내 (본문 끝을 넘어 읽으면 실패)"""
+
+    def read(self, size=-1):
+        if self.tell() >= len(self.getbuffer()):
+            raise AssertionError('read past Content-Length')
+        return super().read(size)
+
+def test_router_streams_large_body_exactly_content_length(workers):
+    """1MB를 넘는 본문은 Content-Length만큼만 읽어 스트리밍하는지 테스트"""
+    router = ModelRouter(workers, timeout=5)
+    body = b'x' * (3 * 1024 * 1024)
+    environ = EnvironBuilder(method='POST', path='/upload_model', query_string='hash=routerhash1',
+                             data=body, content_type='application/zip').get_environ()
+    environ['wsgi.input'] = KeepAliveInput(body)
+    statuses = []
+
+    chunks = router(environ, lambda status, headers: statuses.append(status))
+
+    assert statuses == ['200 OK']
+    assert b'"size":3145728' in b''.join(chunks).replace(b' ', b'')
+
+def test_router_forwards_chunked_body_without_content_length(workers):
+    """Content-Length 없는 chunked 본문도 워커에 그대로 전달되는지 테스트"""
+    router = ModelRouter(workers, timeout=5)
+    body = b'y' * (2 * 1024 * 1024 + 7)
+    environ = EnvironBuilder(method='POST', path='/upload_model', query_string='hash=routerhash1',
+                             content_type='application/zip').get_environ()
+    environ.pop('CONTENT_LENGTH', None)
+    environ['HTTP_TRANSFER_ENCODING'] = 'chunked'
+    environ['wsgi.input'] = io.BytesIO(body)
+    statuses = []
+
+    chunks = router(environ, lambda status, headers: statuses.append(status))
+
+    assert statuses == ['200 OK']
+    assert f'"size":{len(body)}'.encode() in b''.join(chunks).replace(b' ', b'')
+
+def test_router_splits_predict_multi_by_owner(workers):
+    """/predict_multi의 해시 목록을 담당 워커별로 나눠 보내고 결과와 앙상블을 합치는지 테스트"""
+    router = ModelRouter(workers, max_multi_models=4)
+    client = Flask('router_test').test_client()
+    client.application.wsgi_app = router
+    owner0 = [h for h in (f'routerhash{i}' for i in range(50)) if router.worker_for(h) == workers[0]][:2]
+    owner1 = [h for h in (f'routerhash{i}' for i in range(50)) if router.worker_for(h) == workers[1]][:1]
+    hashes = owner0 + owner1
+
+    response = client.post(f"/predict_multi?hash={','.join(hashes)}&ensemble=mean", json=[[1]])
+
+    assert response.status_code == 200
+    results = response.json['results']
+    assert list(results) == hashes
+    assert all(results[h]['worker'] == 'worker0' for h in owner0)
+    assert results[owner1[0]]['worker'] == 'worker1'
+    assert all(result['data'] == [[1]] for result in results.values())
+    assert response.json['ensemble']['prediction'] == [[5 / 3]]
+
+    # 한 워커가 모두 담당하는 목록도 라우터에서 한도를 확인
+    for owner in workers:
+        too_many = ','.join([h for h in (f'routerhash{i}' for i in range(200)) if router.worker_for(h) == owner][:5])
+        assert client.post(f'/predict_multi?hash={too_many}', json=[[1]]).status_code == 400
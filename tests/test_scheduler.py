@@ -0,0 +1,214 @@
+import threading
+import time
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+from prometheus_client import REGISTRY
+
+from src.core.scheduler import (AIMDLimit, DeadlineExceededError, InferenceScheduler, QueueFullError,
+                                PRIORITIES, parse_priority)
+
+class BlockingManager:
+    """release 전까지 예측을 막아 두고 실행 순서를 기록하는 모의 ModelManager"""
+
+    def __init__(self, blocked=()):
+        self.blocked = set(blocked)
+        self.release = threading.Event()
+        self.order = []
+        self.running = {}
+        self.max_running = {}
+        self._lock = threading.Lock()
+
+    def predict(self, model_hash, data):
+        with self._lock:
+            self.order.append((model_hash, data))
+            self.running[model_hash] = self.running.get(model_hash, 0) + 1
+            self.max_running[model_hash] = max(self.max_running.get(model_hash, 0), self.running[model_hash])
+        if model_hash in self.blocked:
+            self.release.wait(5)
+        with self._lock:
+            self.running[model_hash] -= 1
+        return np.asarray([[data]]), 200
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+def test_busy_model_does_not_starve_other_models():
+    """요청이 몰린 모델은 동시 실행 한도까지만 스레드를 쓰고 다른 모델은 바로 실행되는지 테스트"""
+    manager = BlockingManager(blocked=['heavyhash1'])
+    scheduler = InferenceScheduler(manager, workers=2, max_concurrency_per_model=1)
+    try:
+        heavy = [scheduler.submit('heavyhash1', i) for i in range(5)]
+        wait_until(lambda: manager.running.get('heavyhash1') == 1)
+
+        prediction, status = scheduler.submit('lighthash1', 7).result(timeout=2)
+
+        assert status == 200 and prediction.tolist() == [[7]]
+        assert scheduler.queue_depth('heavyhash1') == 5
+        manager.release.set()
+        for future in heavy:
+            future.result(timeout=2)
+        assert manager.max_running['heavyhash1'] == 1
+        assert scheduler.queue_depth('heavyhash1') == 0
+    finally:
+        manager.release.set()
+        scheduler.shutdown()
+
+def test_priority_classes_and_round_robin_across_models():
+    """높은 우선순위가 먼저, 같은 우선순위는 모델을 번갈아 실행하는지 테스트"""
+    manager = BlockingManager(blocked=['blockhash1'])
+    scheduler = InferenceScheduler(manager, workers=1)
+    try:
+        first = scheduler.submit('blockhash1', 0)
+        wait_until(lambda: manager.order)
+        low = scheduler.submit('modelhash_a', 'low-a', priority=parse_priority('low'))
+        normal = [scheduler.submit('modelhash_a', f'a{i}') for i in range(2)]
+        normal.append(scheduler.submit('modelhash_b', 'b0'))
+        high = scheduler.submit('modelhash_b', 'high-b', priority=parse_priority('HIGH'))
+        manager.release.set()
+        for future in [first, low, high, *normal]:
+            future.result(timeout=2)
+    finally:
+        manager.release.set()
+        scheduler.shutdown()
+
+    assert [data for _, data in manager.order[1:]] == ['high-b', 'a0', 'b0', 'a1', 'low-a']
+    with pytest.raises(ValueError):
+        parse_priority('urgent')
+
+def test_waiting_low_priority_is_promoted_and_busy_model_gets_half_the_workers():
+    """오래 기다린 하위 우선순위 요청이 승격되고, 모델별 기본 한도는 작업 스레드의 절반인지 테스트"""
+    manager = BlockingManager(blocked=['blockhash1'])
+    scheduler = InferenceScheduler(manager, workers=1, aging_ms=50)
+    try:
+        first = scheduler.submit('blockhash1', 0)
+        wait_until(lambda: manager.order)
+        low = scheduler.submit('modelhash_a', 'low-a', priority=parse_priority('low'))
+        time.sleep(0.16)
+        high = scheduler.submit('modelhash_b', 'high-b', priority=parse_priority('high'))
+        manager.release.set()
+        for future in [first, low, high]:
+            future.result(timeout=2)
+    finally:
+        manager.release.set()
+        scheduler.shutdown()
+
+    assert [data for _, data in manager.order[1:]] == ['low-a', 'high-b']
+    scheduler = InferenceScheduler(BlockingManager(), workers=4)
+    scheduler.shutdown()
+    assert scheduler.max_concurrency_per_model == 2
+
+def test_queue_full_and_expired_requests_are_counted():
+    """대기열 초과는 QueueFullError, 대기 중 마감이 지난 요청은 모델 호출 없이 버려지는지 테스트"""
+    manager = BlockingManager(blocked=['limitedhash1'])
+    scheduler = InferenceScheduler(manager, workers=1, max_queue_per_model=2)
+    before = {
+        reason: REGISTRY.get_sample_value('inference_rejections_total', {'reason': reason, 'priority': 'normal'}) or 0
+        for reason in ('queue_full', 'deadline')
+    }
+    try:
+        first = scheduler.submit('limitedhash1', 0)
+        wait_until(lambda: manager.order)
+        expired = scheduler.submit('limitedhash1', 1, deadline=time.monotonic() + 0.02)
+        with pytest.raises(QueueFullError):
+            scheduler.submit('limitedhash1', 2)
+        time.sleep(0.05)
+        manager.release.set()
+        first.result(timeout=2)
+        with pytest.raises(DeadlineExceededError):
+            expired.result(timeout=2)
+    finally:
+        manager.release.set()
+        scheduler.shutdown()
+
+    assert len(manager.order) == 1
+    for reason in ('queue_full', 'deadline'):
+        value = REGISTRY.get_sample_value('inference_rejections_total', {'reason': reason, 'priority': 'normal'})
+        assert value == before[reason] + 1
+    assert REGISTRY.get_sample_value('inference_queue_wait_seconds_count', {'priority': 'normal'}) >= 1
+
+def test_aimd_limit_adapts_to_latency_target():
+    """목표 이내면 한도를 늘리고, 초과하면 한 번만 절반으로 줄이는지 테스트"""
+    limit = AIMDLimit(max_limit=8, target_latency=0.1)
+    assert limit.limit == 1
+    for _ in range(10):
+        limit.update(0.05, time.monotonic())
+    assert limit.limit == 4
+
+    started = time.monotonic()
+    assert limit.update(0.5, started) is True
+    assert limit.limit == 2
+    # 줄이기 전에 시작한 요청의 지연으로는 다시 줄이지 않음
+    limit.update(0.5, started)
+    assert limit.limit == 2
+
+    fixed = AIMDLimit(max_limit=3)
+    fixed.update(10, time.monotonic())
+    assert fixed.limit == 3
+
+@patch('src.api.model_routes.metrics')
+def test_predict_route_uses_scheduler(mock_metrics, client):
+    """SCHEDULER_ENABLED 시 /predict가 스케줄러를 거치고 우선순위 헤더를 검증하는지 테스트"""
+    manager = MagicMock()
+    manager.predict.return_value = (np.array([[0.3]]), 200)
+    client.application.scheduler = InferenceScheduler(manager, workers=1)
+    try:
+        response = client.post('/predict?hash=schedhash1', json=[[1.0]], headers={'X-Priority': 'high'})
+        assert response.status_code == 200
+        assert response.json['prediction'] == [[0.3]]
+        assert 'queue;dur=' in response.headers['Server-Timing']
+        manager.predict.assert_called_once_with('schedhash1', [[1.0]])
+
+        response = client.post('/predict?hash=schedhash1', json=[[1.0]], headers={'X-Priority': 'urgent'})
+        assert response.status_code == 400
+        assert set(PRIORITIES) <= set(response.json['error'].replace(',', ' ').replace(')', ' ').split())
+    finally:
+        client.application.scheduler.shutdown()
+
+def test_removed_model_queue_and_labels_are_dropped():
+    """삭제된 모델의 대기열과 동시 실행 한도 레이블이 유휴 시 바로, 처리 중이면 끝난 뒤 제거되는지 테스트"""
+    manager = BlockingManager(blocked=['removedhash2'])
+    scheduler = InferenceScheduler(manager, workers=1, max_concurrency_per_model=4, target_latency_ms=1000)
+    limit_label = lambda model_hash: REGISTRY.get_sample_value('inference_concurrency_limit', {'model': model_hash})
+    try:
+        scheduler.submit('removedhash1', 0).result(timeout=2)
+        wait_until(lambda: limit_label('removedhash1') is not None)
+        scheduler.remove_model('removedhash1')
+        assert 'removedhash1' not in scheduler._queues
+        assert limit_label('removedhash1') is None
+
+        busy = scheduler.submit('removedhash2', 0)
+        wait_until(lambda: manager.running.get('removedhash2') == 1)
+        scheduler.remove_model('removedhash2')
+        assert scheduler.queue_depth('removedhash2') == 1
+        manager.release.set()
+        busy.result(timeout=2)
+        wait_until(lambda: 'removedhash2' not in scheduler._queues)
+        assert REGISTRY.get_sample_value('inference_queue_depth', {'model': 'removedhash2'}) is None
+    finally:
+        manager.release.set()
+        scheduler.shutdown()
+
+def test_model_manager_notifies_removal_listeners(client):
+    """모델 삭제 시 ModelManager가 등록된 정리 함수를 호출하는지 테스트"""
+    manager = client.application.model_manager
+    removed = []
+    manager.removal_listeners.append(removed.append)
+    manager.metadata_store['listenedhash1'] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+
+    manager._remove_model('listenedhash1', 'expired')
+
+    assert removed == ['listenedhash1']
+
+@patch('src.api.model_routes.metrics')
+def test_scheduling_headers_ignored_without_scheduler(mock_metrics, client):
+    """스케줄러를 쓰지 않으면 우선순위/처리 시간 제한 헤더를 해석하지 않는지 테스트"""
+    assert client.application.scheduler is None
+    headers = {'X-Priority': 'urgent', 'X-Request-Timeout-Ms': 'soon'}
+    with patch.object(client.application.model_manager, 'predict', return_value=(np.array([[0.3]]), 200)):
+        response = client.post('/predict?hash=schedhash1', json=[[1.0]], headers=headers)
+
+    assert response.status_code == 200
@@ -0,0 +1,27 @@
+import json
+import os
+import subprocess
+import sys
+
+# create_app 후 /health 응답까지 TensorFlow를 import하지 않는지 별도 프로세스에서 확인
+STARTUP_SCRIPT = """
+import json, sys
+from src.main import create_app
+app = create_app()
+response = app.test_client().get('/health')
+print(json.dumps({'status': response.status_code, 'tf_imported': 'tensorflow' in sys.modules}))
+"""
+
+def test_health_answers_without_importing_tensorflow(tmp_path):
+    """앱 생성과 헬스 체크가 TensorFlow import 없이 동작하는지 테스트"""
+    env = dict(os.environ,
+               MODEL_STORE_PATH=str(tmp_path / 'models'),
+               JOB_STORE_PATH=str(tmp_path / 'jobs'),
+               TF_PRELOAD='false',
+               BACKGROUND_TASKS='false')
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], cwd=root, env=env,
+                            capture_output=True, text=True, timeout=120, check=True).stdout
+
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result == {'status': 200, 'tf_imported': False}
@@ -0,0 +1,91 @@
+import logging
+import threading
+import numpy as np
+from unittest.mock import patch, MagicMock
+from prometheus_client import REGISTRY
+
+from src.common import tracing
+from src.common.metrics import get_metrics
+
+@patch('src.core.model_manager.os.walk')
+@patch('tensorflow.keras.models.load_model')
+def test_predict_records_stage_timings(mock_load_model, mock_walk, client):
+    """예측 응답의 Server-Timing 헤더와 단계별 히스토그램 테스트"""
+    mock_walk.return_value = [('/fake/path', [], ['model.keras'])]
+    mock_model = MagicMock()
+    mock_model.predict.return_value = np.array([[0.8, 0.2]])
+    mock_load_model.return_value = mock_model
+
+    manager = client.application.model_manager
+    manager.metadata_store['tracehash1'] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+    manager.model_cache.clear()
+
+    response = client.post('/predict?hash=tracehash1', json=[[0.5, 0.5]])
+
+    assert response.status_code == 200
+    stages = [entry.split(';')[0] for entry in response.headers['Server-Timing'].split(', ')]
+    assert stages == ['decode', 'convert', 'load', 'inference', 'serialize', 'total']
+
+    labels = {'stage': 'inference', 'model': 'tracehash1'}
+    assert REGISTRY.get_sample_value('request_stage_seconds_count', labels) == 1
+    # 두 번째 요청은 캐시 적중이므로 load 단계 없음
+    response = client.post('/predict?hash=tracehash1', json=[[0.5, 0.5]])
+    assert 'load;' not in response.headers['Server-Timing']
+
+def test_failed_request_uses_none_model_label(client):
+    """모델이 확인되지 않은 요청은 임의 해시로 라벨을 늘리지 않는지 테스트"""
+    response = client.post('/predict?hash=unknownhash', json=[[0.5, 0.5]])
+
+    assert response.status_code == 404
+    assert 'total;dur=' in response.headers['Server-Timing']
+    assert REGISTRY.get_sample_value('request_stage_seconds_count', {'stage': 'total', 'model': 'unknownhash'}) is None
+
+def test_model_label_cardinality_limit():
+    """model 라벨 수가 한도를 넘으면 'other'로 합쳐지는지 테스트"""
+    metrics = get_metrics()
+    original = metrics.max_model_labels
+    metrics.max_model_labels = len(metrics._model_labels) + 1
+    try:
+        metrics.observe_request_stage('inference', 'labelhash1', 0.01)
+        metrics.observe_request_stage('inference', 'labelhash2', 0.01)
+    finally:
+        metrics.max_model_labels = original
+
+    assert REGISTRY.get_sample_value('request_stage_seconds_count', {'stage': 'inference', 'model': 'labelhash1'}) == 1
+    assert REGISTRY.get_sample_value('request_stage_seconds_count', {'stage': 'inference', 'model': 'labelhash2'}) is None
+    assert REGISTRY.get_sample_value('request_stage_seconds_count', {'stage': 'inference', 'model': 'other'}) >= 1
+
+def test_profiler_logs_slowest_requests_with_stacks(caplog):
+    """샘플링 프로파일러가 가장 느린 요청의 단계와 스택을 기록하는지 테스트"""
+    profiler = tracing.SlowRequestProfiler(sample_rate=1.0, top_n=2)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_handler(trace):
+        profiler.attach(trace)
+        started.set()
+        release.wait(5)
+        profiler.detach()
+
+    slow = tracing.RequestTrace()
+    worker = threading.Thread(target=slow_handler, args=(slow,))
+    worker.start()
+    started.wait(5)
+    profiler.sample()
+    release.set()
+    worker.join()
+
+    slow.model_hash, slow.duration, slow.stages = 'slowhash', 0.9, {'inference': 0.8}
+    for duration in (0.1, 0.2):
+        trace = tracing.RequestTrace()
+        trace.duration = duration
+        profiler.record(trace)
+    profiler.record(slow)
+
+    with caplog.at_level(logging.WARNING, logger='src.common.tracing'):
+        profiler.report()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 2
+    assert messages[0].startswith('Slow request model=slowhash total=900.0ms inference=800.0ms')
+    assert 'slow_handler' in messages[0]
+    assert 'total=200.0ms' in messages[1]
@@ -1,7 +1,11 @@
 import io
+import os
+import hashlib
+import threading
 import zipfile
 from unittest.mock import patch, MagicMock
 
+
 def create_test_model_zip():
     """테스트용 모델 ZIP 파일 생성 (keras 파일 포함)"""
     memory_file = io.BytesIO()
@@ -10,28 +14,74 @@ def create_test_model_zip():
     memory_file.seek(0)
     return memory_file
 
-@patch('werkzeug.datastructures.FileStorage.save')
-@patch('src.core.model_manager.ZipFile')
-@patch('src.core.model_manager.os.remove')
-@patch('src.core.model_manager.os.makedirs')
-def test_upload_model_success(mock_makedirs, mock_remove, mock_zipfile, mock_save, client):
+def test_upload_model_success(client, tmp_path):
     """모델 업로드 성공 테스트"""
-    # ZipFile 동작 모킹
-    mock_zip_instance = MagicMock()
-    mock_zipfile.return_value.__enter__.return_value = mock_zip_instance
-    mock_zip_instance.namelist.return_value = ['model.keras'] 
-
+    manager = client.application.model_manager
     test_zip = create_test_model_zip()
 
     # 테스트 실행
     response = client.post('/upload_model?hash=testhash123',
                          data={'model_file': (test_zip, 'model.zip')},
                          content_type='multipart/form-data')
-    
-    mock_save.assert_called_once()
-    
+
     assert response.status_code == 200
     assert response.json['message'] == 'Model uploaded successfully'
+    assert os.path.isfile(tmp_path / 'models' / 'testhash123' / 'model.keras')
+    assert not os.listdir(tmp_path / 'models' / '.staging')
+    assert manager.metadata_store['testhash123']['file_path'] == str(tmp_path / 'models' / 'testhash123')
+    assert manager.metadata_store['testhash123']['keras_path'] == str(tmp_path / 'models' / 'testhash123' / 'model.keras')
+    assert 'testhash123' in manager.index.load_all()
+
+def test_upload_model_verifies_digest(client, tmp_path):
+    """hex digest 해시는 업로드 내용과 대조하는지 테스트"""
+    content = create_test_model_zip().getvalue()
+    digest = hashlib.sha256(content).hexdigest()
+
+    response = client.post(f'/upload_model?hash={digest}',
+                         data={'model_file': (io.BytesIO(content), 'model.zip')},
+                         content_type='multipart/form-data')
+    assert response.status_code == 200
+
+    wrong = hashlib.sha256(b'other').hexdigest()
+    response = client.post(f'/upload_model?hash={wrong}',
+                         data={'model_file': (io.BytesIO(content), 'model.zip')},
+                         content_type='multipart/form-data')
+    assert response.status_code == 400
+    assert 'Hash mismatch' in response.json['error']
+    assert not os.path.exists(tmp_path / wrong)
+
+def test_upload_model_raw_body(client, tmp_path):
+    """application/zip 본문 스트리밍 업로드 테스트"""
+
+    response = client.post('/upload_model?hash=rawhash123',
+                         data=create_test_model_zip().getvalue(),
+                         content_type='application/zip')
+
+    assert response.status_code == 200
+    assert os.path.isfile(tmp_path / 'models' / 'rawhash123' / 'model.keras')
+
+def test_upload_model_too_large(client, tmp_path, get_metric_value):
+    """크기 제한 초과 업로드 거절 테스트"""
+    client.application.config['MAX_MODEL_FILE_SIZE'] = 10
+
+    response = client.post('/upload_model?hash=bighash123',
+                         data=create_test_model_zip().getvalue(),
+                         content_type='application/zip')
+
+    assert response.status_code == 413
+    assert not os.path.exists(tmp_path / 'models' / 'bighash123')
+    counter_value = get_metric_value('ml_api_errors', {'type': 'upload_model_too_large'})
+    assert counter_value >= 1
+
+def test_upload_model_invalid_zip(client, tmp_path):
+    """잘못된 zip 파일 업로드 테스트"""
+
+    response = client.post('/upload_model?hash=badzip123',
+                         data={'model_file': (io.BytesIO(b'not a zip'), 'model.zip')},
+                         content_type='multipart/form-data')
+
+    assert response.status_code == 400
+    assert not os.path.exists(tmp_path / 'models' / 'badzip123')
 
 def test_upload_model_missing_data(client, get_metric_value):
     """필수 데이터 누락 테스트"""
@@ -41,4 +91,43 @@ def test_upload_model_missing_data(client, get_metric_value):
     assert 'Missing data' in response.json['error']
     
     counter_value = get_metric_value('ml_api_errors', {'type': 'upload_model_missing_data'})
-    assert counter_value == 1
\ No newline at end of file
+    assert counter_value == 1
+
+def test_reupload_swaps_model_link_atomically(tmp_path):
+    """재업로드는 버전 폴더를 가리키는 링크를 교체하고 모델 경로가 비는 순간이 없는지 테스트"""
+    from src.core.model_manager import ModelManager
+
+    manager = ModelManager(str(tmp_path), cleanup_enabled=False)
+    manager.upload_model(create_test_model_zip(), 'swaphash1')
+    folder = tmp_path / 'swaphash1'
+    first = os.path.realpath(folder)
+
+    missing = []
+    stop = threading.Event()
+
+    def watch():
+        while not stop.is_set():
+            if not os.path.isfile(folder / 'model.keras'):
+                missing.append(True)
+
+    watcher = threading.Thread(target=watch)
+    watcher.start()
+    try:
+        results = []
+        uploads = [threading.Thread(target=lambda: results.append(manager.upload_model(create_test_model_zip(), 'swaphash1')))
+                   for _ in range(4)]
+        for upload in uploads:
+            upload.start()
+        for upload in uploads:
+            upload.join()
+    finally:
+        stop.set()
+        watcher.join()
+
+    assert not missing
+    assert results == [('Model uploaded successfully', 200)] * 4
+    assert os.path.islink(folder) and os.path.realpath(folder) != first
+    manager.trash.join()
+    assert os.listdir(tmp_path / '.versions') == [os.path.basename(os.path.realpath(folder))]
+    assert manager.metadata_store['swaphash1']['keras_path'] == str(folder / 'model.keras')
+    manager.close()
@@ -0,0 +1,75 @@
+import numpy as np
+import tensorflow as tf
+from unittest.mock import patch, MagicMock
+
+from src.core.hash_ring import ConsistentHashRing
+from src.core.warmup import ModelWarmer, synthetic_input
+
+def build_model():
+    inputs = tf.keras.Input(shape=(3,))
+    outputs = tf.keras.layers.Dense(1)(inputs)
+    return tf.keras.Model(inputs, outputs)
+
+def test_synthetic_input_from_signature():
+    """모델 입력 시그니처로 합성 입력을 만드는지 테스트"""
+    data = synthetic_input(build_model(), batch_size=4)
+    assert data.shape == (4, 3)
+    assert data.dtype == np.float32
+
+@patch('src.core.model_manager.os.walk')
+@patch('tensorflow.keras.models.load_model')
+def test_warmup_preloads_and_reports_ready(mock_load_model, mock_walk, client):
+    """워밍업 대상 로드 및 트레이싱 후 /ready가 200이 되는지 테스트"""
+    mock_walk.return_value = [('/fake/path', [], ['model.keras'])]
+    mock_load_model.side_effect = lambda path: build_model()
+
+    manager = client.application.model_manager
+    manager.model_cache.clear()
+    manager.metadata_store['warmhash1'] = {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'}
+
+    warmer = ModelWarmer(manager, hashes=['warmhash1', 'missinghash1'], batch_sizes=(1, 8))
+    client.application.warmer = warmer
+    assert warmer.select_hashes() == ['warmhash1']
+
+    warmer.start()
+    assert warmer.wait(10)
+
+    response = client.get('/ready')
+    assert response.status_code == 200
+    assert response.json['warm'] == ['warmhash1']
+    engine = manager.model_cache.get('warmhash1')
+    assert engine.signature_count == 2
+
+def test_ready_returns_503_until_warm(client):
+    """워밍업 완료 전에는 /ready가 503인지 테스트"""
+    warmer = ModelWarmer(client.application.model_manager)
+    client.application.warmer = warmer
+
+    assert client.get('/ready').status_code == 503
+    warmer.start()
+    assert client.get('/ready').status_code == 200
+
+def test_backend_preload_gates_readiness(client):
+    """preload_backend이면 TensorFlow import 후에 ready가 되는지 테스트"""
+    warmer = ModelWarmer(client.application.model_manager, preload_backend=True)
+    client.application.warmer = warmer
+    warmer.start()
+    assert warmer.wait(60)
+
+    response = client.get('/ready')
+    assert response.status_code == 200
+    assert response.json['backend_loaded'] is True
+
+def test_cluster_worker_warms_only_owned_models():
+    """클러스터 모드에서는 해시 링상 이 워커가 담당하는 모델만 워밍업 대상으로 고르는지 테스트"""
+    hashes = [f'ringwarmhash{i}' for i in range(8)]
+    manager = MagicMock()
+    manager.metadata_store = {h: {'file_path': '/fake/path', 'used': '2024-04-27T12:00:00'} for h in hashes}
+    ring = ConsistentHashRing(['http://worker-a', 'http://worker-b'])
+    owned = [h for h in hashes if ring.get_node(h) == 'http://worker-a']
+    assert 0 < len(owned) < len(hashes)
+
+    warmer = ModelWarmer(manager, hashes=hashes[:4], top_n=len(hashes),
+                         owns=lambda model_hash: ring.get_node(model_hash) == 'http://worker-a')
+
+    assert sorted(warmer.select_hashes()) == sorted(owned)